@@ -1,7 +1,56 @@
 # bestBot.py
 from engine.brain import Brain
 import math
-from treys import Card, Evaluator
+from treys import Evaluator
+from engine.cards import RANK, SUIT, combo_index
+from engine.preflop import compile_heuristic
+
+# Starting hand categories, compiled per combo by _starting_hand_flags
+PREMIUM = 1          # premium pairs, AK, suited high broadways
+PLAYABLE = 2         # medium pairs, suited broadways, suited connectors, suited wheel aces
+MEDIUM_PAIR = 4
+SMALL_PAIR = 8
+SUITED_MARGINAL = 16  # suited, both cards high, gap <= 2
+
+
+def _starting_hand_flags(hand):
+    """Starting hand categories (common heuristics) as a bit set"""
+    r1, r2 = RANK[hand[0]], RANK[hand[1]]
+    s1, s2 = SUIT[hand[0]], SUIT[hand[1]]
+
+    high = max(r1, r2)
+    low = min(r1, r2)
+    pair = (r1 == r2)
+    suited = (s1 == s2)
+    gap = abs(r1 - r2)
+
+    is_premium_pair = pair and high >= 10  # TT+
+    is_medium_pair = pair and 6 <= high <= 9  # 66-99
+    is_small_pair = pair and high < 6  # 22-55
+
+    # strong broadways
+    is_broadway = (high >= 10 and low >= 10)  # both T/J/Q/K/A
+    is_AK = (set([r1, r2]) == set([14, 13]))  # both suited/offsuit
+
+    is_suited_connecter = suited and gap <= 1 and low >= 6  # 76s+
+    is_suited_one_gap = suited and gap == 2 and low >= 7  # 97s+ (one gap)
+    is_suited_ace = suited and (r1 == 14 or r2 == 14) and low <= 5  # A2s-A5s (wheel draws)
+
+    flags = 0
+    if is_premium_pair or is_AK or (is_broadway and suited and high >= 12):  # QQ+, AK, AQs+
+        flags |= PREMIUM
+    if is_medium_pair or (suited and high >= 11) or is_suited_connecter or is_suited_one_gap or is_suited_ace:
+        flags |= PLAYABLE
+    if is_medium_pair:
+        flags |= MEDIUM_PAIR
+    if is_small_pair:
+        flags |= SMALL_PAIR
+    if suited and (low >= 8) and gap <= 2:
+        flags |= SUITED_MARGINAL
+    return flags
+
+
+STARTING_HAND_FLAGS = compile_heuristic("BestBot", _starting_hand_flags)
 
 class BestBot(Brain):
     """
@@ -22,23 +71,6 @@ class BestBot(Brain):
         self.aggression_early = 0.6    # multiplier for raise sizes in early position
         self.speculative_call_ratio = 0.03  # call if amount_to_call < ratio * stack for speculative hands
 
-    # Helpers to safely get rank and suit ints from treys.Card (works in common Treys distributions)
-    def _card_rank(self, c):
-        try:
-            return Card.get_rank_int(c)  # 2..14 (14 = Ace)
-        except Exception:
-            # fallback: parse string
-            s = Card.int_to_str(c)  # e.g. "As"
-            rank_map = {'2':2,'3':3,'4':4,'5':5,'6':6,'7':7,'8':8,'9':9,'T':10,'J':11,'Q':12,'K':13,'A':14}
-            return rank_map[s[0]]
-
-    def _card_suit(self, c):
-        try:
-            return Card.get_suit_int(c)  # typically 1..4
-        except Exception:
-            s = Card.int_to_str(c)
-            return s[1]
-
     def _is_late_position(self, player, button_pos, num_players):
         # Simple: button and one to the right are "late"
         pos = player.get("position", 0)
@@ -98,37 +130,11 @@ class BestBot(Brain):
                     return {"action": "call"}
                 return {"action": "fold"}
 
-            r1 = self._card_rank(hand[0])
-            r2 = self._card_rank(hand[1])
-            s1 = self._card_suit(hand[0])
-            s2 = self._card_suit(hand[1])
-
-            high = max(r1, r2)
-            low = min(r1, r2)
-            pair = (r1 == r2)
-            suited = (s1 == s2)
-            gap = abs(r1 - r2)
-
+            flags = STARTING_HAND_FLAGS[combo_index(hand[0], hand[1])]
             in_late = self._is_late_position(player, button_pos, num_players)
 
-            # Starting hand categories (common heuristics)
-            is_ace_high = (high == 14)
-            is_premium_pair = pair and high >= 10  # TT+
-            is_medium_pair = pair and 6 <= high <= 9  # 66-99
-            is_small_pair = pair and high < 6  # 22-55
-
-            # strong broadways
-            is_broadway = (high >= 10 and low >= 10)  # both T/J/Q/K/A
-            is_ak = (set([r1, r2]) == set([14,13]))
-            is_ak_suited = is_ak and suited
-            is_AK = is_ak  # both suited/offsuit
-
-            is_suited_connecter = suited and gap <= 1 and low >= 6  # 76s+
-            is_suited_one_gap = suited and gap == 2 and low >= 7  # 97s+ (one gap)
-            is_suited_ace = suited and (r1 == 14 or r2 == 14) and low <= 5  # A2s-A5s (wheel draws)
-
             # Aggressive actions for premium hands
-            if is_premium_pair or is_AK or (is_broadway and suited and high >= 12):  # QQ+, AK, AQs+
+            if flags & PREMIUM:
                 # raise or shove depending on stack and opponents
                 if "raise" in valid_actions:
                     # larger raise in late position
@@ -140,7 +146,7 @@ class BestBot(Brain):
                     return {"action": "call"}
 
             # Strong playable hands: medium pairs, suited broadways, suited connectors
-            if is_medium_pair or (suited and high >= 11) or is_suited_connecter or is_suited_one_gap or is_suited_ace:
+            if flags & PLAYABLE:
                 # if facing large to-call relative to stack, fold; otherwise call
                 if amount_to_call == 0:
                     # free to raise: small steal when in late position
@@ -157,11 +163,11 @@ class BestBot(Brain):
                     if "call" in valid_actions:
                         return {"action": "call"}
                 # If facing big raise, fold speculative non-pair hands
-                if is_medium_pair and "call" in valid_actions:
+                if flags & MEDIUM_PAIR and "call" in valid_actions:
                     return {"action": "call"}
 
             # Small pairs: set-mining if cheap multiway or late position
-            if is_small_pair:
+            if flags & SMALL_PAIR:
                 if amount_to_call <= stack * 0.03 or in_late:
                     if "call" in valid_actions:
                         return {"action": "call"}
@@ -170,7 +176,7 @@ class BestBot(Brain):
                     return {"action": "fold"}
 
             # Suited small cards or offsuit connectors are marginal — fold to nontrivial raises
-            if suited and (low >= 8) and gap <= 2 and in_late and amount_to_call <= stack * 0.02:
+            if flags & SUITED_MARGINAL and in_late and amount_to_call <= stack * 0.02:
                 if "call" in valid_actions:
                     return {"action": "call"}
 
@@ -211,7 +217,9 @@ class BestBot(Brain):
             if len(board) == 0:
                 score = self.evaluator.evaluate([], hand)
             else:
-                score = self.evaluator.evaluate(board, hand)
+                score = player.get("hand_rank")
+                if score is None:
+                    score = self.evaluator.evaluate(board, hand)
             hand_rank_class = self.evaluator.get_rank_class(score)
             hand_name = self.evaluator.class_to_string(hand_rank_class).lower()
         except Exception:
@@ -1,6 +1,83 @@
 from engine.brain import Brain
 import random
-from treys import Card, Evaluator
+from treys import Evaluator
+from engine.cards import RANK, SUIT, combo_index, four_in_a_row, mask, max_suit_count
+from engine.preflop import compile_heuristic
+from engine.pushfold import push_fold_action
+
+
+def _preflop_score(hand):
+    """Rate pre-flop hand strength (0-10 scale)"""
+    # Convert to ranks and suits
+    c1, c2 = hand[0], hand[1]
+    rank1 = RANK[c1]
+    rank2 = RANK[c2]
+    suit1 = SUIT[c1]
+    suit2 = SUIT[c2]
+
+    high_rank = max(rank1, rank2)
+    low_rank = min(rank1, rank2)
+    is_pair = (rank1 == rank2)
+    is_suited = (suit1 == suit2)
+    gap = high_rank - low_rank
+
+    # Pairs
+    if is_pair:
+        if high_rank >= 12:  # AA, KK
+            return 10.0
+        elif high_rank >= 10:  # QQ, JJ
+            return 9.0
+        elif high_rank >= 8:  # TT, 99
+            return 7.5
+        elif high_rank >= 5:  # 88-66
+            return 6.5
+        else:  # 55-22
+            return 5.0
+
+    # High cards
+    if high_rank >= 12:  # Ace
+        if low_rank >= 11:  # AK
+            return 9.5 if is_suited else 9.0
+        elif low_rank >= 10:  # AQ
+            return 8.0 if is_suited else 7.5
+        elif low_rank >= 9:  # AJ
+            return 7.5 if is_suited else 7.0
+        elif low_rank >= 8:  # AT
+            return 7.0 if is_suited else 6.0
+        elif is_suited and low_rank >= 6:  # A9s-A7s
+            return 6.0
+        elif is_suited:  # A6s-A2s
+            return 5.5
+
+    if high_rank >= 11:  # King
+        if low_rank >= 10:  # KQ
+            return 7.5 if is_suited else 7.0
+        elif low_rank >= 9:  # KJ
+            return 7.0 if is_suited else 6.0
+        elif is_suited and low_rank >= 8:  # KTs
+            return 6.5
+
+    if high_rank >= 10:  # Queen
+        if low_rank >= 9:  # QJ
+            return 6.5 if is_suited else 5.5
+        elif is_suited and low_rank >= 8:  # QTs
+            return 6.0
+
+    # Suited connectors and one-gappers
+    if is_suited:
+        if gap <= 1 and high_rank >= 7:  # JTs, T9s, 98s, etc.
+            return 6.5
+        elif gap <= 2 and high_rank >= 8:
+            return 5.5
+
+    # Connected cards
+    if gap <= 1 and high_rank >= 9:
+        return 5.0
+
+    return 3.0  # Weak hand
+
+
+PREFLOP_STRENGTH = compile_heuristic("ClaudeBot", _preflop_score)
 
 class ClaudeBot(Brain):
     def __init__(self):
@@ -8,6 +85,10 @@ class ClaudeBot(Brain):
         self.evaluator = Evaluator()
         self.opponent_aggression = {}  # Track opponent behavior
         self.hand_history = []
+
+    def reset_for_game(self):
+        self.opponent_aggression = {}
+        self.hand_history = []
         
     def get_action(self, game_state):
         """Main decision-making function"""
@@ -28,6 +109,10 @@ class ClaudeBot(Brain):
         
         # === PRE-FLOP STRATEGY ===
         if street == "pre-flop":
+            # Short-stacked heads-up: play the push/fold Nash charts
+            chart_action = push_fold_action(game_state)
+            if chart_action is not None:
+                return chart_action
             return self._preflop_strategy(
                 hand, valid_actions, amount_to_call, stack, 
                 pot, position, num_active, is_button, game_state
@@ -116,7 +201,9 @@ class ClaudeBot(Brain):
         if len(board) == 0:
             return {"action": "check"} if "check" in valid_actions else {"action": "fold"}
         
-        score = self.evaluator.evaluate(board, hand)
+        score = game_state["player"].get("hand_rank")
+        if score is None:
+            score = self.evaluator.evaluate(board, hand)
         hand_rank = self.evaluator.get_rank_class(score)
         
         # Normalize hand strength (1 = best, 0 = worst)
@@ -201,103 +288,21 @@ class ClaudeBot(Brain):
         """Rate pre-flop hand strength (0-10 scale)"""
         if len(hand) != 2:
             return 0
-        
-        # Convert to ranks and suits
-        c1, c2 = hand[0], hand[1]
-        rank1 = Card.get_rank_int(c1)
-        rank2 = Card.get_rank_int(c2)
-        suit1 = Card.get_suit_int(c1)
-        suit2 = Card.get_suit_int(c2)
-        
-        high_rank = max(rank1, rank2)
-        low_rank = min(rank1, rank2)
-        is_pair = (rank1 == rank2)
-        is_suited = (suit1 == suit2)
-        gap = high_rank - low_rank
-        
-        # Pairs
-        if is_pair:
-            if high_rank >= 12:  # AA, KK
-                return 10.0
-            elif high_rank >= 10:  # QQ, JJ
-                return 9.0
-            elif high_rank >= 8:  # TT, 99
-                return 7.5
-            elif high_rank >= 5:  # 88-66
-                return 6.5
-            else:  # 55-22
-                return 5.0
-        
-        # High cards
-        if high_rank >= 12:  # Ace
-            if low_rank >= 11:  # AK
-                return 9.5 if is_suited else 9.0
-            elif low_rank >= 10:  # AQ
-                return 8.0 if is_suited else 7.5
-            elif low_rank >= 9:  # AJ
-                return 7.5 if is_suited else 7.0
-            elif low_rank >= 8:  # AT
-                return 7.0 if is_suited else 6.0
-            elif is_suited and low_rank >= 6:  # A9s-A7s
-                return 6.0
-            elif is_suited:  # A6s-A2s
-                return 5.5
-        
-        if high_rank >= 11:  # King
-            if low_rank >= 10:  # KQ
-                return 7.5 if is_suited else 7.0
-            elif low_rank >= 9:  # KJ
-                return 7.0 if is_suited else 6.0
-            elif is_suited and low_rank >= 8:  # KTs
-                return 6.5
-        
-        if high_rank >= 10:  # Queen
-            if low_rank >= 9:  # QJ
-                return 6.5 if is_suited else 5.5
-            elif is_suited and low_rank >= 8:  # QTs
-                return 6.0
-        
-        # Suited connectors and one-gappers
-        if is_suited:
-            if gap <= 1 and high_rank >= 7:  # JTs, T9s, 98s, etc.
-                return 6.5
-            elif gap <= 2 and high_rank >= 8:
-                return 5.5
-        
-        # Connected cards
-        if gap <= 1 and high_rank >= 9:
-            return 5.0
-        
-        return 3.0  # Weak hand
+        return PREFLOP_STRENGTH[combo_index(*hand)]
     
     def _estimate_draw_potential(self, hand, board, street):
         """Estimate drawing potential (flush draws, straight draws)"""
         if len(board) < 3:
             return 0
         
-        # Count suits
-        all_cards = hand + board
-        suit_counts = {}
-        for card in all_cards:
-            suit = Card.get_suit_int(card)
-            suit_counts[suit] = suit_counts.get(suit, 0) + 1
+        cards = mask(hand + board)
         
         # Flush draw potential
-        max_suit_count = max(suit_counts.values())
         flush_draw = 0
-        if max_suit_count == 4 and street != "river":
+        if max_suit_count(cards) == 4 and street != "river":
             flush_draw = 0.35  # ~35% to hit flush
         
-        # Straight draw potential (simplified)
-        ranks = sorted([Card.get_rank_int(c) for c in all_cards])
-        unique_ranks = sorted(set(ranks))
-        
-        straight_draw = 0
-        if len(unique_ranks) >= 4:
-            # Check for open-ended straight draw
-            for i in range(len(unique_ranks) - 3):
-                if unique_ranks[i+3] - unique_ranks[i] == 3:
-                    straight_draw = 0.3
-                    break
+        # Straight draw potential (simplified): four consecutive ranks
+        straight_draw = 0.3 if four_in_a_row(cards) else 0
         
         return max(flush_draw, straight_draw)
\ No newline at end of file
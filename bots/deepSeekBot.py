@@ -2,16 +2,112 @@ from engine.brain import Brain
 import time
 import random
 import json
-from treys import Card, Evaluator, Deck
+from treys import Evaluator
 import math
+import numpy as np
+from engine.cards import RANK, SUIT, combo_index
+from engine.equity import range_equity
+from engine.opponent_stats import OpponentStats
+from engine.preflop import compile_heuristic
+from engine.range_tracker import RangeTracker
+
+
+def _pre_flop_score(hand):
+    """Advanced pre-flop hand evaluation with card removal effects"""
+    card1 = hand[0]
+    card2 = hand[1]
+
+    rank1 = RANK[card1]
+    rank2 = RANK[card2]
+    suited = SUIT[card1] == SUIT[card2]
+
+    # Premium hands
+    if rank1 == rank2:  # Pocket pairs
+        if rank1 >= 12:  # AA
+            return 0.98
+        elif rank1 >= 10:  # KK, QQ
+            return 0.95
+        elif rank1 >= 8:  # JJ, TT
+            return 0.85
+        elif rank1 >= 6:  # 99, 88, 77
+            return 0.70
+        else:  # 22-66
+            return 0.55
+
+    # Ace hands
+    if rank1 == 12 or rank2 == 12:
+        other_rank = rank2 if rank1 == 12 else rank1
+        if suited:
+            if other_rank >= 10:  # AKs, AQs
+                return 0.92
+            elif other_rank >= 8:  # AJs, ATs
+                return 0.80
+            else:  # A9s-A2s
+                return 0.65
+        else:
+            if other_rank >= 10:  # AKo, AQo
+                return 0.88
+            elif other_rank >= 8:  # AJo, ATo
+                return 0.70
+            else:  # A9o-A2o
+                return 0.50
+
+    # Broadway cards
+    if rank1 >= 8 and rank2 >= 8:
+        rank_diff = abs(rank1 - rank2)
+        if suited:
+            if rank_diff == 1:  # KQs, QJs, JTs
+                return 0.75
+            elif rank_diff == 2:  # KJs, QTs
+                return 0.65
+            else:  # KTs, Q9s, etc.
+                return 0.55
+        else:
+            if rank_diff == 1:  # KQo, QJo, JTo
+                return 0.65
+            else:
+                return 0.50
+
+    # Suited connectors
+    rank_diff = abs(rank1 - rank2)
+    if suited and rank_diff <= 2:
+        if max(rank1, rank2) >= 9:  # T9s, 98s
+            return 0.60
+        elif max(rank1, rank2) >= 7:  # 87s, 76s
+            return 0.50
+        else:  # 65s, 54s, etc.
+            return 0.40
+
+    # Pocket pairs 22-66 already handled, so remaining are weak hands
+    return 0.25
+
+
+PRE_FLOP_STRENGTH = compile_heuristic("DeepSeekBot", _pre_flop_score)
+
+# Hands an opponent must have played before their stats replace the defaults
+MIN_HANDS_OBSERVED = 5
 
 class DeepSeekBot(Brain):
     def __init__(self):
         super().__init__()
         self.evaluator = Evaluator()
         self.hand_history = []
-        self.opponent_stats = {}
+        self.opponent_stats = OpponentStats()
+        self.range_tracker = RangeTracker()
+        self.last_action = None
+
+    def reset_for_game(self):
+        self.hand_history = []
+        self.opponent_stats = OpponentStats()
+        self.range_tracker.reset()
         self.last_action = None
+
+    def reset_for_hand(self):
+        # Opponent ranges and dead cards only hold within a hand
+        self.range_tracker.reset()
+
+    def observe(self, event):
+        self.opponent_stats.observe(event)
         
     def get_action(self, game_state):
         valid_actions = game_state["valid_actions"]
@@ -48,16 +144,18 @@ class DeepSeekBot(Brain):
         return action
     
     def _calculate_hand_strength(self, hand, board, game_state):
-        """Calculate hand strength with iterative Monte Carlo simulation"""
+        """Calculate hand strength from made-hand rank and range equity"""
         if len(board) == 0:
             equity = self._evaluate_pre_flop_hand(hand)
             return equity, equity
         
-        # Use Monte Carlo for post-flop equity calculation
-        equity = self._monte_carlo_equity(hand, board, game_state["num_active_players"] - 1, 200)
+        # Post-flop equity against the opponents' tracked ranges
+        equity = self._range_equity(hand, board, game_state)
         
         # Calculate current hand strength
-        current_score = self.evaluator.evaluate(board, hand)
+        current_score = game_state["player"].get("hand_rank")
+        if current_score is None:
+            current_score = self.evaluator.evaluate(board, hand)
         current_strength = 1 - (current_score / 7462.0)
         
         # For drawing hands, weight potential higher
@@ -70,161 +168,19 @@ class DeepSeekBot(Brain):
             
         return min(1.0, combined_strength), equity
     
-    def _monte_carlo_equity(self, hand, board, num_opponents, iterations=200):
-        """Iterative Monte Carlo equity calculation"""
-        if len(board) == 5:  # River - no more cards to come
-            return self._evaluate_river_equity(hand, board, num_opponents, iterations)
-        
-        wins = 0
-        total_trials = 0
-        
-        for _ in range(iterations):
-            deck = Deck()
-            
-            # Remove known cards
-            known_cards = hand + board
-            for card in known_cards:
-                if card in deck.cards:
-                    deck.cards.remove(card)
-            
-            # Deal remaining board cards
-            remaining_cards = 5 - len(board)
-            if remaining_cards > 0:
-                try:
-                    new_board_cards = deck.draw(remaining_cards)
-                    test_board = board + new_board_cards
-                except:
-                    # Fallback if draw fails
-                    test_board = board
-            else:
-                test_board = board
-            
-            # Simulate opponents' hands and determine winner
-            trial_wins = self._simulate_showdown(hand, test_board, num_opponents, deck)
-            wins += trial_wins
-            total_trials += num_opponents
-            
-        return wins / total_trials if total_trials > 0 else 0.5
-    
-    def _simulate_showdown(self, my_hand, board, num_opponents, deck):
-        """Simulate a single showdown iteration"""
-        if len(deck.cards) < num_opponents * 2:
-            return 0.5  # Not enough cards, return neutral equity
-            
-        my_score = self.evaluator.evaluate(board, my_hand)
-        wins = 0
-        
-        for i in range(num_opponents):
-            if len(deck.cards) >= 2:
-                opp_hand = deck.draw(2)
-                opp_score = self.evaluator.evaluate(board, opp_hand)
-                
-                if my_score < opp_score:
-                    wins += 1  # I win
-                elif my_score == opp_score:
-                    wins += 0.5  # Tie
-                # else: opp wins (0 points)
-        
-        return wins
-    
-    def _evaluate_river_equity(self, hand, board, num_opponents, iterations=100):
-        """Evaluate equity on river with random opponent hands"""
-        wins = 0
-        total = 0
-        
-        for _ in range(iterations):
-            deck = Deck()
-            known_cards = hand + board
-            for card in known_cards:
-                if card in deck.cards:
-                    deck.cards.remove(card)
-            
-            my_score = self.evaluator.evaluate(board, hand)
-            round_wins = 0
-            
-            for i in range(num_opponents):
-                if len(deck.cards) >= 2:
-                    opp_hand = deck.draw(2)
-                    opp_score = self.evaluator.evaluate(board, opp_hand)
-                    
-                    if my_score < opp_score:
-                        round_wins += 1
-                    elif my_score == opp_score:
-                        round_wins += 0.5
-            
-            wins += round_wins
-            total += num_opponents
-            
-        return wins / total if total > 0 else 0.5
+    def _range_equity(self, hand, board, game_state):
+        """Average equity against each active opponent's tracked range"""
+        # Seed numpy from the random module so seeded games stay reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        equities = [
+            range_equity(hand, board, [self.range_tracker.range(opp["name"])], num_sims=200, rng=rng)
+            for opp in game_state["opponents"] if opp["is_active"]
+        ]
+        return sum(equities) / len(equities) if equities else 0.5
     
     def _evaluate_pre_flop_hand(self, hand):
-        """Advanced pre-flop hand evaluation with card removal effects"""
-        card1 = hand[0]
-        card2 = hand[1]
-        
-        rank1 = Card.get_rank_int(card1)
-        rank2 = Card.get_rank_int(card2)
-        suited = Card.get_suit_int(card1) == Card.get_suit_int(card2)
-        
-        # Premium hands
-        if rank1 == rank2:  # Pocket pairs
-            if rank1 >= 12:  # AA
-                return 0.98
-            elif rank1 >= 10:  # KK, QQ
-                return 0.95
-            elif rank1 >= 8:  # JJ, TT
-                return 0.85
-            elif rank1 >= 6:  # 99, 88, 77
-                return 0.70
-            else:  # 22-66
-                return 0.55
-                
-        # Ace hands
-        if rank1 == 12 or rank2 == 12:
-            other_rank = rank2 if rank1 == 12 else rank1
-            if suited:
-                if other_rank >= 10:  # AKs, AQs
-                    return 0.92
-                elif other_rank >= 8:  # AJs, ATs
-                    return 0.80
-                else:  # A9s-A2s
-                    return 0.65
-            else:
-                if other_rank >= 10:  # AKo, AQo
-                    return 0.88
-                elif other_rank >= 8:  # AJo, ATo
-                    return 0.70
-                else:  # A9o-A2o
-                    return 0.50
-        
-        # Broadway cards
-        if rank1 >= 8 and rank2 >= 8:
-            rank_diff = abs(rank1 - rank2)
-            if suited:
-                if rank_diff == 1:  # KQs, QJs, JTs
-                    return 0.75
-                elif rank_diff == 2:  # KJs, QTs
-                    return 0.65
-                else:  # KTs, Q9s, etc.
-                    return 0.55
-            else:
-                if rank_diff == 1:  # KQo, QJo, JTo
-                    return 0.65
-                else:
-                    return 0.50
-        
-        # Suited connectors
-        rank_diff = abs(rank1 - rank2)
-        if suited and rank_diff <= 2:
-            if max(rank1, rank2) >= 9:  # T9s, 98s
-                return 0.60
-            elif max(rank1, rank2) >= 7:  # 87s, 76s
-                return 0.50
-            else:  # 65s, 54s, etc.
-                return 0.40
-                
-        # Pocket pairs 22-66 already handled, so remaining are weak hands
-        return 0.25
+        """Pre-flop hand strength from the precompiled table"""
+        return PRE_FLOP_STRENGTH[combo_index(hand[0], hand[1])]
     
     def _calculate_position_advantage(self, game_state):
         """Calculate position advantage with table dynamics"""
@@ -279,40 +235,28 @@ class DeepSeekBot(Brain):
         return max(0.1, min(0.95, aggression))
     
     def _update_opponent_stats(self, game_state):
-        """Track opponent statistics for player profiling"""
-        for opp in game_state["opponents"]:
-            name = opp["name"]
-            if name not in self.opponent_stats:
-                self.opponent_stats[name] = {
-                    "hands_observed": 0,
-                    "preflop_raises": 0,
-                    "postflop_aggression": 0,
-                    "fold_to_cbet": 0,
-                    "cbet_opportunities": 0
-                }
+        """Narrow opponents' ranges from the bet changes visible in game_state"""
+        self.range_tracker.observe_game_state(game_state)
     
     def _get_opponent_tendencies(self, game_state):
-        """Calculate opponent tendencies for adaptive play"""
-        if not self.opponent_stats:
-            return {
-                "avg_aggression": 0.5,
-                "fold_frequency": 0.3,
-                "tightness": 0.5
-            }
-        
-        total_aggression = 0
-        total_fold_freq = 0
-        count = len(self.opponent_stats)
-        
-        for stats in self.opponent_stats.values():
-            total_aggression += stats.get("postflop_aggression", 0.5)
-            if stats.get("cbet_opportunities", 0) > 0:
-                total_fold_freq += stats.get("fold_to_cbet", 0) / stats.get("cbet_opportunities", 1)
+        """Average tendencies of the opponents still in the hand, from the event feed"""
+        aggression, fold_to_cbet, vpip = [], [], []
+        for opp in game_state["opponents"]:
+            if not opp["is_active"]:
+                continue
+            stats = self.opponent_stats.get(opp["name"])
+            if stats is None or stats.hands < MIN_HANDS_OBSERVED:
+                continue
+            if stats.aggression_frequency is not None:
+                aggression.append(stats.aggression_frequency)
+            if stats.fold_to_cbet is not None:
+                fold_to_cbet.append(stats.fold_to_cbet)
+            vpip.append(stats.vpip)
         
         return {
-            "avg_aggression": total_aggression / count,
-            "fold_frequency": total_fold_freq / count if count > 0 else 0.3,
-            "tightness": 0.6  # Default to slightly tight
+            "avg_aggression": sum(aggression) / len(aggression) if aggression else 0.5,
+            "fold_frequency": sum(fold_to_cbet) / len(fold_to_cbet) if fold_to_cbet else 0.3,
+            "tightness": 1 - sum(vpip) / len(vpip) if vpip else 0.5
         }
     
     def _pre_flop_strategy(self, game_state, hand_strength, position_advantage, equity):
@@ -4,8 +4,21 @@ import json
 from treys import Card, Evaluator
 
 class FirstBot(Brain):
+    pure = True
+    # Post-flop play only depends on the made hand's class (ranked by the engine);
+    # states without an engine ranking are keyed on the cards themselves. The
+    # stack only sizes the all-in, which complete_decision fills in
+    decision_keys = ("street", "valid_actions", "player.hand_class")
+    decision_fallbacks = {"player.hand_class": ("player.hand", "community_cards")}
+
     def __init__(self):
         super().__init__()
+        self.evaluator = Evaluator()
+
+    def complete_decision(self, action, game_state):
+        if action["action"] in ("raise", "bet"):
+            action["amount"] = game_state["player"]["stack"]
+        return action
 
     def get_action(self, game_state):
         valid_actions = game_state["valid_actions"]
@@ -13,7 +26,7 @@ class FirstBot(Brain):
         hand = player["hand"]
         board = game_state.get("community_cards", [])
         street = game_state.get("street", "")
-        evaluator = Evaluator()
+        evaluator = self.evaluator
 
         # --- PRE-FLOP LOGIC ---
         #Always call pre flop if possible
@@ -27,7 +40,9 @@ class FirstBot(Brain):
         if len(board) == 0:
             score = evaluator.evaluate([], hand)
         else:
-            score = evaluator.evaluate(board, hand)
+            score = player.get("hand_rank")
+            if score is None:
+                score = evaluator.evaluate(board, hand)
 
         hand_rank = evaluator.get_rank_class(score)
         hand_name = evaluator.class_to_string(hand_rank)
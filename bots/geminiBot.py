@@ -12,6 +12,12 @@ class GeminiBot(Brain):
         super().__init__()
         self.evaluator = Evaluator()
 
+        # Tunable parameters:
+        self.raise_equity_margin = 0.20   # pre-flop: raise above 1/players + margin
+        self.call_equity_margin = 0.10    # pre-flop: call above 1/players + margin
+        self.monster_equity = 0.85        # post-flop: raise/bet big above this equity
+        self.strong_equity = 0.65         # post-flop: bet half pot above this equity
+
     def calculate_equity(self, my_hand, board, num_opponents, num_sims=300):
         """
         Runs a Monte Carlo simulation to estimate win/tie equity.
@@ -22,8 +28,10 @@ class GeminiBot(Brain):
 
         known_cards = my_hand + board
         
-        # Get a full list of 52 card integers
-        full_deck = Deck().cards 
+        # Get a full list of 52 card integers, always in the same order so the
+        # simulation only depends on the random module's state (Deck() shuffles
+        # with its own unseeded generator)
+        full_deck = Deck.GetFullDeck()
         
         # Remove known cards from the deck
         remaining_deck = [c for c in full_deck if c not in known_cards]
@@ -108,8 +116,8 @@ class GeminiBot(Brain):
         if street.lower() == "pre-flop":
             # Dynamic thresholds based on number of players
             # "Average" equity is 1 / num_active_players
-            equity_threshold_raise = (1.0 / num_active_players) + 0.20 # Raise w/ top ~20%
-            equity_threshold_call = (1.0 / num_active_players) + 0.10  # Call w/ top ~30%
+            equity_threshold_raise = (1.0 / num_active_players) + self.raise_equity_margin # Raise w/ top ~20%
+            equity_threshold_call = (1.0 / num_active_players) + self.call_equity_margin  # Call w/ top ~30%
             
             # A. Raise/Re-raise with strong hands
             if win_equity > equity_threshold_raise:
@@ -138,7 +146,7 @@ class GeminiBot(Brain):
         # --- 4. Post-flop Logic ---
         
         # A. Monsters (e.g., >85% equity) - Bet/Raise for max value
-        if win_equity > 0.85:
+        if win_equity > self.monster_equity:
             if "raise" in valid_actions:
                 # Raise pot-sized
                 raise_amount = pot + amount_to_call 
@@ -153,7 +161,7 @@ class GeminiBot(Brain):
                 return {"action": "bet", "amount": int(bet_amount)}
 
         # B. Strong Hands (e.g., >65% equity) - Bet for value, call raises
-        if win_equity > 0.65:
+        if win_equity > self.strong_equity:
             if "bet" in valid_actions:
                 # Bet 1/2 pot
                 bet_amount = pot * 0.5
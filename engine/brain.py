@@ -1,4 +1,22 @@
 class Brain:
+    # Set to True in bots whose state cannot be cleared by reset_for_game();
+    # BrainPool then builds a new instance for every game instead of reusing one
+    fresh_per_game = False
+
+    # Set to False in bots whose decisions depend on randomness other than the
+    # random module (OS entropy, an outside process), so a seeded game cannot
+    # be played again with the same result; the result cache skips such runs
+    reproducible = True
+
+    # Declared-pure brains: get_action() is a deterministic function of these
+    # game_state keys ("player.hand" for nested ones) and instance attributes,
+    # so PokerGame may memoize it (see engine/memo.py). decision_fallbacks maps
+    # a key the engine may leave as None to the keys it is derived from
+    pure = False
+    decision_keys = ()
+    decision_params = ()
+    decision_fallbacks = {}
+
     def __init__(self):
         pass
     
@@ -9,3 +27,71 @@ class Brain:
         """
         raise NotImplementedError("Subclasses must implement get_action()")
 
+    def complete_decision(self, action, game_state):
+        """
+        Called on every memoized decision served from the cache. Pure brains
+        whose action depends on an undeclared key only through its amount
+        (e.g. an all-in sized from the stack) fill it in here from game_state.
+        """
+        return action
+
+    def reset_for_game(self):
+        """
+        Called before each game when the instance is reused across games.
+        Override to clear anything learned during a game (opponent models,
+        histories) so the brain starts like a newly constructed one.
+        """
+        pass
+
+    def reset_for_hand(self):
+        """Called at the start of every hand, before the blinds are posted."""
+        pass
+
+    def observe(self, event):
+        """
+        Table event feed (actions, streets, showdowns; see engine/opponent_stats.py).
+        PokerGame only subscribes brains that override this.
+        """
+        pass
+
+
+class BrainPool:
+    """
+    Keeps one brain instance per seat warm across games.
+
+    Seats configured with a brain class get an instance built on first use and
+    reset with reset_for_game() for later games, so constructors (evaluator
+    tables, precomputation) run once per run instead of once per game. Classes
+    with fresh_per_game = True are constructed for every game. Seats configured
+    with an instance always get that instance, reset before each game.
+    """
+
+    def __init__(self):
+        self.instances = {}
+
+    def acquire(self, name, brain):
+        """
+        Args:
+            name: Seat name
+            brain: Brain class or instance from the player configs
+
+        Returns:
+            Brain instance ready for a new game
+        """
+        if not isinstance(brain, type):
+            if hasattr(brain, "reset_for_game"):
+                brain.reset_for_game()
+            return brain
+        # Classes that don't subclass Brain have no way to be reset, so are never reused
+        if getattr(brain, "fresh_per_game", True):
+            return brain()
+
+        instance = self.instances.get((name, brain))
+        if instance is None:
+            instance = self.instances[(name, brain)] = brain()
+        else:
+            instance.reset_for_game()
+        return instance
+
+    def clear(self):
+        self.instances.clear()
@@ -0,0 +1,398 @@
+"""
+Hand-strength bucket abstraction (EHS / EHS²).
+
+An offline pipeline computes, for every suit-isomorphic (hole, board) class
+on each street:
+
+    EHS   expected hand strength: probability of beating a random opponent
+          hand at showdown, ties counting half, over all runouts
+    EHS²  expected squared strength over runouts, which separates made hands
+          from draws with the same EHS
+
+and clusters the classes of each street into K buckets with weighted k-means
+on (EHS, EHS²). Buckets are numbered by increasing EHS.
+
+Suit isomorphism: hands that differ only by a relabeling of suits have the
+same strength. Each suit gets a signature (hole ranks, board ranks in that
+suit), suits are relabeled in decreasing signature order and the relabeled
+cards are packed into one integer key. Class counts per street:
+
+    pre-flop       169
+    flop     1,286,792
+    turn    13,960,050
+    river  123,156,254
+
+Both estimates are Monte Carlo: every sample draws a runout and two
+independent opponent hands, so the product of the two results is an
+unbiased estimate of the squared strength on that runout. Work is split into
+batches of board classes, spread over a process pool and seeded per batch,
+so the output does not depend on the number of workers.
+
+The result is one file holding two .npy arrays back to back, the sorted keys
+and their (EHS, EHS², bucket) records, both opened memory-mapped. A lookup is
+one canonicalization and a binary search over the contiguous keys:
+
+    b = buckets()
+    record = b.lookup(hand, board)        # None for streets not built
+    record["ehs"], record["ehs2"], record["bucket"]
+
+    python -m engine.buckets [--streets pre-flop,flop] [--buckets 50] [--workers N]
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+import argparse
+import os
+import time
+
+import numpy as np
+
+from engine.cards import CARD_INDEX
+from engine.equity import COMBOS
+from engine.vector_eval import FULL_DECK, evaluate
+
+BUCKET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "buckets.npy")
+STREETS = ("pre-flop", "flop", "turn", "river")
+BOARD_SIZES = {"pre-flop": 0, "flop": 3, "turn": 4, "river": 5}
+STREET_OF_BOARD = {0: 0, 3: 1, 4: 2, 5: 3}
+DEFAULT_SAMPLES = {"pre-flop": 4096, "flop": 256, "turn": 128, "river": 64}
+DEFAULT_BUCKETS = 50
+
+BUCKET_DTYPE = np.dtype([
+    ("ehs", "<f2"),
+    ("ehs2", "<f2"),
+    ("bucket", "u1"),
+])
+
+_STREET_SHIFT = 42  # 7 cards x 6 bits
+_BATCH_ROWS = 1 << 16
+
+_buckets = None
+
+
+def hand_key(hand, board):
+    """Canonical key of two hole cards and a 0, 3, 4 or 5 card board (treys ints)."""
+    hole = [CARD_INDEX[card] for card in hand]
+    table = [CARD_INDEX[card] for card in board]
+    signature = [0, 0, 0, 0]
+    for index in hole:
+        signature[index & 3] |= 1 << (13 + (index >> 2))
+    for index in table:
+        signature[index & 3] |= 1 << (index >> 2)
+    relabel = [0, 0, 0, 0]
+    for position, suit in enumerate(sorted(range(4), key=signature.__getitem__, reverse=True)):
+        relabel[suit] = position
+
+    key = 0
+    for index in sorted([(index & ~3) | relabel[index & 3] for index in hole]):
+        key = (key << 6) | index
+    for index in sorted([(index & ~3) | relabel[index & 3] for index in table]):
+        key = (key << 6) | index
+    return (STREET_OF_BOARD[len(table)] << _STREET_SHIFT) | key
+
+
+def canonical_keys(hole, board):
+    """
+    Vectorized hand_key.
+
+    Args:
+        hole: (N, 2) card indices, or (N, 0) to canonicalize boards alone
+        board: (N, k) card indices, k in 0, 3, 4, 5
+
+    Returns:
+        uint64 array of shape (N,)
+    """
+    n, k = len(hole), board.shape[1]
+    rows = np.arange(n)
+    signature = np.zeros((n, 4), dtype=np.int64)
+    for j in range(hole.shape[1]):
+        signature[rows, hole[:, j] & 3] |= np.int64(1) << (13 + (hole[:, j] >> 2))
+    for j in range(k):
+        signature[rows, board[:, j] & 3] |= np.int64(1) << (board[:, j] >> 2)
+    relabel = np.argsort(np.argsort(-signature, axis=1, kind="stable"), axis=1)
+
+    key = np.zeros(n, dtype=np.uint64)
+    for cards in (hole, board):
+        cards = np.sort((cards & ~3) | relabel[rows[:, None], cards & 3], axis=1)
+        for j in range(cards.shape[1]):
+            key = (key << np.uint64(6)) | cards[:, j].astype(np.uint64)
+    return key | np.uint64(STREET_OF_BOARD[k] << _STREET_SHIFT)
+
+
+def board_classes(size):
+    """
+    Representative boards of every suit-isomorphic board class.
+
+    Returns:
+        (boards, counts): (M, size) card indices and the number of boards in each class
+    """
+    if size == 0:
+        return np.zeros((1, 0), dtype=np.intp), np.ones(1, dtype=np.int64)
+    boards = np.array(list(combinations(range(52), size)), dtype=np.intp)
+    keys = canonical_keys(np.zeros((len(boards), 0), dtype=np.intp), boards)
+    _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    return boards[first], counts
+
+
+def hand_classes(boards, board_counts):
+    """
+    Every (hole, board) class with a representative on the given board classes.
+
+    Boards must be representatives of distinct board classes, so classes found
+    on different boards never coincide.
+
+    Returns:
+        (keys, hole, board, weights) with one row per class; weights count the
+        raw (hole, board) combinations in each class
+    """
+    size = boards.shape[1]
+    board_masks = np.zeros(len(boards), dtype=np.int64)
+    for j in range(size):
+        board_masks |= np.int64(1) << boards[:, j]
+    combo_masks = (np.int64(1) << COMBOS[:, 0]) | (np.int64(1) << COMBOS[:, 1])
+
+    b, c = np.nonzero((board_masks[:, None] & combo_masks[None, :]) == 0)
+    hole, board = COMBOS[c], boards[b]
+    keys = canonical_keys(hole, board)
+    keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    return keys, hole[first], board[first], counts * board_counts[b[first]]
+
+
+def strength(hole, board, samples, rng):
+    """
+    Monte Carlo EHS and EHS² of many (hole, board) rows.
+
+    Args:
+        hole: (N, 2) card indices
+        board: (N, k) card indices
+        samples: Runouts per row
+        rng: np.random.Generator
+
+    Returns:
+        (ehs, ehs2) float arrays of shape (N,)
+    """
+    n, k = len(hole), board.shape[1]
+    to_come = 5 - k
+    rows = np.arange(n)[:, None]
+    dead = np.zeros((n, 52), dtype=bool)
+    dead[rows, hole] = True
+    dead[rows, board] = True
+
+    total = np.zeros(n)
+    squared = np.zeros(n)
+    for _ in range(samples):
+        keys = rng.random((n, 52))
+        keys[dead] = 2.0
+        drawn = np.argpartition(keys, to_come + 2, axis=1)[:, :to_come + 2]
+        runout = np.concatenate([board, drawn[:, :to_come]], axis=1)
+
+        # Second opponent drawn independently of the first, given the runout
+        keys = rng.random((n, 52))
+        keys[dead] = 2.0
+        keys[rows, drawn[:, :to_come]] = 2.0
+        second = np.argpartition(keys, 2, axis=1)[:, :2]
+
+        ours = evaluate(FULL_DECK[np.concatenate([hole, runout], axis=1)])
+        results = []
+        for opponent in (drawn[:, to_come:], second):
+            theirs = evaluate(FULL_DECK[np.concatenate([opponent, runout], axis=1)])
+            results.append((ours < theirs) + 0.5 * (ours == theirs))
+        total += results[0] + results[1]
+        squared += results[0] * results[1]
+    return total / (2 * samples), squared / samples
+
+
+def _strength_task(task):
+    boards, board_counts, samples, seed = task
+    keys, hole, board, weights = hand_classes(boards, board_counts)
+    rng = np.random.default_rng(seed)
+    ehs = np.empty(len(keys))
+    ehs2 = np.empty(len(keys))
+    for start in range(0, len(keys), _BATCH_ROWS):
+        part = slice(start, start + _BATCH_ROWS)
+        ehs[part], ehs2[part] = strength(hole[part], board[part], samples, rng)
+    return keys, weights, ehs, ehs2
+
+
+def street_strengths(street, samples=None, workers=None, seed=0, verbose=True):
+    """
+    EHS and EHS² of every class on one street.
+
+    Returns:
+        (keys, weights, ehs, ehs2) sorted by key
+    """
+    samples = samples or DEFAULT_SAMPLES[street]
+    boards, board_counts = board_classes(BOARD_SIZES[street])
+    per_task = max(1, _BATCH_ROWS // 1176)
+    tasks = [(boards[i:i + per_task], board_counts[i:i + per_task], samples, (seed, STREETS.index(street), i))
+             for i in range(0, len(boards), per_task)]
+
+    workers = workers or os.cpu_count() or 1
+    start = time.time()
+    parts = []
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            for part in pool.map(_strength_task, tasks):
+                parts.append(part)
+    else:
+        for done, task in enumerate(tasks, 1):
+            parts.append(_strength_task(task))
+            if verbose and done % 100 == 0:
+                print(f"  {street}: {done}/{len(tasks)} batches, {time.time() - start:.0f}s")
+
+    keys, weights, ehs, ehs2 = (np.concatenate(column) for column in zip(*parts))
+    order = np.argsort(keys)
+    if verbose:
+        print(f"{street}: {len(keys):,} classes, {samples} samples each, {time.time() - start:.1f}s")
+    return keys[order], weights[order], ehs[order], ehs2[order]
+
+
+def kmeans(points, weights, k, iterations=50, chunk=1 << 16):
+    """
+    Weighted k-means (Lloyd) on (N, d) points, initialized at EHS quantiles.
+
+    Returns:
+        (labels, centroids) with labels numbered by increasing first coordinate
+    """
+    k = min(k, len(points))
+    order = np.argsort(points[:, 0], kind="stable")
+    cumulative = np.cumsum(weights[order]) / weights.sum()
+    seeds = order[np.minimum(np.searchsorted(cumulative, (np.arange(k) + 0.5) / k), len(points) - 1)]
+    centroids = points[seeds].astype(float)
+
+    labels = np.zeros(len(points), dtype=np.intp)
+    for _ in range(iterations):
+        for start in range(0, len(points), chunk):
+            block = points[start:start + chunk]
+            distances = ((block[:, None, :] - centroids[None]) ** 2).sum(axis=2)
+            labels[start:start + chunk] = distances.argmin(axis=1)
+        mass = np.bincount(labels, weights=weights, minlength=k)
+        moved = np.stack([np.bincount(labels, weights=weights * points[:, d], minlength=k)
+                          for d in range(points.shape[1])], axis=1)
+        updated = np.where(mass[:, None] > 0, moved / np.maximum(mass, 1e-12)[:, None], centroids)
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+
+    ranking = np.argsort(np.argsort(centroids[:, 0], kind="stable"))
+    return ranking[labels], centroids[np.argsort(centroids[:, 0], kind="stable")]
+
+
+def build_buckets(streets=("pre-flop", "flop"), num_buckets=DEFAULT_BUCKETS, samples=None,
+                  workers=None, seed=0, verbose=True):
+    """
+    Run the pipeline for the given streets.
+
+    Args:
+        samples: Optional dict street -> samples per class (DEFAULT_SAMPLES otherwise)
+
+    Returns:
+        HandBuckets over an in-memory record array
+    """
+    samples = samples or {}
+    parts = []
+    for street in streets:
+        keys, weights, ehs, ehs2 = street_strengths(street, samples.get(street), workers, seed, verbose)
+        labels, _ = kmeans(np.stack([ehs, ehs2], axis=1), weights.astype(float), num_buckets)
+        records = np.empty(len(keys), dtype=BUCKET_DTYPE)
+        records["ehs"] = ehs
+        records["ehs2"] = ehs2
+        records["bucket"] = labels
+        parts.append((keys, records))
+    keys = np.concatenate([keys for keys, _ in parts])
+    records = np.concatenate([records for _, records in parts])
+    order = np.argsort(keys, kind="stable")
+    return HandBuckets(keys[order], records[order])
+
+
+class HandBuckets:
+    def __init__(self, keys, records):
+        """
+        Args:
+            keys: Sorted uint64 class keys (in memory or memory-mapped)
+            records: BUCKET_DTYPE array aligned with keys
+        """
+        self.keys = keys
+        self.records = records
+        self._num_buckets = {}
+
+    @classmethod
+    def load(cls, path=BUCKET_PATH):
+        arrays = []
+        with open(path, "rb") as f:
+            for _ in range(2):
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+                offset = f.tell()
+                arrays.append(np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape).view(np.ndarray))
+                f.seek(offset + dtype.itemsize * shape[0])
+        return cls(*arrays)
+
+    def save(self, path=BUCKET_PATH):
+        with open(path, "wb") as f:
+            np.lib.format.write_array(f, np.ascontiguousarray(self.keys))
+            np.lib.format.write_array(f, np.ascontiguousarray(self.records))
+
+    def _street_range(self, street):
+        low = np.uint64(STREETS.index(street) << _STREET_SHIFT)
+        high = np.uint64((STREETS.index(street) + 1) << _STREET_SHIFT)
+        return np.searchsorted(self.keys, low), np.searchsorted(self.keys, high)
+
+    def streets(self):
+        """Streets present in the file."""
+        return [street for street in STREETS if self.num_buckets(street) > 0]
+
+    def num_buckets(self, street):
+        if street not in self._num_buckets:
+            start, end = self._street_range(street)
+            self._num_buckets[street] = int(self.records["bucket"][start:end].max()) + 1 if end > start else 0
+        return self._num_buckets[street]
+
+    def lookup(self, hand, board):
+        """Record of a hand's class, or None when its street was not built."""
+        key = np.uint64(hand_key(hand, board))
+        i = np.searchsorted(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.records[i]
+        return None
+
+    def bucket(self, hand, board):
+        record = self.lookup(hand, board)
+        return None if record is None else int(record["bucket"])
+
+    def ehs(self, hand, board):
+        record = self.lookup(hand, board)
+        return None if record is None else float(record["ehs"])
+
+
+def buckets():
+    """The saved buckets, memory-mapped once."""
+    global _buckets
+    if _buckets is None:
+        _buckets = HandBuckets.load()
+    return _buckets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build engine/buckets.npy")
+    parser.add_argument("--streets", default="pre-flop,flop")
+    parser.add_argument("--buckets", type=int, default=DEFAULT_BUCKETS)
+    parser.add_argument("--samples", type=int, help="Samples per class on every street")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default=BUCKET_PATH)
+    args = parser.parse_args()
+
+    streets = args.streets.split(",")
+    start = time.time()
+    built = build_buckets(streets, args.buckets, {s: args.samples for s in streets} if args.samples else None,
+                          args.workers)
+    built.save(args.output)
+    print(f"Saved {len(built.keys):,} classes ({(built.keys.nbytes + built.records.nbytes) / 2 ** 20:.1f} MB) "
+          f"to {args.output} in {time.time() - start:.1f}s")
+    for street in streets:
+        lo, hi = built._street_range(street)
+        ehs = built.records["ehs"][lo:hi].astype(float)
+        print(f"  {street:<8} {hi - lo:>11,} classes  {built.num_buckets(street)} buckets  "
+              f"mean EHS {ehs.mean():.3f}")
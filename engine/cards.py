@@ -0,0 +1,154 @@
+"""
+Bitboard card representation and precomputed feature tables.
+
+A set of cards is a 52-bit int with bit suit * 13 + rank, so each suit's
+ranks are one 13-bit field:
+
+    m = mask(hand + board)
+    spades = (m >> 0) & RANK_BITS, hearts = (m >> 13) & RANK_BITS, ...
+
+RANK, SUIT and BIT map treys card ints to their rank (0 = deuce .. 12 = ace),
+treys suit int (1, 2, 4, 8) and bit; CARD_INDEX maps them to their position
+0..51 in FULL_DECK (Deck.GetFullDeck() order), the index used by array-based
+modules, and combo_index() maps two of them to their 0..1325 combo row. Draw features are popcounts and lookups
+in 8192-entry tables indexed by a 13-bit rank mask, so bots can extract them
+with a few integer operations instead of rebuilding suit-count dicts and
+sorted rank lists on every call.
+"""
+from itertools import combinations
+
+from treys import Card, Deck
+
+RANK_BITS = (1 << 13) - 1
+SUITS = (1, 2, 4, 8)  # treys suit ints: spades, hearts, diamonds, clubs
+ACE_LOW_STRAIGHT = 0b1000000001111  # A-2-3-4-5
+
+FULL_DECK = Deck.GetFullDeck()
+CARD_INDEX = {card: i for i, card in enumerate(FULL_DECK)}
+
+# Two-card combos are numbered 0..1325 in combinations(range(52), 2) order of
+# their card indexes (engine.equity.COMBOS); looked up by both index orders
+_COMBO_INDEX = [0] * (52 * 52)
+for _k, (_i, _j) in enumerate(combinations(range(52), 2)):
+    _COMBO_INDEX[_i * 52 + _j] = _COMBO_INDEX[_j * 52 + _i] = _k
+
+RANK = {}
+SUIT = {}
+BIT = {}
+for _card in FULL_DECK:
+    RANK[_card] = Card.get_rank_int(_card)
+    SUIT[_card] = Card.get_suit_int(_card)
+    BIT[_card] = 1 << (SUITS.index(SUIT[_card]) * 13 + RANK[_card])
+
+# Rank masks of every five-in-a-row, wheel included
+STRAIGHTS = [0b11111 << low for low in range(9)] + [ACE_LOW_STRAIGHT]
+
+
+def _build_tables():
+    four_in_a_row = bytearray(1 << 13)
+    straight = bytearray(1 << 13)
+    completing = [0] * (1 << 13)
+    for ranks in range(1 << 13):
+        four_in_a_row[ranks] = any((ranks >> low) & 0xF == 0xF for low in range(10))
+        straight[ranks] = any(ranks & s == s for s in STRAIGHTS)
+        if not straight[ranks]:
+            # Ranks that would complete a straight
+            for r in range(13):
+                bit = 1 << r
+                if not ranks & bit and any((ranks | bit) & s == s for s in STRAIGHTS):
+                    completing[ranks] |= bit
+    return four_in_a_row, straight, completing
+
+
+FOUR_IN_A_ROW, STRAIGHT, STRAIGHT_COMPLETING = _build_tables()
+
+
+def combo_index(card1, card2):
+    """Combo index 0..1325 of two treys card ints, in either order."""
+    return _COMBO_INDEX[CARD_INDEX[card1] * 52 + CARD_INDEX[card2]]
+
+
+def mask(cards):
+    """Bitboard of treys card ints."""
+    m = 0
+    for card in cards:
+        m |= BIT[card]
+    return m
+
+
+def suit_masks(m):
+    """13-bit rank mask of each suit (spades, hearts, diamonds, clubs)."""
+    return m & RANK_BITS, (m >> 13) & RANK_BITS, (m >> 26) & RANK_BITS, (m >> 39) & RANK_BITS
+
+
+def rank_mask(m):
+    """Ranks present in any suit."""
+    s, h, d, c = suit_masks(m)
+    return s | h | d | c
+
+
+def suit_counts(m):
+    return tuple(suit.bit_count() for suit in suit_masks(m))
+
+
+def max_suit_count(m):
+    return max(suit_counts(m))
+
+
+def paired_ranks(m):
+    """Ranks held at least twice."""
+    s, h, d, c = suit_masks(m)
+    return (s & h) | (s & d) | (s & c) | (h & d) | (h & c) | (d & c)
+
+
+def trips_ranks(m):
+    """Ranks held at least three times."""
+    s, h, d, c = suit_masks(m)
+    return (s & h & d) | (s & h & c) | (s & d & c) | (h & d & c)
+
+
+def has_pair(m):
+    return paired_ranks(m) != 0
+
+
+def flush_draw(m):
+    """Exactly four cards of one suit."""
+    return 4 in suit_counts(m)
+
+
+def four_in_a_row(m):
+    """Four consecutive ranks (ace high only), e.g. an open-ended draw or better."""
+    return bool(FOUR_IN_A_ROW[rank_mask(m)])
+
+
+def straight_draw(m):
+    """No straight yet but at least one rank would complete one."""
+    return STRAIGHT_COMPLETING[rank_mask(m)] != 0
+
+
+def flush_outs(m):
+    """Unseen cards of the suit with four cards, or 0."""
+    for suit in suit_masks(m):
+        if suit.bit_count() == 4:
+            return 13 - 4
+    return 0
+
+
+def straight_outs(m):
+    """Unseen cards of the ranks that would complete a straight."""
+    completing = STRAIGHT_COMPLETING[rank_mask(m)]
+    return 4 * completing.bit_count() - sum((suit & completing).bit_count() for suit in suit_masks(m))
+
+
+def outs(hand, board):
+    """Flush plus straight outs, counting cards that do both once."""
+    m = mask(hand) | mask(board)
+    completing = STRAIGHT_COMPLETING[rank_mask(m)]
+    total = 0
+    for suit in suit_masks(m):
+        unseen = RANK_BITS & ~suit
+        if suit.bit_count() == 4:
+            total += unseen.bit_count()
+        else:
+            total += (unseen & completing).bit_count()
+    return total
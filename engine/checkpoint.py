@@ -0,0 +1,82 @@
+"""
+Crash-safe checkpoints for long tournament runs.
+
+A checkpoint is a pickled dict written atomically: the data goes to a
+temporary file next to the target, is flushed to disk and then renamed over
+the previous checkpoint, so a crash at any point leaves either the old or the
+new checkpoint intact, never a torn one.
+
+Checkpointer decides when the next checkpoint is due. It waits at least
+interval seconds between writes, and longer when writes are slow: after a
+write that took t seconds the next one waits t / max_overhead seconds, which
+keeps time spent checkpointing under max_overhead of the run.
+
+    checkpointer = Checkpointer("run.ckpt", interval=60, max_overhead=0.01)
+    state = checkpointer.load()          # None when starting fresh
+    ...
+    if checkpointer.due():
+        checkpointer.write(state)
+"""
+import os
+import pickle
+import time
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path, state):
+    """Atomically replace path with a pickle of state."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version": CHECKPOINT_VERSION, "state": state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """State saved at path, or None if there is no checkpoint."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is a version {payload.get('version')} checkpoint, "
+                         f"expected version {CHECKPOINT_VERSION}")
+    return payload["state"]
+
+
+class Checkpointer:
+    def __init__(self, path, interval=60.0, max_overhead=0.01):
+        """
+        Args:
+            path: Checkpoint file
+            interval: Minimum seconds between checkpoints
+            max_overhead: Largest fraction of run time spent writing checkpoints
+        """
+        if not 0 < max_overhead < 1:
+            raise ValueError("max_overhead must be between 0 and 1")
+        self.path = path
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.writes = 0
+        self.write_time = 0.0
+        self._last_cost = 0.0
+        self._last_write = time.perf_counter()
+
+    def load(self):
+        return load_checkpoint(self.path)
+
+    def due(self):
+        """True once enough time has passed since the last write."""
+        wait = max(self.interval, self._last_cost / self.max_overhead)
+        return time.perf_counter() - self._last_write >= wait
+
+    def write(self, state):
+        start = time.perf_counter()
+        save_checkpoint(self.path, state)
+        end = time.perf_counter()
+        self._last_cost = end - start
+        self._last_write = end
+        self.writes += 1
+        self.write_time += self._last_cost
@@ -0,0 +1,237 @@
+"""
+Game-state corpus and offline bot micro-benchmark.
+
+generate_corpus() plays seeded games between a roster of bots and samples
+decision points from them: each time a seated brain is asked for an action,
+its game_state (shaped like helpers/exmaple_game_state) is kept with
+probability sample_rate. Table sizes are drawn from table_sizes, so the
+corpus mixes full-ring, short-handed and heads-up spots in the proportions
+they occur in play.
+
+A corpus is saved as one compressed .npz bundle: the game states as JSONL
+bytes with per-state offsets, plus small index arrays (street, table size,
+active players) for filtering.
+
+benchmark() feeds a corpus to any Brain, outside any game, and times every
+get_action() call. Each call gets a freshly decoded game_state (decoding is
+not timed) and the random module is reseeded per state, so runs are
+repeatable. Brains see the states out of context: reset_for_game() is called
+once and no table events are sent.
+
+    corpus = generate_corpus([("First", FirstBot), ("Claude", ClaudeBot)], 20000)
+    corpus.save("corpus.npz")
+    benchmark(GeminiBot(), Corpus.load("corpus.npz")).print_report()
+
+    python -m engine.corpus generate corpus.npz --states 20000
+    python -m engine.corpus bench corpus.npz bots.geminiBot:GeminiBot
+"""
+import json
+import random
+import time
+
+import numpy as np
+
+from engine.game import PokerGame
+from engine.hand_history import STREETS
+from engine.memo import DECISIONS
+from engine.player import Player
+
+_STREET_CODES = {name: i for i, name in enumerate(STREETS)}
+
+
+class Corpus:
+    def __init__(self, lines):
+        """
+        Args:
+            lines: JSON-encoded game states (bytes), one per decision point
+        """
+        self.lines = list(lines)
+        states = [json.loads(line) for line in self.lines]
+        self.streets = np.array([_STREET_CODES[s["street"]] for s in states], dtype=np.uint8)
+        self.num_players = np.array([s["num_players"] for s in states], dtype=np.uint8)
+        self.num_active = np.array([s["num_active_players"] for s in states], dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def state(self, i):
+        """A fresh copy of the i-th game_state."""
+        return json.loads(self.lines[i])
+
+    def subset(self, mask):
+        """Corpus of the states selected by a boolean mask or index array."""
+        return Corpus([self.lines[i] for i in np.arange(len(self))[mask]])
+
+    def save(self, path):
+        data = b"".join(self.lines)
+        offsets = np.cumsum([0] + [len(line) for line in self.lines], dtype=np.int64)
+        np.savez_compressed(path, states=np.frombuffer(data, dtype=np.uint8), offsets=offsets,
+                            streets=self.streets, num_players=self.num_players, num_active=self.num_active)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as bundle:
+            data = bundle["states"].tobytes()
+            offsets = bundle["offsets"]
+        return cls([data[start:end] for start, end in zip(offsets[:-1], offsets[1:])])
+
+    def summary(self):
+        counts = np.bincount(self.streets, minlength=len(STREETS))
+        return {street: int(count) for street, count in zip(STREETS, counts)}
+
+
+class _Sampler:
+    """PokerGame decision hook that keeps a sample of the game states it passes through."""
+
+    def __init__(self, rate, rng, decisions=DECISIONS):
+        self.rate = rate
+        self.rng = rng
+        self.decisions = decisions
+        self.lines = []
+
+    def decide(self, brain, game_state):
+        # Encode before the brain sees the state, in case it changes it
+        if self.rng.random() < self.rate:
+            self.lines.append(json.dumps(game_state, separators=(",", ":")).encode() + b"\n")
+        if self.decisions is not None:
+            return self.decisions.decide(brain, game_state)
+        return brain.get_action(game_state)
+
+
+def generate_corpus(roster, num_states, seed=0, sample_rate=0.2, table_sizes=(2, 3, 4, 5, 6),
+                    starting_stack=2500, verbose=True):
+    """
+    Sample decision points from simulated games.
+
+    Args:
+        roster: List of (name, brain_class); tables are drawn from it with replacement
+        num_states: Game states to collect
+        seed: Seed for table draws, deals, sampling and the random module
+        sample_rate: Probability of keeping each decision point
+        table_sizes: Table sizes to draw from
+        starting_stack: Starting chips for each player
+        verbose: Print progress
+
+    Returns:
+        Corpus
+    """
+    rng = random.Random(seed)
+    sampler = _Sampler(sample_rate, random.Random(rng.getrandbits(63)))
+    games = 0
+    while len(sampler.lines) < num_states:
+        size = rng.choice(table_sizes)
+        seats = [rng.choice(roster) for _ in range(size)]
+        players = [Player(f"{name}#{i}", brain(), starting_stack) for i, (name, brain) in enumerate(seats)]
+        game_seed = rng.getrandbits(63)
+        random.seed(game_seed)
+        PokerGame(players, starting_stack=starting_stack, verbose=False, seed=game_seed,
+                  decisions=sampler).play_game()
+        games += 1
+        if verbose and games % 10 == 0:
+            print(f"{games} games, {len(sampler.lines):,}/{num_states:,} states")
+    return Corpus(sampler.lines[:num_states])
+
+
+class BenchmarkResult:
+    def __init__(self, name, streets, latencies):
+        self.name = name
+        self.streets = streets
+        self.latencies = latencies  # seconds per get_action(), aligned with streets
+
+    @property
+    def decisions_per_second(self):
+        total = self.latencies.sum()
+        return len(self.latencies) / total if total else 0.0
+
+    def percentiles(self, street=None, q=(50, 95, 99)):
+        latencies = self.latencies if street is None else self.latencies[self.streets == _STREET_CODES[street]]
+        return np.percentile(latencies, q) if len(latencies) else np.zeros(len(q))
+
+    def print_report(self):
+        print(f"\n{'='*60}")
+        print(f"BENCHMARK: {self.name}, {len(self.latencies):,} decisions, "
+              f"{self.decisions_per_second:,.0f} decisions/sec")
+        print(f"{'='*60}")
+        print(f"{'Street':<10} {'Count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+        print("-" * 60)
+        for street in list(STREETS) + [None]:
+            latencies = self.latencies if street is None else self.latencies[self.streets == _STREET_CODES[street]]
+            if not len(latencies):
+                continue
+            p50, p95, p99 = self.percentiles(street) * 1e3
+            print(f"{street or 'all':<10} {len(latencies):>8,} {p50:>9.3f} {p95:>9.3f} {p99:>9.3f} "
+                  f"{latencies.mean() * 1e3:>9.3f}")
+        print(f"{'='*60}\n")
+
+
+def benchmark(brain, corpus, repeat=1, warmup=100, seed=0):
+    """
+    Time brain.get_action() on every state of a corpus.
+
+    Args:
+        brain: Brain instance
+        corpus: Corpus
+        repeat: Passes over the corpus (latencies of every pass are kept)
+        warmup: Untimed calls before the first pass (caches, lazy tables)
+        seed: Base seed for the random module (state i uses seed + i)
+
+    Returns:
+        BenchmarkResult
+    """
+    brain.reset_for_game()
+    for i in range(min(warmup, len(corpus))):
+        random.seed(seed + i)
+        brain.get_action(corpus.state(i))
+
+    latencies = np.empty(len(corpus) * repeat)
+    clock = time.perf_counter
+    k = 0
+    for _ in range(repeat):
+        for i in range(len(corpus)):
+            game_state = corpus.state(i)
+            random.seed(seed + i)
+            start = clock()
+            brain.get_action(game_state)
+            latencies[k] = clock() - start
+            k += 1
+    return BenchmarkResult(type(brain).__name__, np.tile(corpus.streets, repeat), latencies)
+
+
+if __name__ == "__main__":
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description="Game-state corpus and bot micro-benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="Sample a corpus from simulated games")
+    generate.add_argument("path")
+    generate.add_argument("--states", type=int, default=20000)
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--sample-rate", type=float, default=0.2)
+    bench = commands.add_parser("bench", help="Benchmark brains on a corpus")
+    bench.add_argument("path")
+    bench.add_argument("brains", nargs="+", help="Brain classes as module:Class, e.g. bots.geminiBot:GeminiBot")
+    bench.add_argument("--repeat", type=int, default=1)
+    bench.add_argument("--street", choices=STREETS, help="Only states from this street")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        from bots.randomBot import RandomBot
+        from bots.firstBot import FirstBot
+        from bots.claudeBot import ClaudeBot
+        from bots.deepSeekBot import DeepSeekBot
+        from bots.chatGptBot import BestBot
+
+        roster = [("Random", RandomBot), ("First", FirstBot), ("Claude", ClaudeBot),
+                  ("DeepSeek", DeepSeekBot), ("ChatGPT", BestBot)]
+        corpus = generate_corpus(roster, args.states, seed=args.seed, sample_rate=args.sample_rate)
+        corpus.save(args.path)
+        print(f"Saved {len(corpus):,} states to {args.path}: {corpus.summary()}")
+    else:
+        corpus = Corpus.load(args.path)
+        if args.street:
+            corpus = corpus.subset(corpus.streets == _STREET_CODES[args.street])
+        for spec in args.brains:
+            module, name = spec.split(":")
+            brain = getattr(importlib.import_module(module), name)()
+            benchmark(brain, corpus, repeat=args.repeat).print_report()
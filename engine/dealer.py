@@ -1,8 +1,15 @@
 from treys import Deck
 
 class Dealer:
-    def __init__(self):
-        self.deck = Deck()
+    def __init__(self, rng=None):
+        if rng is None:
+            self.deck = Deck()
+        else:
+            # Reproducible deals: the deck shuffles with the caller's random.Random
+            # (skipping Deck's own seeding and shuffle, which would be thrown away)
+            self.deck = Deck.__new__(Deck)
+            self.deck._random = rng
+            self.deck.shuffle()
     
     def deal_hole_cards(self, players):
         for player in players:
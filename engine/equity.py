@@ -0,0 +1,218 @@
+"""
+Equity of a hand against weighted opponent ranges.
+
+A range is a float array with one weight per hole-card combo (COMBOS, 1326
+rows in combo_index order). Combos that share a card with our hand, the board
+or the runout are removed before weighting. Heads-up spots with few runouts
+(the river, the turn) are solved exactly by enumerating runouts; everything
+else is estimated by vectorized sampling. Ranks of all 1326 combos on a
+complete board are cached, so repeated questions on the same board only
+evaluate our own hand.
+
+    from engine.equity import hand_range, range_equity
+    villain = hand_range("TT+, AQs+, AKo")
+    equity = range_equity(hand, board, [villain])
+"""
+from collections import OrderedDict
+from itertools import combinations
+
+import numpy as np
+
+from engine.cards import CARD_INDEX, combo_index
+from engine.vector_eval import FULL_DECK, WORST_RANK, evaluate
+
+RANKS = "23456789TJQKA"
+
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.intp)  # (1326, 2) card indices
+COMBO_CARDS = FULL_DECK[COMBOS]                                      # (1326, 2) treys ints
+COMBO_MASKS = (np.int64(1) << COMBOS[:, 0]) | (np.int64(1) << COMBOS[:, 1])
+NUM_COMBOS = len(COMBOS)
+
+_BOARD_CACHE_SIZE = 256
+_board_cache = OrderedDict()
+
+
+def cards_mask(cards):
+    """64-bit mask with one bit per card index."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << CARD_INDEX[card]
+    return np.int64(mask)
+
+
+def uniform_range():
+    return np.ones(NUM_COMBOS)
+
+
+def _class_combos(name):
+    """Combo indices for a hand class like 'AA', 'AKs', 'AKo' or 'AK'."""
+    high, low = RANKS.index(name[0]), RANKS.index(name[1])
+    suited = name[2:3]
+    ranks = COMBOS // 4
+    suits = COMBOS % 4
+    match = ((ranks[:, 0] == high) & (ranks[:, 1] == low)) | ((ranks[:, 0] == low) & (ranks[:, 1] == high))
+    if suited == "s":
+        match &= suits[:, 0] == suits[:, 1]
+    elif suited == "o":
+        match &= suits[:, 0] != suits[:, 1]
+    return np.nonzero(match)[0]
+
+
+def hand_range(spec, weight=1.0):
+    """
+    Build a range from a comma separated list of hand classes.
+
+    Supports pairs ('TT'), suited/offsuit/any ('AKs', 'AKo', 'AK'), plus
+    ranges ('77+', 'ATs+') and per-class weights ('KQo:0.5').
+    """
+    weights = np.zeros(NUM_COMBOS)
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        item_weight = weight
+        if ":" in item:
+            item, value = item.split(":")
+            item_weight = float(value)
+        plus = item.endswith("+")
+        item = item.rstrip("+").upper()
+        high, low, suffix = item[0], item[1], item[2:].lower()
+        if plus and high == low:
+            classes = [r + r for r in RANKS[RANKS.index(high):]]
+        elif plus:
+            classes = [high + r + suffix for r in RANKS[RANKS.index(low):RANKS.index(high)]]
+        else:
+            classes = [high + low + suffix]
+        for name in classes:
+            weights[_class_combos(name)] = item_weight
+    return weights
+
+
+def remove_blocked(weights, dead_cards):
+    """Copy of a range with every combo that uses a dead card zeroed."""
+    dead = cards_mask(dead_cards)
+    return np.where(COMBO_MASKS & dead, 0.0, weights)
+
+
+def board_ranks(board):
+    """
+    treys ranks of all 1326 combos on a complete 5-card board (cached).
+    Combos that use a board card get WORST_RANK + 1.
+    """
+    key = tuple(sorted(board))
+    ranks = _board_cache.get(key)
+    if ranks is not None:
+        _board_cache.move_to_end(key)
+        return ranks
+    blocked = (COMBO_MASKS & cards_mask(board)) != 0
+    cards = np.concatenate([COMBO_CARDS, np.tile(np.array(board, dtype=np.int64), (NUM_COMBOS, 1))], axis=1)
+    ranks = np.where(blocked, WORST_RANK + 1, evaluate(cards)).astype(np.int16)
+    _board_cache[key] = ranks
+    if len(_board_cache) > _BOARD_CACHE_SIZE:
+        _board_cache.popitem(last=False)
+    return ranks
+
+
+def range_equity(hand, board, ranges, num_sims=500, exact_limit=60, rng=None):
+    """
+    Equity (wins plus split shares) of a hand against opponent ranges.
+
+    Args:
+        hand: Our two treys card ints
+        board: 0, 3, 4 or 5 community cards
+        ranges: One 1326-entry weight array per opponent
+        num_sims: Samples for the Monte Carlo estimate
+        exact_limit: Enumerate heads-up runouts exactly when there are at most this many
+        rng: numpy Generator (default: a fresh unseeded one)
+
+    Returns:
+        Equity between 0 and 1
+    """
+    if not ranges:
+        return 1.0
+    hand = list(hand)
+    board = list(board)
+    dead = hand + board
+    weights = [remove_blocked(np.asarray(r, dtype=float), dead) for r in ranges]
+    if any(w.sum() <= 0 for w in weights):
+        raise ValueError("An opponent range has no combos left after card removal")
+
+    remaining = [int(c) for c in FULL_DECK if c not in dead]
+    to_come = 5 - len(board)
+    if len(ranges) == 1:
+        runouts = list(combinations(remaining, to_come))
+        if len(runouts) <= exact_limit:
+            return _exact_heads_up(hand, board, weights[0], runouts)
+    return _sampled(hand, board, weights, remaining, to_come, num_sims, rng or np.random.default_rng())
+
+
+def _exact_heads_up(hand, board, weights, runouts):
+    hero_combo = combo_index(*hand)
+    won = 0.0
+    total = 0.0
+    for runout in runouts:
+        ranks = board_ranks(board + list(runout))
+        hero = ranks[hero_combo]
+        # weights already exclude our cards and the board; drop combos using runout cards
+        w = np.where(COMBO_MASKS & cards_mask(runout), 0.0, weights)
+        won += w[ranks > hero].sum() + 0.5 * w[ranks == hero].sum()
+        total += w.sum()
+    return won / total
+
+
+def _sampled(hand, board, weights, remaining, to_come, num_sims, rng):
+    num_opponents = len(weights)
+    probs = [w / w.sum() for w in weights]
+    remaining = np.array(remaining, dtype=np.int64)
+    remaining_idx = np.array([CARD_INDEX[c] for c in remaining])
+    hero_board = np.array(hand + board, dtype=np.int64)
+
+    equities = []
+    collected = 0
+    while collected < num_sims:
+        n = int((num_sims - collected) * 1.3) + 16
+        combos = np.stack([rng.choice(NUM_COMBOS, size=n, p=p) for p in probs], axis=1)
+        masks = COMBO_MASKS[combos]
+        ok = np.ones(n, dtype=bool)
+        used = np.zeros(n, dtype=np.int64)
+        for k in range(num_opponents):
+            ok &= (used & masks[:, k]) == 0
+            used |= masks[:, k]
+        combos, used = combos[ok], used[ok]
+        n = len(combos)
+        if n == 0:
+            continue
+
+        # Runout from the cards nobody holds
+        keys = rng.random((n, len(remaining)))
+        keys[((used[:, None] >> remaining_idx[None, :]) & 1).astype(bool)] = 2.0
+        runout = remaining[np.argpartition(keys, to_come, axis=1)[:, :to_come]]
+        boards = np.concatenate([np.tile(hero_board[2:], (n, 1)), runout], axis=1)
+
+        hero = evaluate(np.concatenate([np.tile(hero_board[:2], (n, 1)), boards], axis=1))
+        opp_cards = COMBO_CARDS[combos].reshape(n * num_opponents, 2)
+        opp = evaluate(np.concatenate([opp_cards, np.repeat(boards, num_opponents, axis=0)], axis=1))
+        opp = opp.reshape(n, num_opponents)
+
+        best = opp.min(axis=1)
+        ties = (opp == hero[:, None]).sum(axis=1)
+        equities.append(np.where(hero < best, 1.0, np.where(hero == best, 1.0 / (ties + 1), 0.0)))
+        collected += n
+    return float(np.concatenate(equities)[:num_sims].mean())
+
+
+if __name__ == "__main__":
+    import time
+    from treys import Card
+
+    hand = [Card.new("Ah"), Card.new("Kd")]
+    board = [Card.new("2c"), Card.new("7h"), Card.new("Ts")]
+    tight = hand_range("TT+, AQs+, AKo")
+    for label, b, ranges in (("flop vs uniform", board, [uniform_range()]),
+                             ("flop vs TT+/AQ+", board, [tight]),
+                             ("flop vs 3 opponents", board, [tight, uniform_range(), uniform_range()]),
+                             ("turn vs TT+/AQ+ (exact)", board + [Card.new("3d")], [tight]),
+                             ("river vs TT+/AQ+ (exact)", board + [Card.new("3d"), Card.new("Jc")], [tight])):
+        start = time.perf_counter()
+        equity = range_equity(hand, b, ranges)
+        print(f"{label:<28} {equity:.3f}  {1000 * (time.perf_counter() - start):.1f} ms")
@@ -0,0 +1,499 @@
+"""
+Stdio protocol for bots that live outside this repo.
+
+An external bot is a long-lived process that reads decision requests on
+stdin and writes actions on stdout. The engine talks to it through
+ExternalBot, which is a normal Brain and can be seated like any other bot.
+
+Handshake (always text):
+    engine -> bot:  "PKR1 json\\n"  or  "PKR1 binary\\n"
+    bot -> engine:  "PKR1 ok\\n"
+
+JSON mode (one message per line):
+    engine -> bot:  {"decide": [[id, game_state], ...]}
+    bot -> engine:  {"actions": [[id, {"action": "raise", "amount": 60}], ...]}
+
+Binary mode (every message is a little-endian u32 length + payload):
+    payload header: u8 message type, u16 record count
+    NAMES   (1): per record u16 name id, u8 length, utf-8 bytes
+    DECIDE  (2): per record one encoded game state (see encode_state)
+    ACTIONS (3): per record u32 id, u8 action code, f64 amount
+
+Names are sent once per process in a NAMES message and referenced by id
+afterwards, so a decision record is fixed-width apart from its opponent
+list. Chip amounts are f64 because bots may raise fractional amounts
+(e.g. 2.5x the big blind). Several pending decisions, possibly from
+different tables, can share one DECIDE message.
+"""
+from concurrent.futures import Future
+import json
+import struct
+import subprocess
+import sys
+import threading
+
+from engine.brain import Brain
+
+PROTOCOL_VERSION = b"PKR1"
+
+MSG_NAMES = 1
+MSG_DECIDE = 2
+MSG_ACTIONS = 3
+
+ACTIONS = ["fold", "check", "call", "bet", "raise"]
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+STREETS = ["pre-flop", "flop", "turn", "river"]
+STREET_CODES = {name: code for code, name in enumerate(STREETS)}
+NO_STREET = 255
+
+FLAG_BUTTON = 1
+FLAG_SMALL_BLIND = 2
+FLAG_BIG_BLIND = 4
+FLAG_ACTIVE = 8
+FLAG_ALL_IN = 16
+
+_FRAME = struct.Struct("<I")
+_HEADER = struct.Struct("<BH")
+_NAME = struct.Struct("<HB")
+# id, name id, street, flags, valid action mask, board size, position,
+# button, players, active players, opponent count, 7 cards,
+# stack, own bet, pot, current bet, to call, sb, bb, ante, min/max raise,
+# pot odds, hand number
+_STATE = struct.Struct("<IHBBBBBBBBB7I10ddI")
+_OPPONENT = struct.Struct("<HBBdd")
+_ACTION = struct.Struct("<IBd")
+
+
+class NameTable:
+    """Assigns stable small ids to player names for one connection."""
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def add(self, name):
+        """Return (id, is_new) for a name."""
+        name_id = self.ids.get(name)
+        if name_id is not None:
+            return name_id, False
+        name_id = len(self.names)
+        self.ids[name] = name_id
+        self.names.append(name)
+        return name_id, True
+
+
+def encode_frame(payload):
+    return _FRAME.pack(len(payload)) + payload
+
+
+def read_frame(stream):
+    """Read one length-prefixed payload, or None on EOF."""
+    head = stream.read(_FRAME.size)
+    if len(head) < _FRAME.size:
+        return None
+    (length,) = _FRAME.unpack(head)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return payload
+
+
+def encode_names(entries):
+    """Encode a NAMES payload from (id, name) pairs."""
+    parts = [_HEADER.pack(MSG_NAMES, len(entries))]
+    for name_id, name in entries:
+        raw = str(name).encode("utf-8")[:255]
+        parts.append(_NAME.pack(name_id, len(raw)))
+        parts.append(raw)
+    return b"".join(parts)
+
+
+def decode_names(payload, names):
+    """Apply a NAMES payload to a list indexed by name id."""
+    _, count = _HEADER.unpack_from(payload, 0)
+    offset = _HEADER.size
+    for _ in range(count):
+        name_id, length = _NAME.unpack_from(payload, offset)
+        offset += _NAME.size
+        name = payload[offset:offset + length].decode("utf-8")
+        offset += length
+        while len(names) <= name_id:
+            names.append(None)
+        names[name_id] = name
+
+
+def encode_state(request_id, game_state, name_table, new_names):
+    """
+    Encode one game state as a binary DECIDE record.
+
+    Args:
+        request_id: Id echoed back in the matching ACTIONS record
+        game_state: Dictionary built by PokerGame.build_game_state
+        name_table: NameTable for this connection
+        new_names: List that receives (id, name) pairs not yet sent
+
+    Returns:
+        bytes for the record
+    """
+    player = game_state["player"]
+    opponents = game_state["opponents"]
+
+    name_id, is_new = name_table.add(player["name"])
+    if is_new:
+        new_names.append((name_id, player["name"]))
+
+    flags = 0
+    if player["is_button"]:
+        flags |= FLAG_BUTTON
+    if player["is_small_blind"]:
+        flags |= FLAG_SMALL_BLIND
+    if player["is_big_blind"]:
+        flags |= FLAG_BIG_BLIND
+
+    valid_mask = 0
+    for action in game_state["valid_actions"]:
+        valid_mask |= 1 << ACTION_CODES[action]
+
+    cards = list(player["hand"]) + list(game_state["community_cards"])
+    cards += [0] * (7 - len(cards))
+    hand_size = len(player["hand"])
+
+    street = game_state["street"]
+    parts = [_STATE.pack(
+        request_id, name_id,
+        STREET_CODES.get(street, NO_STREET), flags | (hand_size << 5), valid_mask,
+        game_state["num_community_cards"], player["position"],
+        game_state["button_position"], game_state["num_players"],
+        game_state["num_active_players"], len(opponents),
+        *cards,
+        player["stack"], player["current_bet"], game_state["pot"],
+        game_state["current_bet"], game_state["amount_to_call"],
+        game_state["small_blind"], game_state["big_blind"], game_state["ante"],
+        game_state["min_raise"], game_state["max_raise"],
+        game_state["pot_odds"], game_state["hand_number"],
+    )]
+
+    for opp in opponents:
+        opp_id, is_new = name_table.add(opp["name"])
+        if is_new:
+            new_names.append((opp_id, opp["name"]))
+        opp_flags = 0
+        if opp["is_active"]:
+            opp_flags |= FLAG_ACTIVE
+        if opp["is_all_in"]:
+            opp_flags |= FLAG_ALL_IN
+        parts.append(_OPPONENT.pack(opp_id, opp_flags, opp["position"],
+                                    opp["stack"], opp["current_bet"]))
+    return b"".join(parts)
+
+
+def _chips(value):
+    """Return whole-chip amounts as ints so decoded states match the engine's."""
+    return int(value) if value == int(value) else value
+
+
+def decode_state(payload, offset, names):
+    """
+    Decode one DECIDE record back into the game_state schema.
+
+    Returns:
+        (request_id, game_state, next_offset)
+    """
+    fields = _STATE.unpack_from(payload, offset)
+    offset += _STATE.size
+    (request_id, name_id, street, flags, valid_mask, num_board, position,
+     button, num_players, num_active, num_opponents) = fields[:11]
+    cards = fields[11:18]
+    (stack, own_bet, pot, current_bet, amount_to_call, small_blind,
+     big_blind, ante, min_raise, max_raise) = (_chips(v) for v in fields[18:28])
+    pot_odds, hand_number = fields[28], fields[29]
+
+    opponents = []
+    for _ in range(num_opponents):
+        opp_id, opp_flags, opp_position, opp_stack, opp_bet = _OPPONENT.unpack_from(payload, offset)
+        offset += _OPPONENT.size
+        opponents.append({
+            "name": names[opp_id],
+            "stack": _chips(opp_stack),
+            "current_bet": _chips(opp_bet),
+            "is_active": bool(opp_flags & FLAG_ACTIVE),
+            "position": opp_position,
+            "is_all_in": bool(opp_flags & FLAG_ALL_IN),
+        })
+
+    hand_size = flags >> 5
+    game_state = {
+        "player": {
+            "name": names[name_id],
+            "hand": list(cards[:hand_size]),
+            "stack": stack,
+            "current_bet": own_bet,
+            "position": position,
+            "is_button": bool(flags & FLAG_BUTTON),
+            "is_small_blind": bool(flags & FLAG_SMALL_BLIND),
+            "is_big_blind": bool(flags & FLAG_BIG_BLIND),
+        },
+        "community_cards": list(cards[hand_size:hand_size + num_board]),
+        "num_community_cards": num_board,
+        "pot": pot,
+        "current_bet": current_bet,
+        "amount_to_call": amount_to_call,
+        "pot_odds": pot_odds,
+        "street": STREETS[street] if street != NO_STREET else None,
+        "small_blind": small_blind,
+        "big_blind": big_blind,
+        "ante": ante,
+        "hand_number": hand_number,
+        "button_position": button,
+        "num_players": num_players,
+        "num_active_players": num_active,
+        "opponents": opponents,
+        "valid_actions": [a for code, a in enumerate(ACTIONS) if valid_mask & (1 << code)],
+        "min_raise": min_raise,
+        "max_raise": max_raise,
+    }
+    return request_id, game_state, offset
+
+
+def encode_actions(results):
+    """Encode an ACTIONS payload from (id, action_dict) pairs."""
+    parts = [_HEADER.pack(MSG_ACTIONS, len(results))]
+    for request_id, action in results:
+        code = ACTION_CODES.get(str(action.get("action", "fold")).lower(), ACTION_CODES["fold"])
+        parts.append(_ACTION.pack(request_id, code, action.get("amount", 0) or 0))
+    return b"".join(parts)
+
+
+def decode_actions(payload):
+    """Decode an ACTIONS payload into a dict of id -> action_dict."""
+    msg_type, count = _HEADER.unpack_from(payload, 0)
+    if msg_type != MSG_ACTIONS:
+        raise RuntimeError(f"Expected ACTIONS message, got type {msg_type}")
+    actions = {}
+    for request_id, code, amount in _ACTION.iter_unpack(payload[_HEADER.size:_HEADER.size + count * _ACTION.size]):
+        action = {"action": ACTIONS[code]}
+        if code >= ACTION_CODES["bet"]:
+            action["amount"] = _chips(amount)
+        actions[request_id] = action
+    return actions
+
+
+class ExternalBotProcess:
+    """
+    A long-lived external bot process.
+
+    One process can serve several seats and several tables at once. Calls to
+    decide() from different threads are coalesced: whichever thread gets the
+    pipe sends every decision queued so far in a single message.
+    """
+
+    def __init__(self, command, mode="binary", cwd=None, env=None):
+        """
+        Args:
+            command: argv list used to start the bot process
+            mode: "binary" or "json"
+            cwd: Working directory for the process
+            env: Environment for the process
+        """
+        if mode not in ("binary", "json"):
+            raise ValueError(f"Unknown protocol mode '{mode}'")
+        self.command = command
+        self.mode = mode
+        self.cwd = cwd
+        self.env = env
+        self.process = None
+        self.names = NameTable()
+        self.next_id = 0
+        self.pending = []
+        self.queue_lock = threading.Lock()
+        self.io_lock = threading.Lock()
+        self.messages_sent = 0
+        self.decisions_sent = 0
+
+    def start(self):
+        """Start the process and perform the handshake."""
+        if self.process is not None:
+            return
+        # A new process knows no names yet; restart name and request ids with it
+        self.names = NameTable()
+        self.next_id = 0
+        self.process = subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            cwd=self.cwd, env=self.env, bufsize=0,
+        )
+        self.process.stdin.write(PROTOCOL_VERSION + b" " + self.mode.encode() + b"\n")
+        self.process.stdin.flush()
+        reply = self.process.stdout.readline().strip()
+        if reply != PROTOCOL_VERSION + b" ok":
+            self.close()
+            raise RuntimeError(f"External bot rejected handshake: {reply!r}")
+
+    def close(self):
+        """Stop the process."""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+        self.process = None
+
+    def decide(self, game_state):
+        """Return the action dict for one game state."""
+        future = Future()
+        with self.queue_lock:
+            self.pending.append((game_state, future))
+        with self.io_lock:
+            if not future.done():
+                with self.queue_lock:
+                    batch, self.pending = self.pending, []
+                try:
+                    actions = self.decide_batch([state for state, _ in batch])
+                except BaseException as e:
+                    # Every thread waiting on this batch raises the same error
+                    for _, waiting in batch:
+                        waiting.set_exception(e)
+                else:
+                    for (_, waiting), action in zip(batch, actions):
+                        waiting.set_result(action)
+        return future.result()
+
+    def decide_batch(self, game_states):
+        """
+        Send several game states in one message.
+
+        Returns:
+            List of action dicts in the same order as game_states
+        """
+        if not game_states:
+            return []
+        self.start()
+        ids = list(range(self.next_id, self.next_id + len(game_states)))
+        self.next_id = (self.next_id + len(game_states)) & 0xFFFFFFFF
+
+        if self.mode == "json":
+            actions = self._roundtrip_json(ids, game_states)
+        else:
+            actions = self._roundtrip_binary(ids, game_states)
+
+        self.messages_sent += 1
+        self.decisions_sent += len(game_states)
+        try:
+            return [actions[i] for i in ids]
+        except KeyError as missing:
+            raise RuntimeError(f"External bot did not answer request {missing}")
+
+    def _roundtrip_json(self, ids, game_states):
+        message = json.dumps({"decide": [[i, s] for i, s in zip(ids, game_states)]},
+                             separators=(",", ":"))
+        self.process.stdin.write(message.encode() + b"\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError("External bot exited")
+        return {i: action for i, action in json.loads(line)["actions"]}
+
+    def _roundtrip_binary(self, ids, game_states):
+        new_names = []
+        records = [encode_state(i, s, self.names, new_names) for i, s in zip(ids, game_states)]
+        out = b""
+        if new_names:
+            out += encode_frame(encode_names(new_names))
+        out += encode_frame(_HEADER.pack(MSG_DECIDE, len(records)) + b"".join(records))
+        self.process.stdin.write(out)
+        self.process.stdin.flush()
+        payload = read_frame(self.process.stdout)
+        if payload is None:
+            raise RuntimeError("External bot exited")
+        return decode_actions(payload)
+
+
+class ExternalBot(Brain):
+    """
+    Brain adapter for an external bot process.
+
+    Pass a shared ExternalBotProcess to seat several players on one process;
+    pass a command to give this seat its own process.
+    """
+
+    # The bot's own randomness is out of reach of the tournament's seed
+    reproducible = False
+
+    def __init__(self, process=None, command=None, mode="binary"):
+        super().__init__()
+        if process is None:
+            if command is None:
+                raise ValueError("ExternalBot needs a process or a command")
+            process = ExternalBotProcess(command, mode=mode)
+        self.process = process
+
+    def get_action(self, game_state):
+        return self.process.decide(game_state)
+
+
+def serve_stdio(brain, stdin=None, stdout=None):
+    """
+    Run a Brain as an external bot speaking this protocol.
+
+    Reads the handshake, then answers decision messages until stdin closes.
+    Intended for the bot side, e.g. ``serve_stdio(MyBot())`` in a script.
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+
+    hello = stdin.readline().split()
+    if len(hello) != 2 or hello[0] != PROTOCOL_VERSION or hello[1] not in (b"json", b"binary"):
+        stdout.write(PROTOCOL_VERSION + b" error\n")
+        stdout.flush()
+        return
+    stdout.write(PROTOCOL_VERSION + b" ok\n")
+    stdout.flush()
+
+    if hello[1] == b"json":
+        for line in stdin:
+            requests = json.loads(line)["decide"]
+            results = [[i, brain.get_action(state)] for i, state in requests]
+            stdout.write(json.dumps({"actions": results}, separators=(",", ":")).encode() + b"\n")
+            stdout.flush()
+        return
+
+    names = []
+    while True:
+        payload = read_frame(stdin)
+        if payload is None:
+            return
+        msg_type, count = _HEADER.unpack_from(payload, 0)
+        if msg_type == MSG_NAMES:
+            decode_names(payload, names)
+            continue
+        offset = _HEADER.size
+        results = []
+        for _ in range(count):
+            request_id, game_state, offset = decode_state(payload, offset, names)
+            results.append((request_id, brain.get_action(game_state)))
+        stdout.write(encode_frame(encode_actions(results)))
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    # Round-trip benchmark against the example bot in helpers/
+    import os
+    import time
+
+    example = os.path.join(os.path.dirname(__file__), "..", "helpers", "external_bot.py")
+    with open(os.path.join(os.path.dirname(__file__), "..", "helpers", "exmaple_game_state")) as f:
+        state = json.load(f)
+
+    for mode in ("json", "binary"):
+        for batch_size in (1, 16):
+            process = ExternalBotProcess([sys.executable, example, "randomBot.RandomBot"], mode=mode)
+            process.decide_batch([state])
+            rounds = 2000 // batch_size
+            start = time.perf_counter()
+            for _ in range(rounds):
+                process.decide_batch([state] * batch_size)
+            elapsed = time.perf_counter() - start
+            process.close()
+            per_decision = elapsed / (rounds * batch_size) * 1e6
+            print(f"{mode:<7} batch={batch_size:<3} {per_decision:8.1f} us/decision")
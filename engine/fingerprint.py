@@ -0,0 +1,59 @@
+"""
+Source fingerprints used to decide whether cached results are still valid.
+
+A brain's fingerprint covers the source file that defines its class, so any
+edit to a bot invalidates results that involve it. Bots lean on shared engine
+code and data (cards.py, preflop.py, range_tracker.py, pushfold_charts.npz,
+memo.py, ...), so rather than tracking which engine files a game touches the
+engine fingerprint covers every module and data file in engine/. Editing any
+of them invalidates every cached result, which is safe if occasionally
+wasteful.
+"""
+import hashlib
+import inspect
+import os
+
+ENGINE_SUFFIXES = (".py", ".npz", ".npy")
+
+_file_hashes = {}
+
+
+def _hash_file(path):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _file_hashes.get(path)
+    if cached and cached[0] == stat.st_mtime_ns:
+        return cached[1]
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _file_hashes[path] = (stat.st_mtime_ns, digest)
+    return digest
+
+
+def brain_fingerprint(brain):
+    """Hash of the source file defining a brain class (or instance's class)."""
+    brain_class = brain if isinstance(brain, type) else type(brain)
+    try:
+        path = inspect.getsourcefile(brain_class)
+    except TypeError:
+        path = None
+    if path is None:
+        # Classes defined interactively have no file; fall back to the name
+        return hashlib.sha256(brain_class.__qualname__.encode()).hexdigest()
+    return _hash_file(path)
+
+
+def type_name(brain):
+    """Dotted module path of a brain class (or instance's class)."""
+    brain_class = brain if isinstance(brain, type) else type(brain)
+    return f"{brain_class.__module__}.{brain_class.__qualname__}"
+
+
+def engine_fingerprint():
+    """Hash of every engine module and data file (names and contents)."""
+    engine_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(engine_dir)):
+        if name.endswith(ENGINE_SUFFIXES):
+            digest.update(f"{name}:{_hash_file(os.path.join(engine_dir, name))}\n".encode())
+    return digest.hexdigest()
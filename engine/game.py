@@ -3,11 +3,46 @@ from engine.dealer import Dealer
 from engine.player import Player
 from treys import Card, Evaluator
 from engine.brain import Brain
+from engine.memo import DECISIONS
+import random
+
+STREET_NAMES = {"pre-flop": "Pre-flop", "flop": "Flop", "turn": "Turn", "river": "River"}
+NEXT_STREET = {"pre-flop": "flop", "flop": "turn", "turn": "river"}
+
+# Evaluators only hold lookup tables, so every game shares one
+EVALUATOR = Evaluator()
+
+
+def effective_action(is_active, put_in, table_bet, current_bet):
+    """
+    What process_action actually did ("fold", "check", "call", "bet" or
+    "raise"), from the player's state and the chips they put in; table_bet is
+    the bet before the action and current_bet the bet after it.
+    """
+    if not is_active:
+        return "fold"
+    if put_in == 0:
+        return "check"
+    if current_bet > table_bet:
+        return "bet" if table_bet == 0 else "raise"
+    return "call"
+
+
+def observes(brain):
+    """Whether a brain overrides Brain.observe and wants the table event feed."""
+    return getattr(type(brain), "observe", Brain.observe) is not Brain.observe
+
 
 class PokerGame:
-    def __init__(self, players, starting_stack=1000, verbose=True):
+    def __init__(self, players, starting_stack=1000, verbose=True, seed=None, decisions=DECISIONS,
+                 history=None):
         self.verbose = verbose
-        self.dealer = Dealer()
+        # DecisionCache for declared-pure brains (None calls every brain directly)
+        self.decisions = decisions
+        # Seeded games deal the same cards every run; unseeded games use fresh decks
+        self.seed = seed
+        self.rng = random.Random(seed) if seed is not None else None
+        self.dealer = Dealer(self.rng)
         self.players = []
         self.round = 0
         self.pot = 0
@@ -20,17 +55,85 @@ class PokerGame:
         self.button_position = 0
         self.hand_number = 0
         self.current_street = None
+        self.eliminated = []  # Players in the order they were knocked out
+        self.evaluator = EVALUATOR
+        self.hand_ranks = {}  # Player -> treys rank of their best hand on the current board
+        self.betting_cursor = None  # (start position, offset) of the seat deciding in the current round
         
         # Initialize players
         for player in players:
             self.players.append(player)
 
+        # Table event observers (see engine/opponent_stats.py for the events);
+        # brains that override Brain.observe get the feed automatically
+        self.observers = []
+        for player in players:
+            if observes(player.brain):
+                self.subscribe(player.brain)
+
+        # Optional HandHistoryWriter recording every hand (engine/hand_history.py)
+        self.history = None
+        if history is not None:
+            history.attach(self)
+
+    def subscribe(self, observer):
+        """Send every table event to observer.observe(event)."""
+        if observer not in self.observers:
+            self.observers.append(observer)
+
+    def unsubscribe(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def seat_player(self, index, player):
+        """Seat a player arriving mid-game (e.g. moved from another table) at index."""
+        self.players.insert(index, player)
+        if observes(player.brain):
+            self.subscribe(player.brain)
+
+    def unseat_player(self, index):
+        """Remove and return the player at index; their brain stops getting this table's events."""
+        player = self.players.pop(index)
+        self.unsubscribe(player.brain)
+        return player
+
+    def emit(self, event):
+        for observer in self.observers:
+            observer.observe(event)
+
+    def __getstate__(self):
+        # Pickled for mid-game checkpoints; the shared evaluator and decision
+        # cache are reattached on load instead of being copied, and a history
+        # writer (open files) has to be attached again by the caller
+        state = self.__dict__.copy()
+        state["evaluator"] = None
+        state["decisions"] = self.decisions is not None
+        if self.history is not None:
+            state["history"] = None
+            state["observers"] = [o for o in self.observers if o is not self.history]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.evaluator = EVALUATOR
+        self.decisions = DECISIONS if self.decisions else None
+
     
-    def play_game(self):
-        """Play hands until only one player has chips"""
-        self.hand_number = 0
+    def play_game(self, between_hands=None, resume=False):
+        """
+        Play hands until only one player has chips
+
+        Args:
+            between_hands: Optional callback(game) run before every hand, when
+                the table can be saved and later continued with resume=True
+            resume: Continue from the current hand number instead of starting over
+        """
+        if not resume:
+            self.hand_number = 0
         
         while self.get_active_player_count() > 1:
+            if between_hands is not None:
+                between_hands(self)
             self.hand_number += 1
             if self.verbose:
                 print(f"\n{'='*50}")
@@ -68,6 +171,7 @@ class PokerGame:
             if player.stack > 0:
                 remaining.append(player)
             else:
+                self.eliminated.append(player)
                 if self.verbose:
                     print(f"*** {player.name} has been eliminated! ***\n")
         
@@ -84,6 +188,11 @@ class PokerGame:
         if self.verbose:
             print(f"\n*** BLINDS INCREASED: {self.small_blind}/{self.big_blind} ***\n")
     
+    def finishing_order(self):
+        """Players from winner to first eliminated (call after play_game)."""
+        survivors = sorted(self.players, key=lambda p: p.stack, reverse=True)
+        return survivors + list(reversed(self.eliminated))
+    
     def announce_tournament_winner(self):
         """Announce the tournament winner"""
         print("\n" + "="*50)
@@ -104,14 +213,20 @@ class PokerGame:
     def play_hand(self):
         """Play a single hand of poker"""
         # Reset for new hand
-        self.dealer = Dealer()
+        self.dealer = Dealer(self.rng)
         self.community_cards = []
         self.pot = 0
         self.current_bet = 0
         self.current_street = None
+        self.hand_ranks = {}
+        self.betting_cursor = None
         
         # Reset all players for new hand
         for player in self.players:
+            # Brains that don't subclass Brain (and brainless seats) have no hook
+            reset_for_hand = getattr(player.brain, "reset_for_hand", None)
+            if reset_for_hand is not None:
+                reset_for_hand()
             player.is_active = True
             player.hand = []
             player.current_bet = 0
@@ -120,6 +235,15 @@ class PokerGame:
         # Post blinds
         if not self.post_blinds():
             return
+        if self.observers:
+            self.emit({
+                "type": "hand_start",
+                "hand_number": self.hand_number,
+                "button_position": self.button_position,
+                "players": [p.name for p in self.players],
+                "small_blind": self.small_blind,
+                "big_blind": self.big_blind,
+            })
         
         # Deal hole cards
         self.dealer.deal_hole_cards(self.players)
@@ -127,29 +251,69 @@ class PokerGame:
         
         # Pre-flop betting
         self.current_street = "pre-flop"
-        if self.betting_round("Pre-flop"):
-            # Deal flop
-            self.community_cards += self.dealer.deal_flop()
+        self.emit_street()
+        self.finish_hand()
+
+    def finish_hand(self, resume=False):
+        """
+        Betting rounds from the current street on, dealing the next street
+        after each one, then the showdown. With resume=True the current round
+        continues from self.betting_cursor (see engine/snapshot.py).
+        """
+        street = self.current_street
+        while self.betting_round(STREET_NAMES[street], resume):
+            resume = False
+            if street == "river":
+                break
+            if street == "pre-flop":
+                # Deal flop
+                self.community_cards += self.dealer.deal_flop()
+            else:
+                # Deal turn or river
+                self.community_cards.append(self.dealer.deal_turn_or_river())
+            self.evaluate_hands()
             self.print_game_state()
             
-            self.current_street = "flop"
-            if self.betting_round("Flop"):
-                # Deal turn
-                self.community_cards.append(self.dealer.deal_turn_or_river())
-                self.print_game_state()
-                
-                self.current_street = "turn"
-                if self.betting_round("Turn"):
-                    # Deal river
-                    self.community_cards.append(self.dealer.deal_turn_or_river())
-                    self.print_game_state()
-                    
-                    self.current_street = "river"
-                    self.betting_round("River")
+            street = NEXT_STREET[street]
+            self.current_street = street
+            self.emit_street()
         
         # Showdown and distribute pot
         self.showdown()
 
+    def emit_street(self):
+        if self.observers:
+            self.emit({
+                "type": "street",
+                "hand_number": self.hand_number,
+                "street": self.current_street,
+                "board": list(self.community_cards),
+                "pot": self.pot,
+            })
+
+    def emit_action(self, player, table_bet, bet_before, pot_before):
+        """Report what process_action actually did, whatever the brain asked for"""
+        put_in = self.pot - pot_before
+        self.emit({
+            "type": "action",
+            "hand_number": self.hand_number,
+            "street": self.current_street,
+            "player": player.name,
+            "action": effective_action(player.is_active, put_in, table_bet, self.current_bet),
+            "amount": put_in,
+            "to_call": table_bet - bet_before,
+            "current_bet": self.current_bet,
+            "pot": self.pot,
+            "all_in": player.stack == 0 and player.is_active,
+        })
+
+    def evaluate_hands(self):
+        """Rank every live hand once on the current board (called after each deal)"""
+        self.hand_ranks = {}
+        for player in self.players:
+            if player.is_active and player.hand:
+                self.hand_ranks[player] = self.evaluator.evaluate(self.community_cards, player.hand)
+
     def post_blinds(self):
         """Post small and big blinds"""
         if len(self.players) < 2:
@@ -182,7 +346,7 @@ class PokerGame:
 
     def showdown(self):
         """Determine winner(s) and distribute pot"""
-        evaluator = Evaluator()
+        evaluator = self.evaluator
         active_players = [p for p in self.players if p.is_active]
 
         if not active_players:
@@ -196,6 +360,9 @@ class PokerGame:
             winner.stack += self.pot
             if self.verbose:
                 print(f"\n{winner.name} wins {self.pot} chips (all others folded)!\n")
+            if self.observers:
+                self.emit({"type": "hand_end", "hand_number": self.hand_number,
+                           "winners": [winner.name], "pot": self.pot})
             return [winner]
 
         # Evaluate each active player's hand
@@ -203,9 +370,9 @@ class PokerGame:
         for player in active_players:
             if not player.hand:
                 continue
-            hole = player.hand
-            board = self.community_cards
-            score = evaluator.evaluate(board, hole)
+            score = self.hand_ranks.get(player)
+            if score is None:
+                score = evaluator.evaluate(self.community_cards, player.hand)
             scores[player] = score
 
         # Find the lowest score (best hand in Treys)
@@ -223,44 +390,71 @@ class PokerGame:
             print("="*40)
             print("SHOWDOWN RESULTS")
         for i, player in enumerate(winners):
-            hole_str = ' '.join([Card.int_to_pretty_str(c) for c in player.hand])
-            hand_class = evaluator.class_to_string(evaluator.get_rank_class(scores[player]))
             winnings = winnings_per_player + (1 if i < remainder else 0)
             player.stack += winnings
             if self.verbose:
+                hole_str = ' '.join([Card.int_to_pretty_str(c) for c in player.hand])
+                hand_class = evaluator.class_to_string(evaluator.get_rank_class(scores[player]))
                 print(f"Winner: {player.name} | Hand: {hole_str} | {hand_class} | Wins: {winnings}")
         if self.verbose:
             print("="*40 + "\n")
 
+        if self.observers:
+            self.emit({
+                "type": "showdown",
+                "hand_number": self.hand_number,
+                "board": list(self.community_cards),
+                "hands": {player.name: list(player.hand) for player in scores},
+                "ranks": {player.name: score for player, score in scores.items()},
+                "winners": [player.name for player in winners],
+                "pot": self.pot,
+            })
+            self.emit({"type": "hand_end", "hand_number": self.hand_number,
+                       "winners": [player.name for player in winners], "pot": self.pot})
         return winners
 
-    def betting_round(self, street_name):
+    def betting_round(self, street_name, resume=False):
         """
         Handle a complete betting round with player actions.
+        With resume=True, continue an interrupted round from self.betting_cursor.
         Returns True if hand should continue, False if only one player remains.
         """
-        if self.verbose:
-            print(f"--- {street_name} Betting ---")
-        
-        # Reset for new betting round
-        for player in self.players:
-            player.has_acted = False
-        
-        # Determine action order (left of button, or left of big blind preflop)
-        if street_name == "Pre-flop":
-            # Action starts left of big blind
-            start_pos = (self.button_position + 2) % len(self.players)
+        if len(self.players) == 2:
+            return self.heads_up_betting_round(street_name, resume)
+        return self.table_betting_round(street_name, resume)
+
+    def table_betting_round(self, street_name, resume=False):
+        """betting_round for any number of players (walks the seats from the first to act)."""
+        if resume:
+            start_pos, first_offset = self.betting_cursor
+            if sum(1 for p in self.players if p.is_active) <= 1:
+                return False
         else:
-            # Action starts left of button
-            start_pos = (self.button_position + 1) % len(self.players)
+            if self.verbose:
+                print(f"--- {street_name} Betting ---")
+            
+            # Reset for new betting round
+            for player in self.players:
+                player.has_acted = False
+            
+            # Determine action order (left of button, or left of big blind preflop)
+            if street_name == "Pre-flop":
+                # Action starts left of big blind
+                start_pos = (self.button_position + 2) % len(self.players)
+            else:
+                # Action starts left of button
+                start_pos = (self.button_position + 1) % len(self.players)
+            first_offset = 0
         
         action_complete = False
         current_aggressor = None  # Track who made the last raise
         
         while not action_complete:
-            action_complete = True
+            # A resumed pass already had an action before the cursor
+            action_complete = not resume
+            resume = False
             
-            for i in range(len(self.players)):
+            for i in range(first_offset, len(self.players)):
                 player_idx = (start_pos + i) % len(self.players)
                 player = self.players[player_idx]
                 
@@ -279,16 +473,21 @@ class PokerGame:
                 
                 # Player needs to act
                 action_complete = False
+                self.betting_cursor = (start_pos, i)
                 
                 # Build game state for this player
                 game_state = self.build_game_state(player)
                 
                 # Get action from player
-                action_dict = player.brain.get_action(game_state)
+                if self.decisions is not None:
+                    action_dict = self.decisions.decide(player.brain, game_state)
+                else:
+                    action_dict = player.brain.get_action(game_state)
                 action_type = action_dict.get("action", "fold").lower()
                 amount = action_dict.get("amount", 0)
                 
                 # Process the action
+                table_bet, bet_before, pot_before = self.current_bet, player.current_bet, self.pot
                 self.process_action(player, action_type, amount)
                 player.has_acted = True
                 
@@ -300,6 +499,8 @@ class PokerGame:
                     for p in self.players:
                         if p != player and p.is_active and p.stack > 0:
                             p.has_acted = False
+                if self.observers:
+                    self.emit_action(player, table_bet, bet_before, pot_before)
                 
                 # Check if only one player remains
                 active_count = sum(1 for p in self.players if p.is_active)
@@ -307,6 +508,7 @@ class PokerGame:
                     if self.verbose:
                         print()
                     return False
+            first_offset = 0
             
             # After a full round, check if everyone has acted and matched the bet
             all_matched = True
@@ -323,6 +525,78 @@ class PokerGame:
         for player in self.players:
             player.current_bet = 0
         self.current_bet = 0
+        self.betting_cursor = None
+        if self.verbose:
+            print()
+        return True
+
+    def heads_up_betting_round(self, street_name, resume=False):
+        """
+        betting_round for the last two players. The rules, cursor and events
+        are the same as table_betting_round's; positions are fixed for the round
+        and game states come from build_heads_up_state.
+        """
+        if resume:
+            start_pos, first_offset = self.betting_cursor
+            if not (self.players[0].is_active and self.players[1].is_active):
+                return False
+        else:
+            if self.verbose:
+                print(f"--- {street_name} Betting ---")
+            for player in self.players:
+                player.has_acted = False
+            # The button is the small blind: first to act pre-flop, last after
+            start_pos = self.button_position % 2 if street_name == "Pre-flop" else (self.button_position + 1) % 2
+            first_offset = 0
+        seats = (self.players[start_pos], self.players[1 - start_pos])
+
+        action_complete = False
+        while not action_complete:
+            # A resumed pass already had an action before the cursor
+            action_complete = not resume
+            resume = False
+
+            for i in range(first_offset, 2):
+                player = seats[i]
+                if not player.is_active or player.stack == 0:
+                    continue
+                if player.has_acted and player.current_bet >= self.current_bet:
+                    continue
+
+                action_complete = False
+                self.betting_cursor = (start_pos, i)
+                opponent = seats[1 - i]
+
+                game_state = self.build_heads_up_state(player, opponent)
+                if self.decisions is not None:
+                    action_dict = self.decisions.decide(player.brain, game_state)
+                else:
+                    action_dict = player.brain.get_action(game_state)
+                action_type = action_dict.get("action", "fold").lower()
+                amount = action_dict.get("amount", 0)
+
+                table_bet, bet_before, pot_before = self.current_bet, player.current_bet, self.pot
+                self.process_action(player, action_type, amount)
+                player.has_acted = True
+
+                if action_type == "raise" and opponent.is_active and opponent.stack > 0:
+                    opponent.has_acted = False
+                if self.observers:
+                    self.emit_action(player, table_bet, bet_before, pot_before)
+
+                if not (player.is_active and opponent.is_active):
+                    if self.verbose:
+                        print()
+                    return False
+            first_offset = 0
+
+            action_complete = not any(p.is_active and p.stack > 0 and p.current_bet < self.current_bet
+                                      for p in seats)
+
+        for player in seats:
+            player.current_bet = 0
+        self.current_bet = 0
+        self.betting_cursor = None
         if self.verbose:
             print()
         return True
@@ -460,6 +734,10 @@ class PokerGame:
         
         # Determine valid actions
         valid_actions = self.get_valid_actions(current_player)
+
+        # Best hand on the current board, ranked once per street (None pre-flop)
+        hand_rank = self.hand_ranks.get(current_player)
+        hand_class = self.evaluator.get_rank_class(hand_rank) if hand_rank is not None else None
         
         # Build the complete game state
         game_state = {
@@ -472,7 +750,9 @@ class PokerGame:
                 "position": self.players.index(current_player),
                 "is_button": self.players.index(current_player) == self.button_position,
                 "is_small_blind": self.players.index(current_player) == self.button_position,
-                "is_big_blind": self.players.index(current_player) == (self.button_position + 1) % len(self.players)
+                "is_big_blind": self.players.index(current_player) == (self.button_position + 1) % len(self.players),
+                "hand_rank": hand_rank,
+                "hand_class": hand_class
             },
             
             # Community cards
@@ -512,6 +792,52 @@ class PokerGame:
         
         return game_state
     
+    def build_heads_up_state(self, current_player, opponent):
+        """build_game_state for a two-player table, without the n-player lookups"""
+        position = 0 if self.players[0] is current_player else 1
+        amount_to_call = self.current_bet - current_player.current_bet
+        hand_rank = self.hand_ranks.get(current_player)
+
+        return {
+            "player": {
+                "name": current_player.name,
+                "hand": current_player.hand.copy(),
+                "stack": current_player.stack,
+                "current_bet": current_player.current_bet,
+                "position": position,
+                "is_button": position == self.button_position,
+                "is_small_blind": position == self.button_position,
+                "is_big_blind": position == (self.button_position + 1) % 2,
+                "hand_rank": hand_rank,
+                "hand_class": self.evaluator.get_rank_class(hand_rank) if hand_rank is not None else None
+            },
+            "community_cards": self.community_cards.copy(),
+            "num_community_cards": len(self.community_cards),
+            "pot": self.pot,
+            "current_bet": self.current_bet,
+            "amount_to_call": amount_to_call,
+            "pot_odds": amount_to_call / (self.pot + amount_to_call) if amount_to_call > 0 else 0,
+            "street": self.current_street,
+            "small_blind": self.small_blind,
+            "big_blind": self.big_blind,
+            "ante": self.ante,
+            "hand_number": self.hand_number,
+            "button_position": self.button_position,
+            "num_players": 2,
+            "num_active_players": current_player.is_active + opponent.is_active,
+            "opponents": [{
+                "name": opponent.name,
+                "stack": opponent.stack,
+                "current_bet": opponent.current_bet,
+                "is_active": opponent.is_active,
+                "position": 1 - position,
+                "is_all_in": opponent.stack == 0 and opponent.is_active
+            }],
+            "valid_actions": self.get_valid_actions(current_player),
+            "min_raise": self.big_blind if self.current_bet == 0 else self.current_bet * 2,
+            "max_raise": current_player.stack
+        }
+
     def get_valid_actions(self, player):
         """
         Determine which actions are valid for a player.
@@ -544,24 +870,23 @@ class PokerGame:
         return valid
 
     def print_game_state(self):
-        if self.verbose:
-            print("="*40)
-            print("CURRENT GAME STATE")
-            print("="*40)
+        # Pretty card strings are slow to build, so do nothing when quiet
+        if not self.verbose:
+            return
+        print("="*40)
+        print("CURRENT GAME STATE")
+        print("="*40)
 
         if self.community_cards:
             community_str = ' '.join([Card.int_to_pretty_str(c) for c in self.community_cards])
         else:
             community_str = "No community cards yet"
-        if self.verbose:
-            print(f"Community Cards: {community_str}")
-            print(f"Pot Size: {self.pot}")
-            print(f"Current Bet: {self.current_bet}\n")
+        print(f"Community Cards: {community_str}")
+        print(f"Pot Size: {self.pot}")
+        print(f"Current Bet: {self.current_bet}\n")
 
         for player in self.players:
             hole_str = ' '.join([Card.int_to_pretty_str(c) for c in player.hand]) if player.hand else "No cards yet"
             status = "IN HAND" if player.is_active else "FOLDED"
-            if self.verbose:
-                print(f"{player.name}: {hole_str} | Stack: {player.stack} | Current Bet: {player.current_bet} | Status: {status}")
-        if self.verbose:
-            print("="*40 + "\n")
\ No newline at end of file
+            print(f"{player.name}: {hole_str} | Stack: {player.stack} | Current Bet: {player.current_bet} | Status: {status}")
+        print("="*40 + "\n")
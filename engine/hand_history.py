@@ -0,0 +1,271 @@
+"""
+Append-only binary hand histories.
+
+A history is a directory of flat files of fixed-width little-endian records,
+so a reader can memory-map them as NumPy structured arrays without parsing:
+
+    hands.bin    one HAND_DTYPE record per hand; first_seat and first_action
+                 index the hand's rows in the other two files
+    seats.bin    one SEAT_DTYPE record per player dealt in: hole cards,
+                 starting stack, chips won or lost
+    actions.bin  one ACTION_DTYPE record per action, in betting order
+    players.txt  player names, one per line; records store the line number
+
+Cards are stored as their index 0..51 in Deck.GetFullDeck() order (NO_CARD
+when not dealt), streets and actions as indexes into STREETS and ACTIONS.
+Chip amounts are float64 because brains can ask for odd amounts (fractional
+or negative raises) that the engine accepts; chips() turns them back into
+ints where they are whole. Actions are what the engine did (see the "action"
+event in engine/opponent_stats.py), blinds are not actions.
+
+Recording:
+
+    writer = HandHistoryWriter("histories/run1")
+    game = PokerGame(players, verbose=False, history=writer)
+    game.play_game()
+    writer.close()
+
+The writer is an event observer that also reads hole cards and stacks from
+the game it is attached to. Records are buffered and appended in blocks, a
+hand's seats and actions before the hand itself, so a crash loses at most
+the unflushed hands; reopening a history drops any partial tail.
+
+Reading:
+
+    history = HandHistory("histories/run1")
+    history.hands["pot"].mean()
+    river = history.actions[history.actions["street"] == STREETS.index("river")]
+    history.hand_actions(0), history.hand_seats(0), history.player_seats("Noah")
+"""
+import os
+
+import numpy as np
+
+from engine.cards import CARD_INDEX, FULL_DECK
+
+STREETS = ("pre-flop", "flop", "turn", "river")
+ACTIONS = ("fold", "check", "call", "bet", "raise")
+NO_CARD = 255
+
+HAND_DTYPE = np.dtype([
+    ("game", "<u4"), ("hand_number", "<u4"), ("button", "u1"), ("num_players", "u1"),
+    ("board", "u1", 5), ("small_blind", "<i4"), ("big_blind", "<i4"), ("pot", "<f8"),
+    ("showdown", "?"), ("first_seat", "<u8"), ("first_action", "<u8"), ("num_actions", "<u2"),
+])
+SEAT_DTYPE = np.dtype([
+    ("hand", "<u8"), ("player", "<u2"), ("seat", "u1"), ("hole", "u1", 2),
+    ("stack", "<f8"), ("net", "<f8"), ("winner", "?"),
+])
+ACTION_DTYPE = np.dtype([
+    ("hand", "<u8"), ("seat", "u1"), ("street", "u1"), ("action", "u1"), ("all_in", "?"),
+    ("amount", "<f8"), ("to_call", "<f8"), ("pot", "<f8"),
+])
+
+FILES = (("seats", SEAT_DTYPE), ("actions", ACTION_DTYPE), ("hands", HAND_DTYPE))
+
+_STREET_CODES = {name: i for i, name in enumerate(STREETS)}
+_ACTION_CODES = {name: i for i, name in enumerate(ACTIONS)}
+
+
+def card_ints(indexes):
+    """treys card ints of stored card indexes, skipping NO_CARD."""
+    return [FULL_DECK[i] for i in indexes if i != NO_CARD]
+
+
+def chips(value):
+    """A stored chip amount as a Python number (int when whole)."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def _read_names(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def _map(path, dtype):
+    """Read-only structured view of every whole record in path."""
+    count = os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class HandHistoryWriter:
+    def __init__(self, path, buffer_hands=4096):
+        """
+        Open (or create) a history for appending.
+
+        Args:
+            path: History directory
+            buffer_hands: Hands kept in memory before they are appended to disk
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.buffer_hands = buffer_hands
+        self.truncate(self._consistent_position())
+
+        names = _read_names(os.path.join(path, "players.txt"))
+        self.player_ids = {name: i for i, name in enumerate(names)}
+        self._names_file = open(os.path.join(path, "players.txt"), "a")
+        self._files = {name: open(os.path.join(path, f"{name}.bin"), "ab") for name, _ in FILES}
+        self._buffers = {name: [] for name, _ in FILES}
+        self._seats = self._buffers["seats"]
+        self._actions = self._buffers["actions"]
+        self._hands = self._buffers["hands"]
+
+        hands = _map(os.path.join(path, "hands.bin"), HAND_DTYPE)
+        self.game_number = int(hands["game"][-1]) if len(hands) else 0
+        self.game = None
+
+    def _consistent_position(self):
+        """Record counts that end on the last complete hand on disk."""
+        hands = _map(os.path.join(self.path, "hands.bin"), HAND_DTYPE)
+        if not len(hands):
+            return 0, 0, 0
+        last = hands[-1]
+        return (int(last["first_seat"]) + int(last["num_players"]),
+                int(last["first_action"]) + int(last["num_actions"]), len(hands))
+
+    def position(self):
+        """(seats, actions, hands) records written so far, for truncate()."""
+        return tuple(self._written[name] + len(self._buffers[name]) for name, _ in FILES)
+
+    def truncate(self, position):
+        """Drop everything after an earlier position(), e.g. when resuming from a checkpoint."""
+        if getattr(self, "_files", None):
+            self.flush()
+        for (name, dtype), count in zip(FILES, position):
+            path = os.path.join(self.path, f"{name}.bin")
+            with open(path, "ab") as f:
+                f.truncate(count * dtype.itemsize)
+        self._written = dict(zip((name for name, _ in FILES), position))
+
+    def attach(self, game):
+        """Record every hand of game (PokerGame(history=writer) calls this)."""
+        self.game = game
+        self.game_number += 1
+        game.history = self
+        game.subscribe(self)
+
+    def observe(self, event):
+        kind = event["type"]
+        if kind == "action":
+            self._actions.append((
+                self._hand_id, self._seat_of[event["player"]], _STREET_CODES[event["street"]],
+                _ACTION_CODES[event["action"]], event["all_in"], event["amount"], event["to_call"],
+                event["pot"],
+            ))
+        elif kind == "hand_start":
+            players = self.game.players
+            self._hand_id = self._written["hands"] + len(self._hands)
+            self._action_mark = len(self._actions)
+            self._seat_of = {p.name: seat for seat, p in enumerate(players)}
+            # Blinds are already posted when the hand starts
+            self._stacks = [p.stack + p.current_bet for p in players]
+            self._showdown = False
+        elif kind == "showdown":
+            self._showdown = True
+        elif kind == "hand_end":
+            self._end_hand(event)
+
+    def _player_id(self, name):
+        player_id = self.player_ids.get(name)
+        if player_id is None:
+            player_id = self.player_ids[name] = len(self.player_ids)
+            self._names_file.write(name + "\n")
+        return player_id
+
+    def _end_hand(self, event):
+        game = self.game
+        hand_id = self._hand_id
+        winners = event["winners"]
+        first_seat = self._written["seats"] + len(self._seats)
+        for seat, player in enumerate(game.players):
+            hole = [CARD_INDEX[c] for c in player.hand] + [NO_CARD] * (2 - len(player.hand))
+            start = self._stacks[seat]
+            self._seats.append((hand_id, self._player_id(player.name), seat, hole, start,
+                                player.stack - start, player.name in winners))
+
+        board = [CARD_INDEX[c] for c in game.community_cards]
+        board += [NO_CARD] * (5 - len(board))
+        self._hands.append((
+            self.game_number, game.hand_number, game.button_position, len(game.players), board,
+            game.small_blind, game.big_blind, event["pot"], self._showdown, first_seat,
+            self._written["actions"] + self._action_mark, len(self._actions) - self._action_mark,
+        ))
+        if len(self._hands) >= self.buffer_hands:
+            self.flush()
+
+    def flush(self):
+        """Append buffered records (seats and actions before the hands that index them)."""
+        self._names_file.flush()
+        for name, dtype in FILES:
+            buffer = self._buffers[name]
+            if buffer:
+                np.array(buffer, dtype=dtype).tofile(self._files[name])
+                self._written[name] += len(buffer)
+                buffer.clear()
+            self._files[name].flush()
+
+    def close(self):
+        self.flush()
+        self._names_file.close()
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HandHistory:
+    """Memory-mapped, read-only view of a history written by HandHistoryWriter."""
+
+    def __init__(self, path):
+        self.path = path
+        self.players = _read_names(os.path.join(path, "players.txt"))
+        self.hands = _map(os.path.join(path, "hands.bin"), HAND_DTYPE)
+        self.seats = _map(os.path.join(path, "seats.bin"), SEAT_DTYPE)
+        self.actions = _map(os.path.join(path, "actions.bin"), ACTION_DTYPE)
+
+    def __len__(self):
+        return len(self.hands)
+
+    def hand_seats(self, hand):
+        record = self.hands[hand]
+        first = int(record["first_seat"])
+        return self.seats[first:first + int(record["num_players"])]
+
+    def hand_actions(self, hand):
+        record = self.hands[hand]
+        first = int(record["first_action"])
+        return self.actions[first:first + int(record["num_actions"])]
+
+    def player_id(self, name):
+        return self.players.index(name)
+
+    def player_seats(self, name):
+        """Seat records of every hand a player was dealt into."""
+        return self.seats[self.seats["player"] == self.player_id(name)]
+
+    def describe(self, hand):
+        """Readable dict of one hand (names, treys cards, action strings)."""
+        record = self.hands[hand]
+        seats = self.hand_seats(hand)
+        names = [self.players[s["player"]] for s in seats]
+        return {
+            "game": int(record["game"]),
+            "hand_number": int(record["hand_number"]),
+            "button": names[record["button"]],
+            "board": card_ints(record["board"]),
+            "pot": chips(record["pot"]),
+            "seats": [{"name": names[i], "hole": card_ints(s["hole"]), "stack": chips(s["stack"]),
+                       "net": chips(s["net"]), "winner": bool(s["winner"])} for i, s in enumerate(seats)],
+            "actions": [(STREETS[a["street"]], names[a["seat"]], ACTIONS[a["action"]], chips(a["amount"]))
+                        for a in self.hand_actions(hand)],
+        }
@@ -0,0 +1,352 @@
+"""
+Brain adapter for bots hosted as local HTTP services.
+
+The service accepts POST /decide with the same JSON shape the stdio
+protocol uses (see engine/external.py):
+
+    request:  {"decide": [[id, game_state], ...]}
+    response: {"actions": [[id, {"action": "call"}], ...]}
+
+HttpBot keeps a bounded pool of keep-alive connections. Decisions requested
+concurrently (e.g. from tables running on different threads) are coalesced
+into batch requests, and when more work is queued than fits in one batch the
+requests are pipelined on a single connection.
+"""
+import json
+import queue
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from engine.brain import Brain
+
+
+class HttpBotError(RuntimeError):
+    """Raised when the bot service cannot produce an answer."""
+
+
+class HttpConnection:
+    """A keep-alive HTTP/1.1 connection that can pipeline POST requests."""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        self.keep_alive = True
+
+    def post_many(self, path, bodies):
+        """
+        Send every body as its own POST without waiting, then read the replies.
+
+        Returns:
+            List of response bodies in request order
+        """
+        out = []
+        for body in bodies:
+            out.append(
+                b"POST %s HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n" % (path.encode(), self.host.encode(), len(body))
+            )
+            out.append(body)
+        self.sock.sendall(b"".join(out))
+        return [self._read_response() for _ in bodies]
+
+    def _read_response(self):
+        status_line = self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Bot service closed the connection")
+        status = int(status_line.split(None, 2)[1])
+
+        length = 0
+        while True:
+            line = self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"connection" and value.strip().lower() == b"close":
+                self.keep_alive = False
+
+        body = self.reader.read(length)
+        if status != 200:
+            raise HttpBotError(f"Bot service returned HTTP {status}: {body[:200]!r}")
+        return body
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class ConnectionPool:
+    """Bounded pool of keep-alive connections to one host."""
+
+    def __init__(self, host, port, max_connections=4, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.connections_opened = 0
+
+    def acquire(self):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise HttpBotError("Timed out waiting for a free connection")
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            conn = HttpConnection(self.host, self.port, self.timeout)
+        except OSError:
+            self.slots.release()
+            raise
+        self.connections_opened += 1
+        return conn
+
+    def release(self, conn, broken=False):
+        if broken or not conn.keep_alive:
+            conn.close()
+        else:
+            self.idle.put(conn)
+        self.slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HttpBot(Brain):
+    """
+    Brain that asks an HTTP bot service for every decision.
+
+    One HttpBot can be shared by several seats and tables; pending decisions
+    from all of them are batched together.
+    """
+
+    # The bot's own randomness is out of reach of the tournament's seed
+    reproducible = False
+
+    def __init__(self, host="127.0.0.1", port=8765, path="/decide", max_connections=4,
+                 max_batch=32, pipeline_depth=4, timeout=5.0, retries=2,
+                 retry_backoff=0.05, fallback_action=None):
+        """
+        Args:
+            host, port, path: Where the bot service listens
+            max_connections: Upper bound on open keep-alive connections
+            max_batch: Decisions per request (1 disables batching)
+            pipeline_depth: Requests pipelined per connection round trip
+            timeout: Socket and pool timeout in seconds
+            retries: Extra attempts after a connection error or timeout
+            retry_backoff: Initial sleep between attempts, doubled each retry
+            fallback_action: Action returned when every attempt fails;
+                None raises HttpBotError instead
+        """
+        super().__init__()
+        self.pool = ConnectionPool(host, port, max_connections, timeout)
+        self.path = path
+        self.max_batch = max(1, max_batch)
+        self.pipeline_depth = max(1, pipeline_depth)
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.fallback_action = fallback_action
+        self.pending = []
+        self.senders = 0
+        self.max_senders = max_connections
+        self.cond = threading.Condition()
+        self.next_id = 0
+        self.requests_sent = 0
+        self.decisions_sent = 0
+        self.failures = 0
+
+    def get_action(self, game_state):
+        slot = {"state": game_state, "action": None, "error": None, "taken": False, "done": False}
+        with self.cond:
+            self.pending.append(slot)
+            # Wait until someone sends our decision or a connection frees up
+            while not slot["taken"] and self.senders >= self.max_senders:
+                self.cond.wait()
+            if not slot["taken"]:
+                take = self.max_batch * self.pipeline_depth
+                batch, self.pending = self.pending[:take], self.pending[take:]
+                for s in batch:
+                    s["taken"] = True
+                ids = list(range(self.next_id, self.next_id + len(batch)))
+                self.next_id += len(batch)
+                self.senders += 1
+            else:
+                batch = None
+
+        if batch is not None:
+            results = error = None
+            try:
+                results = self._send(ids, batch)
+            except Exception as e:
+                error = e
+            finally:
+                with self.cond:
+                    self.senders -= 1
+                    if results is None:
+                        # _send raised (or was interrupted): every seat waiting on this batch gets the error
+                        error = error or HttpBotError("Bot request was interrupted")
+                        results = [(None, error)] * len(batch)
+                    for s, (action, failure) in zip(batch, results):
+                        s["action"], s["error"], s["done"] = action, failure, True
+                    self.cond.notify_all()
+
+        with self.cond:
+            while not slot["done"]:
+                self.cond.wait()
+
+        if slot["error"] is not None:
+            if self.fallback_action is not None:
+                return dict(self.fallback_action)
+            raise slot["error"]
+        return slot["action"]
+
+    def _send(self, ids, batch):
+        """
+        Send a batch as pipelined requests, retrying on fresh connections.
+
+        Returns:
+            List of (action, error) pairs in batch order
+        """
+        bodies = []
+        for start in range(0, len(batch), self.max_batch):
+            chunk = [[i, s["state"]] for i, s in zip(ids[start:], batch[start:start + self.max_batch])]
+            bodies.append(json.dumps({"decide": chunk}, separators=(",", ":")).encode())
+
+        error = None
+        delay = self.retry_backoff
+        for attempt in range(self.retries + 1):
+            conn = None
+            try:
+                conn = self.pool.acquire()
+                replies = conn.post_many(self.path, bodies)
+                actions = {}
+                for reply in replies:
+                    for request_id, action in json.loads(reply)["actions"]:
+                        actions[request_id] = action
+                self.pool.release(conn)
+                break
+            except (OSError, HttpBotError, ValueError, KeyError, TypeError) as e:
+                if conn is not None:
+                    self.pool.release(conn, broken=True)
+                error = e
+                if attempt < self.retries:
+                    time.sleep(delay)
+                    delay *= 2
+        else:
+            self.failures += 1
+            failure = HttpBotError(f"Bot service failed after {self.retries + 1} attempts: {error}")
+            return [(None, failure)] * len(batch)
+
+        self.requests_sent += len(bodies)
+        self.decisions_sent += len(batch)
+        results = []
+        for request_id in ids:
+            action = actions.get(request_id)
+            if action is None:
+                results.append((None, HttpBotError(f"Bot service did not answer request {request_id}")))
+            else:
+                results.append((action, None))
+        return results
+
+    def close(self):
+        self.pool.close()
+
+
+class _DecideHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            requests = json.loads(self.rfile.read(length))["decide"]
+            with self.server.brain_lock:
+                results = [[i, self.server.brain.get_action(state)] for i, state in requests]
+            body = json.dumps({"actions": results}, separators=(",", ":")).encode()
+            self.send_response(200)
+        except (ValueError, KeyError, TypeError) as e:
+            body = str(e).encode()
+            self.send_response(400)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BotHTTPServer(ThreadingHTTPServer):
+    """
+    Local stand-in bot service that answers with a Brain.
+
+    Usage:
+        server = BotHTTPServer(RandomBot(), port=0)
+        server.start()
+        bot = HttpBot(port=server.port)
+    """
+    daemon_threads = True
+
+    def __init__(self, brain, host="127.0.0.1", port=8765):
+        super().__init__((host, port), _DecideHandler)
+        self.brain = brain
+        self.brain_lock = threading.Lock()
+        self.port = self.server_address[1]
+        self.thread = None
+
+    def start(self):
+        """Serve on a background thread."""
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    # Benchmark: decisions/sec versus number of concurrent tables
+    import os
+    from bots.randomBot import RandomBot
+
+    with open(os.path.join(os.path.dirname(__file__), "..", "helpers", "exmaple_game_state")) as f:
+        state = json.load(f)
+
+    server = BotHTTPServer(RandomBot(), port=0).start()
+    decisions_per_thread = 2000
+
+    print(f"{'Tables':<8} {'Batch':<7} {'Decisions/sec':<15} {'Requests':<10} {'Connections':<12}")
+    print("-" * 55)
+    for max_batch in (1, 32):
+        for concurrency in (1, 2, 4, 8, 16):
+            bot = HttpBot(port=server.port, max_connections=4, max_batch=max_batch)
+
+            def table():
+                for _ in range(decisions_per_thread):
+                    bot.get_action(state)
+
+            threads = [threading.Thread(target=table) for _ in range(concurrency)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            rate = concurrency * decisions_per_thread / elapsed
+            print(f"{concurrency:<8} {max_batch:<7} {rate:<15.0f} {bot.requests_sent:<10} {bot.pool.connections_opened:<12}")
+            bot.close()
+    server.stop()
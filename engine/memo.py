@@ -0,0 +1,169 @@
+"""
+Decision memoization for declared-pure brains.
+
+A Brain subclass declares that get_action() is a deterministic function of a
+few game_state keys (and optionally some of its own attributes):
+
+    class FirstBot(Brain):
+        pure = True
+        decision_keys = ("street", "valid_actions", "player.hand_class")
+
+PokerGame then routes its decisions through a DecisionCache, a bounded LRU
+keyed on the brain class, the declared attributes and the canonicalized
+values of those keys. Card lists are order-insensitive (lists of ints are
+sorted), other lists keep their order and dicts become sorted item tuples.
+Cached decisions go through the brain's complete_decision() before they are
+returned, so an amount that follows from an undeclared key (FirstBot sizes
+its all-in from player.stack) need not split the cache.
+
+Keys the engine derives can be missing: hand_class is None when the engine
+did not rank the hand (pre-flop, or decoded external and replayed states).
+decision_fallbacks names the keys such a value is derived from, and the
+cache keys on those whenever it is None:
+
+        decision_fallbacks = {"player.hand_class": ("player.hand", "community_cards")}
+
+Purity is checked at run time: the global random state is compared around
+every uncached call, and a class whose call consumed randomness is excluded
+from memoization for the rest of the run. With verify=True every hit is also
+recomputed and compared, so a wrong decision_keys declaration shows up as
+mismatches in the report (the class is excluded too). enabled=False bypasses
+the cache entirely.
+"""
+from collections import OrderedDict
+import random
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def canonical(value):
+    """Hashable, order-normalized form of a game_state value."""
+    if isinstance(value, (list, tuple)):
+        items = tuple(canonical(v) for v in value)
+        if items and all(type(v) is int for v in items):
+            return tuple(sorted(items))
+        return items
+    if isinstance(value, dict):
+        return tuple(sorted((k, canonical(v)) for k, v in value.items()))
+    return value
+
+
+def _lookup(game_state, path):
+    value = game_state
+    for part in path:
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+class DecisionStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.mismatches = 0
+        self.excluded = None  # reason, once excluded
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class DecisionCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, verify=False, enabled=True):
+        """
+        Args:
+            max_entries: Decisions kept (least recently used are evicted)
+            verify: Recompute every hit and count mismatches
+            enabled: False to call brains directly
+        """
+        self.max_entries = max_entries
+        self.verify = verify
+        self.enabled = enabled
+        self.entries = OrderedDict()
+        self.stats = {}
+        self._paths = {}
+
+    def _key_paths(self, cls):
+        """(path, fallback paths) for each declared key."""
+        paths = self._paths.get(cls)
+        if paths is None:
+            fallbacks = getattr(cls, "decision_fallbacks", {})
+            paths = self._paths[cls] = [
+                (tuple(key.split(".")), [tuple(k.split(".")) for k in fallbacks.get(key, ())])
+                for key in cls.decision_keys
+            ]
+        return paths
+
+    def _key_values(self, cls, game_state):
+        values = []
+        for path, fallback in self._key_paths(cls):
+            value = _lookup(game_state, path)
+            if value is None and fallback:
+                values.append(("fallback",) + tuple(canonical(_lookup(game_state, p)) for p in fallback))
+            else:
+                values.append(canonical(value))
+        return tuple(values)
+
+    def exclude(self, cls, reason):
+        """Stop memoizing a class and drop its cached decisions."""
+        self.stats.setdefault(cls.__name__, DecisionStats()).excluded = reason
+        for key in [key for key in self.entries if key[0] is cls]:
+            del self.entries[key]
+
+    def decide(self, brain, game_state):
+        """brain.get_action(game_state), from the cache when the brain is declared pure."""
+        cls = type(brain)
+        if not self.enabled or not getattr(cls, "pure", False):
+            return brain.get_action(game_state)
+        stats = self.stats.get(cls.__name__)
+        if stats is None:
+            stats = self.stats[cls.__name__] = DecisionStats()
+        if stats.excluded:
+            return brain.get_action(game_state)
+
+        key = (cls,
+               tuple(getattr(brain, name) for name in cls.decision_params),
+               self._key_values(cls, game_state))
+        cached = self.entries.get(key)
+        if cached is not None:
+            self.entries.move_to_end(key)
+            stats.hits += 1
+            completed = dict(cached)
+            complete_decision = getattr(brain, "complete_decision", None)
+            if complete_decision is not None:
+                completed = complete_decision(completed, game_state)
+            if self.verify:
+                action = brain.get_action(game_state)
+                if action != completed:
+                    stats.mismatches += 1
+                    self.exclude(cls, "decision differs from cached value")
+                return action
+            return completed
+
+        stats.misses += 1
+        state = random.getstate()
+        action = brain.get_action(game_state)
+        if random.getstate() != state:
+            self.exclude(cls, "calls random")
+            return action
+        self.entries[key] = dict(action)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return action
+
+    def clear(self):
+        self.entries.clear()
+        self.stats.clear()
+
+    def print_report(self):
+        print(f"{'Brain':<20} {'Hits':>10} {'Misses':>10} {'Hit rate':>9} {'Mismatch':>9}  Status")
+        print("-" * 72)
+        for name, stats in sorted(self.stats.items()):
+            status = f"excluded ({stats.excluded})" if stats.excluded else "memoized"
+            print(f"{name:<20} {stats.hits:>10} {stats.misses:>10} {stats.hit_rate:>8.1%} "
+                  f"{stats.mismatches:>9}  {status}")
+        print(f"{len(self.entries):,} cached decisions")
+
+
+# Shared by every PokerGame unless one is passed explicitly
+DECISIONS = DecisionCache()
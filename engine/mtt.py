@@ -0,0 +1,236 @@
+"""
+Multi-table tournaments (MTT) built on PokerGame.
+
+Players are split across tables of at most max_seats. Every round each table
+plays one hand (concurrently when workers > 1), then busted players are
+recorded, tables are broken and rebalanced, and the shared blind clock is
+advanced. Because a table never holds more than max_seats players, the cost
+of a hand does not grow with the field size.
+
+Tables playing on worker threads share the random module and every brain's
+interpreter, so runs with workers > 1 are not reproducible and only pay off
+for I/O bound bots (external processes, HTTP bots); in-process Python bots
+gain nothing from the threads. Those tables also skip the shared decision
+cache (engine/memo.py), which is neither locked nor able to check purity
+while other tables draw random numbers.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from engine.game import PokerGame
+from engine.memo import DECISIONS
+from engine.player import Player
+
+
+class BlindClock:
+    """Blind levels shared by every table in the tournament."""
+
+    def __init__(self, small_blind=10, big_blind=20, hands_per_level=10, factor=1.5):
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.hands_per_level = hands_per_level
+        self.factor = factor
+        self.level = 1
+
+    def tick(self, rounds_played):
+        """Advance a level every hands_per_level rounds (same rule as PokerGame.increase_blinds)."""
+        if rounds_played % self.hands_per_level == 0:
+            self.small_blind = int(self.small_blind * self.factor)
+            self.big_blind = int(self.big_blind * self.factor)
+            self.level += 1
+            return True
+        return False
+
+
+class MultiTableTournament:
+    def __init__(self, player_configs, starting_stack=3000, max_seats=9, workers=1,
+                 blind_clock=None, verbose=False):
+        """
+        Initialize a multi-table tournament.
+
+        Args:
+            player_configs: List of tuples (name, brain_class_or_instance); names must be unique
+            starting_stack: Starting chips for each player
+            max_seats: Maximum players per table
+            workers: Tables played at the same time (threads); useful for I/O bound
+                bots only, and not deterministic (see the module docstring)
+            blind_clock: BlindClock shared by all tables (defaults to PokerGame's schedule)
+            verbose: Print table breaks, moves and eliminations
+        """
+        names = [name for name, _ in player_configs]
+        if len(set(names)) != len(names):
+            raise ValueError("Player names must be unique in a multi-table tournament")
+        if max_seats < 2:
+            raise ValueError("Tables need at least 2 seats")
+
+        self.player_configs = player_configs
+        self.starting_stack = starting_stack
+        self.max_seats = max_seats
+        self.workers = workers
+        self.clock = blind_clock or BlindClock()
+        self.verbose = verbose
+
+        self.tables = []
+        self.finishing_order = []  # busted players, first out first
+        self.start_stacks = {}
+        self.rounds_played = 0
+        self.hands_played = 0
+        self.tables_broken = 0
+        self.players_moved = 0
+
+    def seat_players(self):
+        """Create players and deal them round-robin onto the minimum number of tables."""
+        players = [Player(name, brain, self.starting_stack) for name, brain in self.player_configs]
+        num_tables = max(1, -(-len(players) // self.max_seats))
+        seats = [[] for _ in range(num_tables)]
+        for i, player in enumerate(players):
+            seats[i % num_tables].append(player)
+
+        self.tables = []
+        decisions = DECISIONS if self.workers <= 1 else None
+        for table_players in seats:
+            table = PokerGame(table_players, starting_stack=self.starting_stack, verbose=False,
+                              decisions=decisions)
+            self.tables.append(table)
+        self.finishing_order = []
+        self.start_stacks = {}
+        self.rounds_played = 0
+        self.hands_played = 0
+        self.tables_broken = 0
+        self.players_moved = 0
+
+    def remaining_players(self):
+        return sum(len(table.players) for table in self.tables)
+
+    def run(self):
+        """
+        Play until one player holds every chip.
+
+        Returns:
+            List of player names from winner to first eliminated
+        """
+        self.seat_players()
+        executor = ThreadPoolExecutor(self.workers) if self.workers > 1 else None
+
+        try:
+            while self.remaining_players() > 1:
+                self.play_round(executor)
+                self.record_eliminations()
+                self.break_tables()
+                self.balance_tables()
+                self.rounds_played += 1
+                if self.clock.tick(self.rounds_played) and self.verbose:
+                    print(f"*** LEVEL {self.clock.level}: BLINDS {self.clock.small_blind}/{self.clock.big_blind} ***")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        for table in self.tables:
+            for player in table.players:
+                self.finishing_order.append(player)
+        return self.standings()
+
+    def standings(self):
+        """Player names from winner to first eliminated."""
+        return [player.name for player in reversed(self.finishing_order)]
+
+    def play_round(self, executor):
+        """Play one hand at every table."""
+        for table in self.tables:
+            table.small_blind = self.clock.small_blind
+            table.big_blind = self.clock.big_blind
+            # Remember stacks at the start of the hand to order same-hand busts
+            for player in table.players:
+                self.start_stacks[player.name] = player.stack
+
+        if executor is None:
+            for table in self.tables:
+                self._play_table_hand(table)
+        else:
+            list(executor.map(self._play_table_hand, self.tables))
+        self.hands_played += len(self.tables)
+
+    def _play_table_hand(self, table):
+        if len(table.players) < 2:
+            return
+        table.hand_number += 1
+        table.play_hand()
+        table.button_position = (table.button_position + 1) % len(table.players)
+
+    def record_eliminations(self):
+        """Remove busted players; players busting on the same round are ordered by starting stack."""
+        busted = []
+        for table in self.tables:
+            for player in table.players:
+                if player.stack <= 0:
+                    busted.append(player)
+            table.eliminate_broke_players()
+
+        busted.sort(key=lambda p: self.start_stacks[p.name])
+        remaining = self.remaining_players()
+        for i, player in enumerate(busted):
+            self.finishing_order.append(player)
+            if self.verbose:
+                place = remaining + len(busted) - i
+                print(f"*** {player.name} eliminated in place {place} ***")
+
+    def break_tables(self):
+        """Break the shortest tables while the field fits on fewer tables."""
+        self.tables = [table for table in self.tables if table.players]
+        while len(self.tables) > 1 and self.remaining_players() <= (len(self.tables) - 1) * self.max_seats:
+            broken = min(self.tables, key=lambda t: len(t.players))
+            self.tables.remove(broken)
+            self.tables_broken += 1
+            if self.verbose:
+                print(f"*** Table broken, moving {len(broken.players)} players ***")
+            while broken.players:
+                player = broken.unseat_player(0)
+                target = min(self.tables, key=lambda t: len(t.players))
+                self._seat(target, player)
+
+    def balance_tables(self):
+        """Move players from the largest to the smallest table until sizes differ by at most one."""
+        if len(self.tables) < 2:
+            return
+        while True:
+            largest = max(self.tables, key=lambda t: len(t.players))
+            smallest = min(self.tables, key=lambda t: len(t.players))
+            if len(largest.players) - len(smallest.players) <= 1:
+                return
+            # Move the player who would post the next big blind (the small blind
+            # posts from the button, see PokerGame.post_blinds)
+            idx = (largest.button_position + 1) % len(largest.players)
+            player = self._unseat(largest, idx)
+            self._seat(smallest, player)
+            self.players_moved += 1
+
+    def _unseat(self, table, idx):
+        # unseat_player/seat_player also move the brain's table event subscription
+        player = table.unseat_player(idx)
+        if idx < table.button_position:
+            table.button_position -= 1
+        if table.button_position >= len(table.players):
+            table.button_position = 0
+        return player
+
+    def _seat(self, table, player):
+        # New arrivals sit just to the right of the button so they post blinds last
+        idx = table.button_position
+        table.seat_player(idx, player)
+        if table.players:
+            table.button_position = (idx + 1) % len(table.players)
+        if self.verbose:
+            print(f"{player.name} moves to a table with {len(table.players)} players")
+
+
+if __name__ == "__main__":
+    from bots.randomBot import RandomBot
+
+    for field in (50, 100, 200, 400):
+        configs = [(f"Random{i}", RandomBot) for i in range(field)]
+        mtt = MultiTableTournament(configs, starting_stack=1500, max_seats=9)
+        start = time.time()
+        order = mtt.run()
+        elapsed = time.time() - start
+        print(f"Field {field:<4} hands {mtt.hands_played:<6} rounds {mtt.rounds_played:<5} "
+              f"time {elapsed:6.2f}s  ({elapsed / mtt.hands_played * 1000:.3f} ms/hand)  winner {order[0]}")
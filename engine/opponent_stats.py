@@ -0,0 +1,150 @@
+"""
+Incremental opponent statistics fed by PokerGame table events.
+
+PokerGame.subscribe(observer) pushes every event to observer.observe(event);
+brains that override Brain.observe are subscribed automatically. Events are
+dicts with a "type":
+
+    hand_start  hand_number, button_position, players, small_blind, big_blind
+    street      hand_number, street, board, pot
+    action      hand_number, street, player, action, amount, to_call,
+                current_bet, pot, all_in
+    showdown    hand_number, board, hands (name -> hole cards), ranks, winners, pot
+    hand_end    hand_number, winners, pot
+
+"action" is what the engine actually did ("fold", "check", "call", "bet" or
+"raise"), so a call of nothing is a check and a short all-in that does not
+raise the bet is a call. Blinds are part of hand_start, not actions.
+
+OpponentStats turns the feed into per-player counters, each event touching a
+constant number of them:
+
+    vpip             share of hands with a voluntary pre-flop call, bet or raise
+    pfr              share of hands with a pre-flop raise
+    aggression       post-flop bets + raises over calls (factor) or over all
+                     post-flop actions (frequency)
+    fold_to_cbet     share of flop continuation bets (first flop bet, by the
+                     last pre-flop raiser) folded to
+
+Rates are None until the player has had an opportunity.
+"""
+
+AGGRESSIVE = ("bet", "raise")
+
+
+class PlayerStats:
+    __slots__ = ("hands", "vpip_hands", "pfr_hands", "postflop_aggressive", "postflop_calls",
+                 "postflop_passive", "cbets_faced", "cbets_folded", "showdowns")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    @staticmethod
+    def _rate(count, total):
+        return count / total if total else None
+
+    @property
+    def vpip(self):
+        return self._rate(self.vpip_hands, self.hands)
+
+    @property
+    def pfr(self):
+        return self._rate(self.pfr_hands, self.hands)
+
+    @property
+    def aggression_factor(self):
+        return self._rate(self.postflop_aggressive, self.postflop_calls)
+
+    @property
+    def aggression_frequency(self):
+        return self._rate(self.postflop_aggressive,
+                          self.postflop_aggressive + self.postflop_calls + self.postflop_passive)
+
+    @property
+    def fold_to_cbet(self):
+        return self._rate(self.cbets_folded, self.cbets_faced)
+
+    def summary(self):
+        return {"hands": self.hands, "vpip": self.vpip, "pfr": self.pfr,
+                "aggression_factor": self.aggression_factor,
+                "aggression_frequency": self.aggression_frequency,
+                "fold_to_cbet": self.fold_to_cbet, "showdowns": self.showdowns}
+
+
+class OpponentStats:
+    def __init__(self):
+        self.players = {}
+        self._handlers = {
+            "hand_start": self._hand_start,
+            "action": self._action,
+            "showdown": self._showdown,
+        }
+        self._hand_start({"players": []})
+
+    def get(self, name):
+        """Stats of a player, or None if never seen."""
+        return self.players.get(name)
+
+    def _stats(self, name):
+        stats = self.players.get(name)
+        if stats is None:
+            stats = self.players[name] = PlayerStats()
+        return stats
+
+    def observe(self, event):
+        handler = self._handlers.get(event["type"])
+        if handler is not None:
+            handler(event)
+
+    def _hand_start(self, event):
+        for name in event["players"]:
+            self._stats(name).hands += 1
+        self._voluntary = set()
+        self._raised = set()
+        self._preflop_aggressor = None
+        self._flop_bet = False
+        self._cbet_open = False  # a c-bet is out and nobody has raised it
+        self._cbet_answered = set()
+
+    def _action(self, event):
+        name, action, street = event["player"], event["action"], event["street"]
+        stats = self._stats(name)
+
+        if street == "pre-flop":
+            if action in ("call", "bet", "raise") and name not in self._voluntary:
+                self._voluntary.add(name)
+                stats.vpip_hands += 1
+            if action in AGGRESSIVE:
+                self._preflop_aggressor = name
+                if name not in self._raised:
+                    self._raised.add(name)
+                    stats.pfr_hands += 1
+            return
+
+        if action in AGGRESSIVE:
+            stats.postflop_aggressive += 1
+        elif action == "call":
+            stats.postflop_calls += 1
+        else:
+            stats.postflop_passive += 1
+
+        if street != "flop":
+            return
+        if self._cbet_open and name != self._preflop_aggressor and name not in self._cbet_answered:
+            self._cbet_answered.add(name)
+            stats.cbets_faced += 1
+            if action == "fold":
+                stats.cbets_folded += 1
+        if action == "bet" and not self._flop_bet:
+            self._flop_bet = True
+            self._cbet_open = name == self._preflop_aggressor
+        elif action == "raise":
+            self._cbet_open = False
+
+    def _showdown(self, event):
+        for name in event["hands"]:
+            self._stats(name).showdowns += 1
+
+    def summary(self):
+        return {name: stats.summary() for name, stats in self.players.items()}
@@ -0,0 +1,67 @@
+"""
+Registry of pre-flop hand scores compiled into per-combo tables.
+
+A bot's pre-flop heuristic (any function of the two hole cards) is evaluated
+once for all 1326 combos at import time:
+
+    PREFLOP_STRENGTH = compile_heuristic("ClaudeBot", _preflop_score)
+    ...
+    strength = PREFLOP_STRENGTH[combo_index(*hand)]
+
+so scoring a hand at decision time is a single list lookup returning exactly
+what the heuristic returned. Combos follow engine.equity.COMBOS order, the
+order of engine.cards.combo_index.
+
+    python -m engine.preflop [path.csv]   # dump every registered table
+"""
+import csv
+import sys
+
+import numpy as np
+from treys import Card
+
+from engine.equity import COMBO_CARDS
+
+REGISTRY = {}
+
+
+def compile_heuristic(name, heuristic):
+    """
+    Evaluate heuristic([card1, card2]) for every combo and register the results.
+
+    Returns:
+        List of 1326 values indexed by engine.cards.combo_index
+    """
+    values = [heuristic([int(a), int(b)]) for a, b in COMBO_CARDS]
+    REGISTRY[name] = values
+    return values
+
+
+def table(name):
+    """A registered table as a NumPy array."""
+    return np.array(REGISTRY[name])
+
+
+def dump(file):
+    """Write every registered table as CSV, one row per combo."""
+    names = sorted(REGISTRY)
+    writer = csv.writer(file)
+    writer.writerow(["index", "hand"] + names)
+    for k, (a, b) in enumerate(COMBO_CARDS):
+        hand = Card.int_to_str(int(b)) + Card.int_to_str(int(a))
+        writer.writerow([k, hand] + [REGISTRY[name][k] for name in names])
+
+
+if __name__ == "__main__":
+    # Importing the bots registers their tables in engine.preflop (this file runs as __main__)
+    import bots.chatGptBot
+    import bots.claudeBot
+    import bots.deepSeekBot
+    from engine import preflop
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "w", newline="") as f:
+            preflop.dump(f)
+        print(f"Wrote {len(COMBO_CARDS)} combos x {len(preflop.REGISTRY)} tables to {sys.argv[1]}")
+    else:
+        preflop.dump(sys.stdout)
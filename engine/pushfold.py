@@ -0,0 +1,243 @@
+"""
+Heads-up push/fold Nash charts.
+
+When blinds are high relative to stacks, heads-up pre-flop play reduces to
+the small blind shoving or folding and the big blind calling or folding.
+build_charts() solves that game for a grid of effective stack depths:
+
+    1. a 169x169 all-in equity matrix between starting hand classes
+       (vectorized Monte Carlo, card removal handled by sampling disjoint combos)
+    2. fictitious play between push and call strategies at every depth at
+       once, weighting class matchups by how many disjoint combo pairs they have
+
+The result is saved as two small boolean tables (depth x hand class) and
+looked up in O(1). Any Brain can call push_fold_action(game_state), which
+returns an action when the spot is a heads-up shove/fold decision below the
+stack threshold and None otherwise.
+
+    python -m engine.pushfold   # rebuild engine/pushfold_charts.npz
+"""
+import os
+
+import numpy as np
+
+from engine.equity import COMBO_CARDS, COMBO_MASKS, COMBOS, NUM_COMBOS
+from engine.vector_eval import FULL_DECK, evaluate
+
+RANKS = "23456789TJQKA"
+NUM_CLASSES = 169
+CHART_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pushfold_charts.npz")
+DEFAULT_DEPTHS = np.arange(1.0, 25.5, 0.5)
+MAX_STACK_BB = 15
+
+_charts = None
+
+
+def _grid_index(high, low, suited):
+    """13x13 chart cell: pairs on the diagonal, suited above it, offsuit below."""
+    if high == low:
+        return high * 13 + high
+    return high * 13 + low if suited else low * 13 + high
+
+
+def hand_class(card1, card2):
+    """Index 0..168 of the starting hand class of two treys cards."""
+    r1, r2 = (card1 >> 8) & 0xF, (card2 >> 8) & 0xF
+    suited = ((card1 >> 12) & 0xF) == ((card2 >> 12) & 0xF)
+    return _grid_index(max(r1, r2), min(r1, r2), suited)
+
+
+def class_name(index):
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANKS[row] * 2
+    if row > col:
+        return RANKS[row] + RANKS[col] + "s"
+    return RANKS[col] + RANKS[row] + "o"
+
+
+_ranks = COMBOS // 4
+COMBO_CLASSES = np.array([_grid_index(max(a, b), min(a, b), s) for a, b, s in
+                          zip(_ranks[:, 0], _ranks[:, 1], COMBOS[:, 0] % 4 == COMBOS[:, 1] % 4)])
+
+
+def matchup_weights():
+    """Number of disjoint combo pairs for every (class, class) matchup."""
+    onehot = np.zeros((NUM_COMBOS, NUM_CLASSES))
+    onehot[np.arange(NUM_COMBOS), COMBO_CLASSES] = 1
+    disjoint = ((COMBO_MASKS[:, None] & COMBO_MASKS[None, :]) == 0).astype(float)
+    return onehot.T @ disjoint @ onehot
+
+
+def equity_matrix(samples=400, seed=0):
+    """
+    All-in pre-flop equity of every hand class against every other.
+
+    Returns:
+        (169, 169) array; entry [i, j] is class i's equity against class j
+    """
+    rng = np.random.default_rng(seed)
+    counts = np.bincount(COMBO_CLASSES, minlength=NUM_CLASSES)
+    members = np.zeros((NUM_CLASSES, counts.max()), dtype=np.intp)
+    for cls in range(NUM_CLASSES):
+        members[cls, :counts[cls]] = np.nonzero(COMBO_CLASSES == cls)[0]
+
+    first, second = np.triu_indices(NUM_CLASSES)
+    n = len(first)
+    rows = np.arange(n)
+    won = np.zeros(n)
+    for _ in range(samples):
+        a = members[first, (rng.random(n) * counts[first]).astype(np.intp)]
+        b = members[second, (rng.random(n) * counts[second]).astype(np.intp)]
+        clash = (COMBO_MASKS[a] & COMBO_MASKS[b]) != 0
+        while clash.any():
+            b[clash] = members[second[clash], (rng.random(clash.sum()) * counts[second[clash]]).astype(np.intp)]
+            clash = (COMBO_MASKS[a] & COMBO_MASKS[b]) != 0
+
+        keys = rng.random((n, 52))
+        keys[rows[:, None], COMBOS[a]] = 2.0
+        keys[rows[:, None], COMBOS[b]] = 2.0
+        board = FULL_DECK[np.argpartition(keys, 5, axis=1)[:, :5]]
+        ours = evaluate(np.concatenate([COMBO_CARDS[a], board], axis=1))
+        theirs = evaluate(np.concatenate([COMBO_CARDS[b], board], axis=1))
+        won += (ours < theirs) + 0.5 * (ours == theirs)
+
+    equity = np.empty((NUM_CLASSES, NUM_CLASSES))
+    equity[first, second] = won / samples
+    equity[second, first] = 1.0 - won / samples
+    equity[np.arange(NUM_CLASSES), np.arange(NUM_CLASSES)] = 0.5
+    return equity
+
+
+def solve(equity, weights, depths, iterations=500):
+    """
+    Fictitious play for the push/fold game at every depth (in big blinds).
+
+    Payoffs are in big blinds for the small blind: fold -0.5, push and
+    fold +1, push and call depth * (2 * equity - 1).
+
+    Returns:
+        (push, call) frequency arrays of shape (len(depths), 169)
+    """
+    called = np.asarray(depths)[:, None, None] * (2.0 * equity[None] - 1.0)
+    class_weight = weights.sum(axis=1)
+    push = np.ones((len(depths), NUM_CLASSES))
+    call = np.ones((len(depths), NUM_CLASSES))
+    for k in range(1, iterations + 1):
+        pushed = weights[None] * push[:, :, None]
+        call_ev = -(pushed * called).sum(axis=1)
+        fold_ev = -pushed.sum(axis=1)
+        best_call = (call_ev > fold_ev).astype(float)
+
+        push_ev = (weights[None] * (call[:, None, :] * called + (1.0 - call[:, None, :]))).sum(axis=2) / class_weight
+        best_push = (push_ev > -0.5).astype(float)
+
+        push += (best_push - push) / (k + 1)
+        call += (best_call - call) / (k + 1)
+    return push, call
+
+
+class PushFoldCharts:
+    def __init__(self, depths, push, call):
+        """
+        Args:
+            depths: Evenly spaced effective stacks in big blinds
+            push, call: Boolean arrays (len(depths), 169)
+        """
+        self.depths = np.asarray(depths, dtype=float)
+        self.push_table = np.asarray(push, dtype=bool)
+        self.call_table = np.asarray(call, dtype=bool)
+        self.step = self.depths[1] - self.depths[0] if len(self.depths) > 1 else 1.0
+
+    @classmethod
+    def load(cls, path=CHART_PATH):
+        data = np.load(path)
+        return cls(data["depths"], data["push"], data["call"])
+
+    def save(self, path=CHART_PATH):
+        np.savez_compressed(path, depths=self.depths, push=self.push_table, call=self.call_table)
+
+    def _depth(self, stack_bb):
+        i = int(round((stack_bb - self.depths[0]) / self.step))
+        return min(max(i, 0), len(self.depths) - 1)
+
+    def should_push(self, hand, stack_bb):
+        return bool(self.push_table[self._depth(stack_bb), hand_class(*hand)])
+
+    def should_call(self, hand, stack_bb):
+        return bool(self.call_table[self._depth(stack_bb), hand_class(*hand)])
+
+    def print_chart(self, stack_bb):
+        """13x13 grid for one depth (suited above the diagonal): P = push, C = call, B = both."""
+        d = self._depth(stack_bb)
+        print(f"Push/fold chart at {self.depths[d]:g} BB")
+        print("   " + "  ".join(RANKS[::-1]))
+        for row in range(12, -1, -1):
+            cells = []
+            for col in range(12, -1, -1):
+                p, c = self.push_table[d, row * 13 + col], self.call_table[d, row * 13 + col]
+                cells.append("B" if p and c else "P" if p else "C" if c else ".")
+            print(f"{RANKS[row]}  " + "  ".join(cells))
+
+
+def build_charts(depths=DEFAULT_DEPTHS, samples=400, iterations=500, seed=0):
+    equity = equity_matrix(samples, seed)
+    push, call = solve(equity, matchup_weights(), depths, iterations)
+    return PushFoldCharts(depths, push >= 0.5, call >= 0.5)
+
+
+def charts():
+    """The saved charts, loaded once."""
+    global _charts
+    if _charts is None:
+        _charts = PushFoldCharts.load()
+    return _charts
+
+
+def push_fold_action(game_state, max_stack_bb=MAX_STACK_BB):
+    """
+    Chart action for heads-up pre-flop shove/fold spots, or None.
+
+    Covers the small blind acting first with only the blinds posted, and the
+    big blind facing an all-in, when the effective stack is at most
+    max_stack_bb big blinds.
+    """
+    if game_state["street"] != "pre-flop" or game_state["num_active_players"] != 2:
+        return None
+    player = game_state["player"]
+    opponent = next((o for o in game_state["opponents"] if o["is_active"]), None)
+    if opponent is None or not player["hand"]:
+        return None
+
+    big_blind = game_state["big_blind"]
+    effective = min(player["stack"] + player["current_bet"], opponent["stack"] + opponent["current_bet"]) / big_blind
+    if effective > max_stack_bb:
+        return None
+
+    valid_actions = game_state["valid_actions"]
+    to_call = game_state["amount_to_call"]
+    if player["is_small_blind"] and to_call > 0 and game_state["current_bet"] <= big_blind:
+        if charts().should_push(player["hand"], effective):
+            if "raise" in valid_actions:
+                return {"action": "raise", "amount": player["stack"]}
+            return {"action": "call"}
+        return {"action": "fold"}
+
+    if player["is_big_blind"] and to_call > 0 and opponent["is_all_in"]:
+        if charts().should_call(player["hand"], effective):
+            return {"action": "call"}
+        return {"action": "fold"}
+    return None
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.time()
+    built = build_charts()
+    built.save()
+    print(f"Built and saved {CHART_PATH} in {time.time() - start:.1f}s")
+    for depth in (5, 10, 15):
+        built.print_chart(depth)
+        print(f"  push {built.push_table[built._depth(depth)].sum()} classes, "
+              f"call {built.call_table[built._depth(depth)].sum()} classes\n")
@@ -0,0 +1,289 @@
+"""
+Bayesian tracking of each opponent's hole cards over the 1326 combos.
+
+Every opponent starts a hand with a uniform range minus the cards we can see.
+Each observed action multiplies the range by the likelihood of that action
+given each combo's hand strength on the current board:
+
+    weights *= LIKELIHOODS[action][features]
+
+Strength features are precomputed once per board (pre-flop all-in equity
+percentile, or the percentile of the made hand on the flop, turn and river),
+quantized to 256 levels, so an update is a single gather and multiply.
+
+Bots that only see game_state can call observe_game_state(), which infers
+opponents' actions from how their bets changed between decisions. Anything
+with a full action feed can call observe() directly.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from engine.equity import (COMBO_CARDS, COMBO_MASKS, COMBOS, NUM_COMBOS, board_ranks,
+                           cards_mask, remove_blocked)
+from engine.vector_eval import FULL_DECK, evaluate
+
+LEVELS = 256
+
+# action -> (strength threshold, slope, floor) of a logistic likelihood curve;
+# a negative slope makes the action more likely with weaker hands
+ACTION_MODELS = {
+    "check": (0.75, -8.0, 0.25),
+    "call": (0.35, 8.0, 0.15),
+    "bet": (0.60, 10.0, 0.10),
+    "raise": (0.70, 12.0, 0.05),
+}
+
+_FEATURE_CACHE_SIZE = 64
+_feature_cache = OrderedDict()
+_preflop_features = None
+
+
+def likelihood_tables(models=None):
+    """Likelihood of each action at each of the LEVELS strength levels."""
+    strength = (np.arange(LEVELS) + 0.5) / LEVELS
+    tables = {}
+    for action, (threshold, slope, floor) in (models or ACTION_MODELS).items():
+        curve = 1.0 / (1.0 + np.exp(-slope * (strength - threshold)))
+        tables[action] = floor + (1.0 - floor) * curve
+    return tables
+
+
+def _percentile_levels(scores, valid):
+    """Quantized percentile (0 = weakest) of each combo's score among valid combos."""
+    order = np.argsort(np.where(valid, scores, -np.inf), kind="stable")
+    pct = np.empty(NUM_COMBOS)
+    pct[order] = np.arange(NUM_COMBOS)
+    first_valid = NUM_COMBOS - valid.sum()
+    pct = (pct - first_valid + 0.5) / max(1, valid.sum())
+    return np.clip(pct * LEVELS, 0, LEVELS - 1).astype(np.uint8)
+
+
+def preflop_features(samples=2000, seed=0):
+    """
+    Pre-flop strength level of every combo: percentile of its all-in equity
+    against one random hand, computed once per hand class and cached.
+    """
+    global _preflop_features
+    if _preflop_features is not None:
+        return _preflop_features
+
+    rng = np.random.default_rng(seed)
+    ranks = COMBOS // 4
+    suited = (COMBOS[:, 0] % 4) == (COMBOS[:, 1] % 4)
+    classes = ranks[:, 1] * 26 + ranks[:, 0] * 2 + suited
+    equity = np.empty(NUM_COMBOS)
+    for cls in np.unique(classes):
+        members = np.nonzero(classes == cls)[0]
+        combo = members[0]
+        hero = COMBO_CARDS[combo]
+        rest = np.nonzero(((COMBO_MASKS[combo] >> np.arange(52)) & 1) == 0)[0]
+        draw = np.argpartition(rng.random((samples, len(rest))), 7, axis=1)[:, :7]
+        cards = FULL_DECK[rest[draw]]
+        board = cards[:, 2:]
+        ours = evaluate(np.concatenate([np.tile(hero, (samples, 1)), board], axis=1))
+        theirs = evaluate(np.concatenate([cards[:, :2], board], axis=1))
+        equity[members] = np.mean((ours < theirs) + 0.5 * (ours == theirs))
+
+    _preflop_features = _percentile_levels(equity, np.ones(NUM_COMBOS, dtype=bool))
+    return _preflop_features
+
+
+def board_features(board):
+    """Made-hand strength level of every combo on a 3, 4 or 5 card board (cached)."""
+    if not board:
+        return preflop_features()
+    key = tuple(sorted(board))
+    features = _feature_cache.get(key)
+    if features is not None:
+        _feature_cache.move_to_end(key)
+        return features
+
+    valid = (COMBO_MASKS & cards_mask(board)) == 0
+    if len(board) == 5:
+        ranks = board_ranks(list(board))
+    else:
+        cards = np.concatenate([COMBO_CARDS, np.tile(np.array(board, dtype=np.int64), (NUM_COMBOS, 1))], axis=1)
+        ranks = evaluate(cards)
+    # Lower treys rank is stronger
+    features = _percentile_levels(-ranks.astype(float), valid)
+    _feature_cache[key] = features
+    if len(_feature_cache) > _FEATURE_CACHE_SIZE:
+        _feature_cache.popitem(last=False)
+    return features
+
+
+class RangeTracker:
+    def __init__(self, models=None):
+        """
+        Initialize the tracker.
+
+        Args:
+            models: Optional replacement for ACTION_MODELS
+        """
+        self.likelihoods = likelihood_tables(models)
+        self.board_likelihoods = OrderedDict()  # board -> {action: per-combo likelihood}
+        self.ranges = {}
+        self.dead_cards = []
+        self.hand_number = None
+        self.hole_cards = None
+        self.street = None
+        self.last_bets = {}
+        self.last_table_bet = 0
+
+    def reset_hand(self, names, dead_cards=()):
+        """Uniform ranges for every named opponent, minus the cards we can see."""
+        self.dead_cards = list(dead_cards)
+        start = remove_blocked(np.ones(NUM_COMBOS), self.dead_cards)
+        self.ranges = {name: start.copy() for name in names}
+
+    def remove_cards(self, cards):
+        """Drop combos using newly seen cards (e.g. the board) from every range."""
+        new = [c for c in cards if c not in self.dead_cards]
+        if not new:
+            return
+        self.dead_cards += new
+        blocked = (COMBO_MASKS & cards_mask(new)) != 0
+        for weights in self.ranges.values():
+            weights[blocked] = 0.0
+
+    def observe(self, name, action, board=()):
+        """Update an opponent's range after they take an action on this board."""
+        if name not in self.ranges:
+            return
+        if action == "fold":
+            del self.ranges[name]
+            return
+        likelihood = self._likelihoods_on(board).get(action)
+        if likelihood is None:
+            return
+        weights = self.ranges[name]
+        weights *= likelihood
+        total = weights.sum()
+        if total > 0:
+            weights /= total
+        else:
+            # Every combo ruled out: the model was wrong, start over from uniform
+            self.ranges[name] = remove_blocked(np.ones(NUM_COMBOS), self.dead_cards)
+
+    def _likelihoods_on(self, board):
+        key = tuple(sorted(board))
+        cached = self.board_likelihoods.get(key)
+        if cached is None:
+            features = board_features(list(board))
+            cached = {action: table[features] for action, table in self.likelihoods.items()}
+            self.board_likelihoods[key] = cached
+            if len(self.board_likelihoods) > 8:
+                self.board_likelihoods.popitem(last=False)
+        return cached
+
+    def reset(self):
+        """Forget every hand observed so far (board likelihood caches are kept)."""
+        self.ranges = {}
+        self.dead_cards = []
+        self.hand_number = None
+        self.hole_cards = None
+        self.street = None
+        self.last_bets = {}
+        self.last_table_bet = 0
+
+    def range(self, name):
+        """Normalized 1326-entry weights for an opponent (uniform if unknown)."""
+        weights = self.ranges.get(name)
+        if weights is None:
+            weights = remove_blocked(np.ones(NUM_COMBOS), self.dead_cards)
+        return weights / weights.sum()
+
+    def observe_game_state(self, game_state):
+        """
+        Infer opponents' actions since our last decision from game_state.
+
+        Bet increases become calls, bets or raises and newly inactive
+        opponents fold. Checks are inferred for opponents who acted before us
+        on an unbet street. Actions taken after our last decision on an
+        earlier street are not visible and are skipped.
+        """
+        board = list(game_state.get("community_cards", []))
+        opponents = game_state["opponents"]
+        street = game_state["street"]
+        table_bet = game_state["current_bet"]
+        num_players = game_state["num_players"]
+        button = game_state["button_position"]
+
+        hole_cards = list(game_state["player"]["hand"])
+        # Hand numbers are per table, so a player moved to another table (MTT)
+        # can see the same number again; new hole cards also start a new hand
+        if game_state["hand_number"] != self.hand_number or hole_cards != self.hole_cards:
+            self.hand_number = game_state["hand_number"]
+            self.hole_cards = hole_cards
+            self.street = None
+            self.reset_hand([o["name"] for o in opponents], hole_cards + board)
+        self.remove_cards(board)
+
+        first_look = street != self.street
+        if first_look:
+            self.street = street
+            if street == "pre-flop":
+                # Blinds are forced, not actions
+                blind_bets = {button: game_state["small_blind"], (button + 1) % num_players: game_state["big_blind"]}
+                self.last_bets = {o["name"]: min(blind_bets.get(o["position"], 0), o["current_bet"] + o["stack"])
+                                  for o in opponents}
+                self.last_table_bet = game_state["big_blind"]
+            else:
+                self.last_bets = {o["name"]: 0 for o in opponents}
+                self.last_table_bet = 0
+
+        start = (button + (2 if street == "pre-flop" else 1)) % num_players
+        before_us = (game_state["player"]["position"] - start) % num_players
+        running_bet = self.last_table_bet
+        # Replay bet changes in acting order so raises are judged against earlier bets
+        for opp in sorted(opponents, key=lambda o: (o["position"] - start) % num_players):
+            name = opp["name"]
+            if name not in self.ranges:
+                continue
+            if not opp["is_active"]:
+                self.observe(name, "fold")
+                continue
+            previous = self.last_bets.get(name, 0)
+            if opp["current_bet"] > previous:
+                if opp["current_bet"] > running_bet:
+                    self.observe(name, "bet" if running_bet == 0 else "raise", board)
+                    running_bet = opp["current_bet"]
+                else:
+                    self.observe(name, "call", board)
+            elif (first_look and street != "pre-flop" and table_bet == 0 and opp["stack"] > 0
+                  and (opp["position"] - start) % num_players < before_us):
+                self.observe(name, "check", board)
+
+        self.last_bets = {o["name"]: o["current_bet"] for o in opponents}
+        self.last_table_bet = table_bet
+
+
+if __name__ == "__main__":
+    import time
+    from treys import Card
+
+    tracker = RangeTracker()
+    hand = [Card.new("Ah"), Card.new("Kd")]
+    board = [Card.new("2c"), Card.new("7h"), Card.new("Ts")]
+    start = time.perf_counter()
+    tracker.reset_hand(["villain"], hand + board)
+    tracker.observe("villain", "call")
+    tracker.observe("villain", "call", board)
+    print(f"First pre-flop and flop updates (builds features): {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    for _ in range(2500):
+        tracker.reset_hand(["villain"], hand + board)
+        for action in ("raise", "bet", "call", "check"):
+            tracker.observe("villain", action, board)
+    elapsed = time.perf_counter() - start
+    print(f"{1e6 * elapsed / 10000:.1f} µs per update (including a reset every 4)")
+
+    tracker.reset_hand(["villain"], hand + board)
+    tracker.observe("villain", "raise")
+    tracker.observe("villain", "bet", board)
+    weights = tracker.range("villain")
+    top = np.argsort(weights)[::-1][:10]
+    print("Most likely after pre-flop raise and flop bet:",
+          ", ".join(Card.int_to_str(int(a)) + Card.int_to_str(int(b)) for a, b in COMBO_CARDS[top]))
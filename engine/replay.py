@@ -0,0 +1,352 @@
+"""
+Re-run recorded decisions against new bot versions.
+
+replay() streams a hand history (engine/hand_history.py), rebuilds the
+game_state of every recorded decision point exactly as PokerGame built it
+and asks one or more brains what they would do. The recorded hand then
+continues as it was played, so every brain sees the same decision points:
+
+    report = replay("histories/run1", {"old": OldGeminiBot, "new": GeminiBot},
+                    players=["Gemini"])
+    report.print_report()
+
+For each brain the report has the number of decisions whose effective action
+or chips put in differ from the recording (what the engine would have done
+with the brain's answer, so a call of nothing is a check), broken down by
+street, a sample of the differing decisions, and the latency distribution of
+get_action().
+
+Brains that override Brain.observe get the hand's table events rebuilt from
+the history, and reset_for_game()/reset_for_hand() are called at the same
+points as in a live game, so stateful bots see the game they would have
+seen. The random module is reseeded before every decision, identically for
+every brain. Hands are split into batches at game boundaries and replayed on
+a process pool, so brain classes must be importable.
+"""
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+import time
+
+import numpy as np
+
+from engine.game import EVALUATOR, PokerGame, effective_action, observes
+from engine.hand_history import ACTIONS, STREETS, HandHistory, card_ints, chips
+from engine.player import Player
+
+_BOARD_SIZES = {"pre-flop": 0, "flop": 3, "turn": 4, "river": 5}
+
+
+class _Seat(Player):
+    """Player on the replay table; brains are queried directly, never through the seat."""
+
+    def __init__(self, name, stack, hand):
+        super().__init__(name, None, stack)
+        self.hand = hand
+        self.is_active = True
+        self.current_bet = 0
+
+
+class ReplayTable:
+    """
+    One recorded hand, stepped action by action on a scratch PokerGame so
+    game_state() is built by the engine itself.
+    """
+
+    def __init__(self):
+        self.game = PokerGame([], verbose=False, seed=0, decisions=None)
+        self.board = []
+
+    def start(self, history, hand):
+        """Deal the hand's seats and post the blinds like PokerGame.post_blinds."""
+        game = self.game
+        record = history.hands[hand]
+        game.players = [_Seat(history.players[s["player"]], chips(s["stack"]), card_ints(s["hole"]))
+                        for s in history.hand_seats(hand)]
+        game.hand_number = int(record["hand_number"])
+        game.button_position = int(record["button"])
+        game.small_blind = int(record["small_blind"])
+        game.big_blind = int(record["big_blind"])
+        game.community_cards = []
+        game.hand_ranks = {}
+        game.pot = 0
+        game.current_bet = 0
+        game.current_street = None
+        self.board = card_ints(record["board"])
+        self.showdown = bool(record["showdown"])
+        self.winners = [history.players[s["player"]] for s in history.hand_seats(hand) if s["winner"]]
+        self.street_index = -1
+        game.post_blinds()
+        return game
+
+    def next_street(self):
+        """Deal the next street; the betting of the previous one is over."""
+        game = self.game
+        self.street_index += 1
+        street = STREETS[self.street_index]
+        game.current_street = street
+        if self.street_index:
+            for player in game.players:
+                player.current_bet = 0
+            game.current_bet = 0
+            game.community_cards = self.board[:_BOARD_SIZES[street]]
+            game.evaluate_hands()
+        return street
+
+    def deals_left(self):
+        """Streets dealt after this one (all-in runouts have no actions)."""
+        return len([s for s in STREETS[self.street_index + 1:] if _BOARD_SIZES[s] <= len(self.board)])
+
+    def try_action(self, player, action_dict):
+        """(effective action, chips put in) that the engine would make of action_dict, without applying it."""
+        game = self.game
+        saved = (player.stack, player.current_bet, player.is_active, game.pot, game.current_bet)
+        table_bet, pot_before = game.current_bet, game.pot
+        game.process_action(player, action_dict.get("action", "fold").lower(), action_dict.get("amount", 0))
+        result = (effective_action(player.is_active, game.pot - pot_before, table_bet, game.current_bet),
+                  game.pot - pot_before)
+        player.stack, player.current_bet, player.is_active, game.pot, game.current_bet = saved
+        return result
+
+    def apply(self, player, action, amount):
+        """Replay a recorded action."""
+        game = self.game
+        if action == "fold":
+            player.is_active = False
+            return
+        player.stack -= amount
+        player.current_bet += amount
+        game.pot += amount
+        game.current_bet = max(game.current_bet, player.current_bet)
+
+
+def _emit(brains, event):
+    for brain in brains:
+        brain.observe(event)
+
+
+def _replay_batch(task):
+    """Replay hands [start, stop) of a history; returns raw per-brain results."""
+    path, start, stop, brain_classes, players, seed, max_diffs = task
+    history = HandHistory(path)
+    brains = {label: cls() for label, cls in brain_classes.items()}
+    observers = [brain for brain in brains.values() if observes(brain)]
+    latencies = {label: [] for label in brains}
+    changed = {label: defaultdict(int) for label in brains}
+    diffs = {label: [] for label in brains}
+    decisions = defaultdict(int)
+    table = ReplayTable()
+    game = table.game
+    current_game = None
+
+    for hand in range(start, stop):
+        record = history.hands[hand]
+        if record["game"] != current_game:
+            current_game = record["game"]
+            for brain in brains.values():
+                brain.reset_for_game()
+        for brain in brains.values():
+            brain.reset_for_hand()
+        table.start(history, hand)
+        seats = game.players
+        if observers:
+            _emit(observers, {"type": "hand_start", "hand_number": game.hand_number,
+                              "button_position": game.button_position, "players": [p.name for p in seats],
+                              "small_blind": game.small_blind, "big_blind": game.big_blind})
+
+        for i, a in enumerate(history.hand_actions(hand)):
+            street = STREETS[a["street"]]
+            while game.current_street != street:
+                table.next_street()
+                if observers:
+                    _emit(observers, {"type": "street", "hand_number": game.hand_number,
+                                      "street": game.current_street, "board": list(game.community_cards),
+                                      "pot": game.pot})
+            player = seats[a["seat"]]
+            action, amount = ACTIONS[a["action"]], chips(a["amount"])
+
+            if players is None or player.name in players:
+                decisions[street] += 1
+                for label, brain in brains.items():
+                    game_state = game.build_game_state(player)
+                    random.seed(seed * 1_000_003 + hand * 1_009 + i)
+                    t0 = time.perf_counter_ns()
+                    action_dict = brain.get_action(game_state)
+                    latencies[label].append(time.perf_counter_ns() - t0)
+                    new = table.try_action(player, action_dict)
+                    if new != (action, amount):
+                        changed[label][street] += 1
+                        if len(diffs[label]) < max_diffs:
+                            diffs[label].append((hand, int(record["game"]), game.hand_number, player.name,
+                                                 street, (action, amount), new))
+
+            table.apply(player, action, amount)
+            if observers:
+                _emit(observers, {"type": "action", "hand_number": game.hand_number, "street": street,
+                                  "player": player.name, "action": action, "amount": amount,
+                                  "to_call": chips(a["to_call"]), "current_bet": game.current_bet,
+                                  "pot": game.pot, "all_in": bool(a["all_in"])})
+
+        if observers:
+            if table.street_index < 0:
+                table.next_street()
+                _emit(observers, {"type": "street", "hand_number": game.hand_number, "street": "pre-flop",
+                                  "board": [], "pot": game.pot})
+            while table.deals_left():
+                table.next_street()
+                _emit(observers, {"type": "street", "hand_number": game.hand_number,
+                                  "street": game.current_street, "board": list(game.community_cards),
+                                  "pot": game.pot})
+            if table.showdown:
+                live = [p for p in seats if p.is_active and p.hand]
+                _emit(observers, {"type": "showdown", "hand_number": game.hand_number,
+                                  "board": list(table.board), "hands": {p.name: list(p.hand) for p in live},
+                                  "ranks": {p.name: EVALUATOR.evaluate(table.board, p.hand) for p in live},
+                                  "winners": table.winners, "pot": game.pot})
+            _emit(observers, {"type": "hand_end", "hand_number": game.hand_number,
+                              "winners": table.winners, "pot": game.pot})
+
+    return {
+        "decisions": dict(decisions),
+        "latencies": {label: np.array(values, dtype=np.int64) for label, values in latencies.items()},
+        "changed": {label: dict(counts) for label, counts in changed.items()},
+        "diffs": diffs,
+    }
+
+
+def _batches(history, batch_hands, max_hands=None):
+    """[start, stop) hand ranges of about batch_hands hands, cut at game boundaries."""
+    games = history.hands["game"][:max_hands]
+    if not len(games):
+        return []
+    starts = np.flatnonzero(np.diff(games)) + 1
+    bounds = [0]
+    for start in starts:
+        if start - bounds[-1] >= batch_hands:
+            bounds.append(int(start))
+    bounds.append(len(games))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+class ReplayReport:
+    def __init__(self, labels):
+        self.labels = list(labels)
+        self.decisions = defaultdict(int)  # street -> decision points replayed
+        self.latencies = {label: [] for label in self.labels}  # nanoseconds per get_action()
+        self.changed = {label: defaultdict(int) for label in self.labels}  # street -> differing decisions
+        self.diffs = {label: [] for label in self.labels}
+        self.elapsed = 0.0
+
+    def add(self, result, max_diffs):
+        for street, count in result["decisions"].items():
+            self.decisions[street] += count
+        for label in self.labels:
+            self.latencies[label].append(result["latencies"][label])
+            for street, count in result["changed"][label].items():
+                self.changed[label][street] += count
+            self.diffs[label].extend(result["diffs"][label][:max_diffs - len(self.diffs[label])])
+
+    @property
+    def total_decisions(self):
+        return sum(self.decisions.values())
+
+    def latency(self, label):
+        """All get_action() latencies of a brain, in seconds."""
+        values = self.latencies[label]
+        return np.concatenate(values) / 1e9 if values else np.empty(0)
+
+    def change_rate(self, label):
+        total = self.total_decisions
+        return sum(self.changed[label].values()) / total if total else 0.0
+
+    def print_report(self, examples=5):
+        total = self.total_decisions
+        print(f"\n{'='*60}")
+        print(f"REPLAY: {total:,} decisions in {self.elapsed:.1f}s")
+        print(f"{'='*60}")
+        print(f"{'Brain':<16} {'Changed':>9} {'Rate':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        print("-" * 70)
+        for label in self.labels:
+            latency = self.latency(label) * 1e3
+            p50, p95, p99 = np.percentile(latency, [50, 95, 99]) if len(latency) else (0, 0, 0)
+            print(f"{label:<16} {sum(self.changed[label].values()):>9,} {self.change_rate(label):>6.1%} "
+                  f"{p50:>8.3f} {p95:>8.3f} {p99:>8.3f} {latency.max() if len(latency) else 0:>8.3f}")
+
+        for label in self.labels:
+            if not self.changed[label]:
+                continue
+            by_street = ", ".join(f"{street} {self.changed[label].get(street, 0)}/{self.decisions[street]}"
+                                  for street in STREETS if self.decisions.get(street))
+            print(f"\n{label} changed decisions by street: {by_street}")
+            for hand, game_number, hand_number, name, street, old, new in self.diffs[label][:examples]:
+                print(f"  hand {hand} (game {game_number} #{hand_number}) {name} {street}: "
+                      f"{old[0]} {old[1]} -> {new[0]} {new[1]}")
+        print(f"{'='*60}\n")
+
+
+def replay(path, brains, players=None, workers=None, seed=0, batch_hands=2000, max_hands=None,
+           max_diffs=1000, verbose=True):
+    """
+    Replay a recorded history against brains.
+
+    Args:
+        path: Hand-history directory
+        brains: Dict label -> brain class, or a list of brain classes
+        players: Names whose decisions are replayed (None = every seat)
+        workers: Worker processes (None = one per CPU, 1 = run inline)
+        seed: Base seed for the random module before each decision
+        batch_hands: Hands per batch (batches end at game boundaries)
+        max_hands: Replay only the first max_hands hands
+        max_diffs: Differing decisions kept per brain
+        verbose: Print batch progress
+
+    Returns:
+        ReplayReport
+    """
+    if not isinstance(brains, dict):
+        brains = {cls.__name__: cls for cls in brains}
+    players = set(players) if players is not None else None
+    history = HandHistory(path)
+    batches = _batches(history, batch_hands, max_hands)
+    del history
+    tasks = [(path, start, stop, brains, players, seed, max_diffs) for start, stop in batches]
+    workers = workers if workers is not None else os.cpu_count() or 1
+
+    report = ReplayReport(brains)
+    start_time = time.perf_counter()
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = pool.map(_replay_batch, tasks)
+            for done, result in enumerate(results, 1):
+                report.add(result, max_diffs)
+                if verbose:
+                    print(f"Batch {done}/{len(tasks)}: {report.total_decisions:,} decisions")
+    else:
+        for done, task in enumerate(tasks, 1):
+            report.add(_replay_batch(task), max_diffs)
+            if verbose:
+                print(f"Batch {done}/{len(tasks)}: {report.total_decisions:,} decisions")
+    report.elapsed = time.perf_counter() - start_time
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description="Replay a hand history against brains")
+    parser.add_argument("history", help="Hand-history directory")
+    parser.add_argument("brains", nargs="+", help="Brain classes as module:Class, e.g. bots.geminiBot:GeminiBot")
+    parser.add_argument("--players", nargs="*", help="Only replay these players' decisions")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-hands", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    classes = {}
+    for spec in args.brains:
+        module, name = spec.split(":")
+        classes[name] = getattr(importlib.import_module(module), name)
+    replay(args.history, classes, players=args.players, workers=args.workers,
+           seed=args.seed, max_hands=args.max_hands).print_report()
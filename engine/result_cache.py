@@ -0,0 +1,129 @@
+"""
+Content-addressed on-disk cache of game results.
+
+Entries are small JSON files named by their key, a SHA-256 hex digest, and
+sharded by its first two characters:
+
+    cache/3f/3fa4...e1.json
+
+Keys are built by the caller from everything that determines a result (see
+TournamentSimulator.cache_config: fingerprints of every engine module and data
+file and of each seated bot's source, seating, stacks and the game seed), so
+an entry never needs invalidating; entries whose code changed simply stop
+being asked for and age out.
+
+The cache is bounded by total size: when a put() takes it over max_bytes,
+the least recently used entries (by last get() or put(), carried across
+runs in the files' mtimes) are deleted until it is back under 90% of the
+limit. Writes go through a temporary file and os.replace(), so readers and
+crashed runs never see partial entries.
+
+    cache = ResultCache("result_cache")
+    result = cache.get(key)
+    if result is None:
+        cache.put(key, play(...))
+"""
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def content_key(*parts):
+    """Key for JSON-serializable parts."""
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Open (or create) a cache directory.
+
+        Args:
+            path: Cache directory
+            max_bytes: Total entry size above which old entries are evicted
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.sizes = {}  # key -> bytes on disk
+        self.used = {}   # key -> last use time
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        for shard in os.scandir(path):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    key = entry.name[:-5]
+                    self.sizes[key] = stat.st_size
+                    self.used[key] = stat.st_mtime
+                    self.total += stat.st_size
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __contains__(self, key):
+        return key in self.sizes
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], key + ".json")
+
+    def get(self, key):
+        """Cached value, or None."""
+        if key not in self.sizes:
+            self.misses += 1
+            return None
+        path = self._file(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Deleted or damaged behind our back
+            self._forget(key)
+            self.misses += 1
+            return None
+        self.used[key] = time.time()
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        data = json.dumps(value).encode()
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.total += len(data) - self.sizes.get(key, 0)
+        self.sizes[key] = len(data)
+        self.used[key] = time.time()
+        if self.total > self.max_bytes:
+            self.evict(int(self.max_bytes * 0.9))
+
+    def evict(self, target_bytes):
+        """Delete least recently used entries until the cache holds at most target_bytes."""
+        for key in sorted(self.used, key=self.used.get):
+            if self.total <= target_bytes:
+                break
+            try:
+                os.remove(self._file(key))
+            except FileNotFoundError:
+                pass
+            self._forget(key)
+            self.evictions += 1
+
+    def _forget(self, key):
+        self.total -= self.sizes.pop(key, 0)
+        self.used.pop(key, None)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
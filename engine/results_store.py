@@ -0,0 +1,303 @@
+"""
+SQLite store for tournament results.
+
+Tables:
+
+    runs           one row per run: name, players, settings, timing
+    games          one row per game: seed, hands played, winner, matchup
+    game_players   one row per player per game: bot, finishing place, stack
+    player_totals  per run and player: games, wins, summed places
+
+matchup is the sorted, "|"-joined bot names of a game's table, so games
+between the same bots can be found whatever the seating. There are indexes
+by run, by bot and by matchup.
+
+Writes are queued and applied by a background thread in batched
+transactions (WAL journal, one commit per batch), so record_game() only
+costs the simulation a queue put; player_totals is upserted once per batch.
+Queries run on the caller's own connection after waiting for queued writes.
+
+    store = ResultsStore("results.db")
+    run_id = store.start_run("nightly", ["Noah", "Gemini"], starting_stack=2500)
+    store.record_game(run_id, 1, [("Gemini", "GeminiBot", 5000), ("Noah", "FirstBot", 0)])
+    store.finish_run(run_id, elapsed=12.5)
+    store.standings(run_id)
+    store.close()
+"""
+from collections import defaultdict
+from concurrent.futures import Future
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    name TEXT,
+    started REAL,
+    finished REAL,
+    elapsed REAL,
+    games INTEGER DEFAULT 0,
+    players TEXT,
+    starting_stack INTEGER,
+    seed INTEGER,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS games (
+    run_id INTEGER NOT NULL,
+    game_num INTEGER NOT NULL,
+    seed INTEGER,
+    hands INTEGER,
+    winner TEXT,
+    matchup TEXT,
+    PRIMARY KEY (run_id, game_num)
+);
+CREATE TABLE IF NOT EXISTS game_players (
+    run_id INTEGER NOT NULL,
+    game_num INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    bot TEXT,
+    place INTEGER,
+    stack REAL
+);
+CREATE TABLE IF NOT EXISTS player_totals (
+    run_id INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    bot TEXT,
+    games INTEGER,
+    wins INTEGER,
+    place_sum INTEGER,
+    PRIMARY KEY (run_id, player)
+);
+CREATE INDEX IF NOT EXISTS games_by_matchup ON games (matchup, run_id);
+CREATE INDEX IF NOT EXISTS game_players_by_run ON game_players (run_id, game_num);
+CREATE INDEX IF NOT EXISTS game_players_by_bot ON game_players (bot, run_id);
+CREATE INDEX IF NOT EXISTS player_totals_by_bot ON player_totals (bot);
+"""
+
+_STOP = object()
+
+
+def matchup_key(bots):
+    return "|".join(sorted(bots))
+
+
+class ResultsStore:
+    def __init__(self, path, batch_size=5000):
+        """
+        Open (or create) a results database.
+
+        Args:
+            path: SQLite file
+            batch_size: Most queued writes applied in one transaction
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._error = None
+        with sqlite3.connect(path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        self._reader = sqlite3.connect(path)
+        self._reader.row_factory = sqlite3.Row
+        self._thread = threading.Thread(target=self._writer, name="results-writer", daemon=True)
+        self._thread.start()
+
+    # Writes (queued)
+
+    def start_run(self, name, players, starting_stack=None, seed=None, config=None):
+        """Create a run and return its id (waits for the writer)."""
+        future = Future()
+        self._put(("run", (name, time.time(), json.dumps(list(players)), starting_stack, seed,
+                           json.dumps(config or {})), future))
+        return future.result()
+
+    def record_game(self, run_id, game_num, results, seed=None, hands=None):
+        """
+        Queue one game's results.
+
+        Args:
+            run_id: Run from start_run()
+            game_num: Game number within the run
+            results: (player, bot, final stack) from winner to first eliminated
+            seed: Game seed
+            hands: Hands played
+        """
+        self._put(("game", run_id, game_num, seed, hands, results))
+
+    def finish_run(self, run_id, elapsed=None):
+        self._put(("finish", run_id, time.time(), elapsed))
+
+    def rewind_run(self, run_id, games):
+        """Forget a run's games after the first `games` (e.g. when resuming from a checkpoint)."""
+        self._put(("rewind", run_id, games))
+
+    def _put(self, item):
+        if self._error is not None:
+            raise RuntimeError("Results writer failed") from self._error
+        self._queue.put(item)
+
+    def flush(self):
+        """Wait until every queued write is committed."""
+        self._queue.join()
+        if self._error is not None:
+            raise RuntimeError("Results writer failed") from self._error
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            # Stop the writer and close the connections even after a writer error
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Writer thread
+
+    def _writer(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            try:
+                if self._error is None and batch:
+                    with conn:
+                        runs = self._apply(conn, batch)
+                    # Run ids are only handed out once their rows are committed
+                    for future, run_id in runs:
+                        future.set_result(run_id)
+            except Exception as e:
+                self._error = e
+            finally:
+                if self._error is not None:
+                    # Nothing is written after a failure; fail every start_run() waiting
+                    # on this batch, including ones queued after the failing batch
+                    for item in batch:
+                        if item[0] == "run" and not item[2].done():
+                            item[2].set_exception(self._error)
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                conn.close()
+                return
+
+    def _apply(self, conn, batch):
+        """Write a batch in the caller's transaction; returns (future, run id) of the runs it created."""
+        new_runs = []
+        games = []
+        players = []
+        totals = {}  # (run_id, player) -> [bot, games, wins, place_sum]
+
+        def write_games():
+            conn.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?)", games)
+            conn.executemany("INSERT INTO game_players VALUES (?, ?, ?, ?, ?, ?)", players)
+            conn.executemany(
+                "INSERT INTO player_totals VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (run_id, player) DO UPDATE SET games = games + excluded.games, "
+                "wins = wins + excluded.wins, place_sum = place_sum + excluded.place_sum",
+                [(run_id, player, *total) for (run_id, player), total in totals.items()])
+            runs = defaultdict(int)
+            for run_id, *_ in games:
+                runs[run_id] += 1
+            conn.executemany("UPDATE runs SET games = games + ? WHERE run_id = ?",
+                             [(count, run_id) for run_id, count in runs.items()])
+            games.clear()
+            players.clear()
+            totals.clear()
+
+        for item in batch:
+            kind = item[0]
+            if kind == "game":
+                _, run_id, game_num, seed, hands, results = item
+                bots = [bot for _, bot, _ in results]
+                games.append((run_id, game_num, seed, hands, results[0][0], matchup_key(bots)))
+                for place, (player, bot, stack) in enumerate(results, 1):
+                    players.append((run_id, game_num, player, bot, place, stack))
+                    total = totals.get((run_id, player))
+                    if total is None:
+                        total = totals[(run_id, player)] = [bot, 0, 0, 0]
+                    total[1] += 1
+                    total[2] += place == 1
+                    total[3] += place
+                continue
+
+            # Other writes depend on the games before them
+            write_games()
+            if kind == "run":
+                _, values, future = item
+                cursor = conn.execute("INSERT INTO runs (name, started, players, starting_stack, seed, config) "
+                                      "VALUES (?, ?, ?, ?, ?, ?)", values)
+                new_runs.append((future, cursor.lastrowid))
+            elif kind == "finish":
+                _, run_id, finished, elapsed = item
+                conn.execute("UPDATE runs SET finished = ?, elapsed = ? WHERE run_id = ?", (finished, elapsed, run_id))
+            elif kind == "rewind":
+                _, run_id, keep = item
+                conn.execute("DELETE FROM games WHERE run_id = ? AND game_num > ?", (run_id, keep))
+                conn.execute("DELETE FROM game_players WHERE run_id = ? AND game_num > ?", (run_id, keep))
+                conn.execute("DELETE FROM player_totals WHERE run_id = ?", (run_id,))
+                conn.execute("INSERT INTO player_totals SELECT run_id, player, bot, COUNT(*), SUM(place = 1), "
+                             "SUM(place) FROM game_players WHERE run_id = ? GROUP BY player", (run_id,))
+                conn.execute("UPDATE runs SET games = (SELECT COUNT(*) FROM games WHERE run_id = ?) "
+                             "WHERE run_id = ?", (run_id, run_id))
+        write_games()
+        return new_runs
+
+    # Queries
+
+    def query(self, sql, params=()):
+        """Rows of any SQL query as dicts (after pending writes)."""
+        self.flush()
+        return [dict(row) for row in self._reader.execute(sql, params)]
+
+    def runs(self, name=None):
+        if name is None:
+            return self.query("SELECT * FROM runs ORDER BY run_id")
+        return self.query("SELECT * FROM runs WHERE name = ? ORDER BY run_id", (name,))
+
+    def standings(self, run_id):
+        """Players of a run by win rate, with average finishing place."""
+        return self.query(
+            "SELECT player, bot, games, wins, 1.0 * wins / games AS win_rate, "
+            "1.0 * place_sum / games AS avg_place FROM player_totals WHERE run_id = ? "
+            "ORDER BY win_rate DESC, avg_place", (run_id,))
+
+    def bot_history(self, bot):
+        """A bot's totals in every run it played."""
+        return self.query(
+            "SELECT r.run_id, r.name, r.started, t.player, t.games, t.wins, "
+            "1.0 * t.wins / t.games AS win_rate, 1.0 * t.place_sum / t.games AS avg_place "
+            "FROM player_totals t JOIN runs r USING (run_id) WHERE t.bot = ? ORDER BY r.run_id", (bot,))
+
+    def matchup(self, bots, run_id=None):
+        """Wins and average place of each bot over games with exactly these bots at the table."""
+        sql = ("SELECT p.bot, COUNT(*) AS games, SUM(p.place = 1) AS wins, AVG(p.place) AS avg_place "
+               "FROM games g JOIN game_players p USING (run_id, game_num) WHERE g.matchup = ?")
+        params = [matchup_key(bots)]
+        if run_id is not None:
+            sql += " AND g.run_id = ?"
+            params.append(run_id)
+        return self.query(sql + " GROUP BY p.bot ORDER BY wins DESC", params)
+
+    def compare_runs(self, run_a, run_b):
+        """Per-player win rates of two runs side by side."""
+        return self.query(
+            "SELECT a.player, a.bot, 1.0 * a.wins / a.games AS win_rate_a, 1.0 * b.wins / b.games AS win_rate_b "
+            "FROM player_totals a JOIN player_totals b ON a.player = b.player AND b.run_id = ? "
+            "WHERE a.run_id = ? ORDER BY a.player", (run_b, run_a))
@@ -0,0 +1,357 @@
+"""
+Round-robin and Swiss matchup scheduling across a roster of bots.
+
+A roster is a list of (name, brain_class) like TournamentSimulator's
+player_configs. The scheduler expands it into table compositions, plays each
+composition for a number of games on a process pool (rotating seats so every
+bot sits in every position equally often) and collects a pairwise matrix:
+for each pair of bots that shared a table, how often the row bot finished
+ahead of the column bot, with a Wilson confidence interval.
+
+Game results are stored in a ResultCache (engine/result_cache.py) under the
+same per-game keys TournamentSimulator uses: the fingerprints of the engine
+(every module and data file in engine/, see engine/fingerprint.py) and of
+every seated bot, configured brains' parameters, seating, stack and game
+seed. Games whose key is cached are not replayed; compositions seating a
+brain that is not reproducible under a seed (Brain.reproducible) are always
+played.
+"""
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import itertools
+import math
+import os
+import pickle
+import random
+
+from engine.brain import BrainPool
+from engine.game import PokerGame
+from engine.player import Player
+from engine.result_cache import DEFAULT_MAX_BYTES, ResultCache, content_key
+from engine.tournament import TournamentSimulator
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score interval for a binomial proportion."""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def matchup_games(seats, games, seed):
+    """
+    Seating and seed of every game of one table composition.
+
+    Args:
+        seats: List of (seat_name, roster_name, brain_class)
+        games: Number of games
+        seed: Seed the game seeds are drawn from
+
+    Returns:
+        List of (seating, game_seed); seatings rotate so every bot plays every
+        position equally often
+    """
+    rng = random.Random(seed)
+    schedule = []
+    for game_num in range(games):
+        rotation = game_num % len(seats)
+        schedule.append((seats[rotation:] + seats[:rotation], rng.getrandbits(63)))
+    return schedule
+
+
+def play_games(schedule, starting_stack):
+    """
+    Play scheduled games like TournamentSimulator.run_tournament plays them.
+
+    Args:
+        schedule: List of (seating, game_seed) from matchup_games
+        starting_stack: Starting chips for each player
+
+    Returns:
+        One result per game in the result cache's format:
+        {"order": [[seat_name, stack], ...] winner first, "hands": hands played}
+    """
+    pool = BrainPool()
+    results = []
+    for seating, game_seed in schedule:
+        random.seed(game_seed)
+        players = [Player(seat_name, pool.acquire(seat_name, brain), starting_stack)
+                   for seat_name, _, brain in seating]
+        game = PokerGame(players, starting_stack=starting_stack, verbose=False, seed=game_seed)
+        game.play_game()
+        results.append({"order": [[p.name, p.stack] for p in game.finishing_order()],
+                        "hands": game.hand_number})
+    return results
+
+
+def play_matchup(seats, games, starting_stack, seed):
+    """
+    Play one table composition repeatedly.
+
+    Args:
+        seats: List of (seat_name, roster_name, brain_class)
+        games: Number of games to play
+        starting_stack: Starting chips for each player
+        seed: Seed for deals and for bots that use the random module
+
+    Returns:
+        List of finishing orders (roster names, winner first), one per game
+    """
+    roster_names = {seat_name: roster_name for seat_name, roster_name, _ in seats}
+    return [[roster_names[name] for name, _ in result["order"]]
+            for result in play_games(matchup_games(seats, games, seed), starting_stack)]
+
+
+def _play_games_task(task):
+    return play_games(*task)
+
+
+class ResultsMatrix:
+    """Pairwise finishing results accumulated over many games."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.ahead = defaultdict(int)   # (a, b) -> games where a finished ahead of b
+        self.shared = defaultdict(int)  # (a, b) -> games where a and b shared a table
+        self.wins = defaultdict(int)
+        self.games = defaultdict(int)
+
+    def add_order(self, order):
+        """Record one game's finishing order (winner first)."""
+        self.wins[order[0]] += 1
+        for name in set(order):
+            self.games[name] += 1
+        for i, a in enumerate(order):
+            for b in order[i + 1:]:
+                if a == b:
+                    continue
+                self.ahead[(a, b)] += 1
+                self.shared[(a, b)] += 1
+                self.shared[(b, a)] += 1
+
+    def score(self, a, b):
+        """Fraction of shared games where a finished ahead of b, or None."""
+        trials = self.shared[(a, b)]
+        return self.ahead[(a, b)] / trials if trials else None
+
+    def interval(self, a, b, z=1.96):
+        return wilson_interval(self.ahead[(a, b)], self.shared[(a, b)], z)
+
+    def overall(self, name):
+        """Average pairwise score against every opponent faced."""
+        ahead = sum(self.ahead[(name, other)] for other in self.names if other != name)
+        shared = sum(self.shared[(name, other)] for other in self.names if other != name)
+        return ahead / shared if shared else 0.0
+
+    def print_matrix(self):
+        """Print row-vs-column scores with 95% intervals."""
+        width = max(14, max(len(n) for n in self.names) + 2)
+        print(f"\n{'='*60}")
+        print("PAIRWISE RESULTS (row finished ahead of column)")
+        print(f"{'='*60}")
+        print(" " * width + "".join(f"{n[:width - 2]:<{width}}" for n in self.names))
+        for a in self.names:
+            cells = []
+            for b in self.names:
+                score = self.score(a, b) if a != b else None
+                if score is None:
+                    cells.append(f"{'-':<{width}}")
+                else:
+                    low, high = self.interval(a, b)
+                    cells.append(f"{f'{score:.2f} ±{(high - low) / 2:.2f}':<{width}}")
+            print(f"{a:<{width}}" + "".join(cells))
+
+        print(f"\n{'Rank':<6} {'Bot':<20} {'Pairwise':<10} {'Wins':<8} {'Games':<8}")
+        print("-" * 60)
+        ranked = sorted(self.names, key=self.overall, reverse=True)
+        for rank, name in enumerate(ranked, 1):
+            print(f"{rank:<6} {name:<20} {self.overall(name):<10.3f} {self.wins[name]:<8} {self.games[name]:<8}")
+        print(f"{'='*60}\n")
+
+
+class MatchupScheduler:
+    def __init__(self, roster, starting_stack=3000, games_per_matchup=50, workers=None,
+                 seed=0, cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES, verbose=True):
+        """
+        Initialize the scheduler.
+
+        Args:
+            roster: List of tuples (name, brain_class); classes must be importable
+                (defined at module level) so worker processes can load them
+            starting_stack: Starting chips for each player
+            games_per_matchup: Games played for each table composition
+            workers: Worker processes (None = one per CPU, 1 = run inline)
+            seed: Base seed; each composition derives its own seed from it
+            cache_path: Result cache directory (see engine/result_cache.py, shared
+                with TournamentSimulator), or None to disable caching
+            cache_max_bytes: Size above which least recently used results are evicted
+            verbose: Print progress
+        """
+        names = [name for name, _ in roster]
+        if len(set(names)) != len(names):
+            raise ValueError("Roster names must be unique")
+        self.roster = dict(roster)
+        self.names = names
+        self.starting_stack = starting_stack
+        self.games_per_matchup = games_per_matchup
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.seed = seed
+        self.verbose = verbose
+        self.cache = ResultCache(cache_path, cache_max_bytes) if cache_path else None
+        self._config_keys = {}
+
+    def round_robin(self, table_size=2, max_compositions=None):
+        """
+        All table compositions of table_size distinct bots.
+
+        Rosters smaller than the table are padded by repeating bots. When
+        max_compositions is set, a seeded sample is returned instead.
+        """
+        if len(self.names) >= table_size:
+            compositions = list(itertools.combinations(self.names, table_size))
+        else:
+            compositions = [tuple(itertools.islice(itertools.cycle(self.names), table_size))]
+        if max_compositions is not None and len(compositions) > max_compositions:
+            compositions = random.Random(self.seed).sample(compositions, max_compositions)
+        return compositions
+
+    def run_round_robin(self, table_size=2, max_compositions=None):
+        """Play every round-robin composition and return the ResultsMatrix."""
+        results = ResultsMatrix(self.names)
+        self.run(self.round_robin(table_size, max_compositions), results)
+        return results
+
+    def run_swiss(self, rounds):
+        """
+        Heads-up Swiss system: each round pairs bots with similar scores that
+        have not met yet. The lowest-ranked bot without a bye sits out on odd rosters.
+        """
+        results = ResultsMatrix(self.names)
+        met = set()
+        byes = set()
+        order = list(self.names)
+        random.Random(self.seed).shuffle(order)
+
+        for round_num in range(1, rounds + 1):
+            if round_num > 1:
+                order.sort(key=results.overall, reverse=True)
+            unpaired = list(order)
+            if len(unpaired) % 2:
+                bye = next((n for n in reversed(unpaired) if n not in byes), unpaired[-1])
+                byes.add(bye)
+                unpaired.remove(bye)
+
+            pairings = []
+            while unpaired:
+                a = unpaired.pop(0)
+                b = next((n for n in unpaired if frozenset((a, n)) not in met), unpaired[0])
+                unpaired.remove(b)
+                met.add(frozenset((a, b)))
+                pairings.append((a, b))
+
+            if self.verbose:
+                print(f"Swiss round {round_num}: " + ", ".join(f"{a} v {b}" for a, b in pairings))
+            self.run(pairings, results)
+        return results
+
+    def run(self, compositions, results):
+        """Play (or load from cache) every composition's games and add them to results."""
+        tasks = []
+        pending = []  # per task: (roster names by seat name, cache key of each game)
+        reused = 0
+        for composition in compositions:
+            # Seat order inside a composition is rotated anyway; canonicalize the seeds
+            composition = tuple(sorted(composition, key=self.names.index))
+            seats = self.seats(composition)
+            roster_names = {seat_name: roster_name for seat_name, roster_name, _ in seats}
+            schedule = []
+            keys = []
+            for seating, game_seed in matchup_games(seats, self.games_per_matchup,
+                                                    self.composition_seed(composition)):
+                key = self.game_key(seating, game_seed)
+                result = self.cache.get(key) if key is not None else None
+                if result is not None:
+                    reused += 1
+                    results.add_order([roster_names[name] for name, _ in result["order"]])
+                    continue
+                schedule.append((seating, game_seed))
+                keys.append(key)
+            if schedule:
+                tasks.append((schedule, self.starting_stack))
+                pending.append((roster_names, keys))
+
+        if self.verbose:
+            played = sum(len(schedule) for schedule, _ in tasks)
+            print(f"{played} games to play in {len(tasks)} matchups, {reused} reused from cache")
+
+        if self.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(self.workers) as pool:
+                outputs = list(pool.map(_play_games_task, tasks))
+        else:
+            outputs = [_play_games_task(task) for task in tasks]
+
+        for (roster_names, keys), game_results in zip(pending, outputs):
+            for key, result in zip(keys, game_results):
+                if key is not None:
+                    self.cache.put(key, result)
+                results.add_order([roster_names[name] for name, _ in result["order"]])
+        return results
+
+    def seats(self, composition):
+        """(seat_name, roster_name, brain) for each seat; repeated bots get unique seat names."""
+        seats = []
+        counts = defaultdict(int)
+        for name in composition:
+            counts[name] += 1
+            seat_name = name if counts[name] == 1 else f"{name}#{counts[name]}"
+            seats.append((seat_name, name, self.roster[name]))
+        return seats
+
+    def composition_seed(self, composition):
+        digest = hashlib.sha256(f"{self.seed}:{'|'.join(composition)}".encode()).digest()
+        return int.from_bytes(digest[:8], "little") >> 1
+
+    def game_key(self, seating, game_seed):
+        """
+        Result cache key of one game (TournamentSimulator's key for the same
+        seating, stack and seed), or None when the game cannot be cached.
+        """
+        if self.cache is None:
+            return None
+        seat_names = tuple(seat_name for seat_name, _, _ in seating)
+        if seat_names not in self._config_keys:
+            configs = [(seat_name, brain) for seat_name, _, brain in seating]
+            simulator = TournamentSimulator(configs, starting_stack=self.starting_stack)
+            config_key = None
+            if all(getattr(brain, "reproducible", True) for _, brain in configs):
+                try:
+                    config_key = content_key(*simulator.cache_config())
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    if self.verbose:
+                        print(f"Not caching {', '.join(seat_names)}: a brain cannot be pickled: {e}")
+            self._config_keys[seat_names] = (simulator, config_key)
+        simulator, config_key = self._config_keys[seat_names]
+        return simulator.game_key(config_key, game_seed) if config_key is not None else None
+
+
+if __name__ == "__main__":
+    from bots.randomBot import RandomBot
+    from bots.firstBot import FirstBot
+    from bots.chatGptBot import BestBot
+    from bots.claudeBot import ClaudeBot
+
+    roster = [
+        ("Random", RandomBot),
+        ("First", FirstBot),
+        ("ChatGPT", BestBot),
+        ("Claude", ClaudeBot),
+    ]
+    scheduler = MatchupScheduler(roster, starting_stack=1000, games_per_matchup=10,
+                                 cache_path="result_cache")
+    scheduler.run_round_robin(table_size=2).print_matrix()
+    scheduler.run_round_robin(table_size=6).print_matrix()
@@ -0,0 +1,116 @@
+"""
+Snapshots of a PokerGame's table state, for rollouts and what-if search.
+
+TableSnapshot.capture(game) copies only what the rest of the hand depends on:
+each seat's stack, bet, hole cards and flags, the pot, the undealt deck, the
+board, the button and blinds, the street and the betting cursor (whose turn it
+is within the current round). Everything is stored in tuples, so a snapshot
+is immutable and can be shared by any number of rollouts; copying happens
+only on restore(). Brains, dealers and evaluators are never copied.
+
+    snap = TableSnapshot.capture(game)        # e.g. from an observer or a brain holding the game
+    ...
+    snap.restore(game)                        # put the table back exactly
+
+    play_out(snap, policy)                    # finish the hand with policy brains
+    play_out(snap, policy, rng=random.Random(1), redeal=["Bob"])   # sampled runout and hole cards
+
+Snapshots taken at a decision point (inside get_action, or from an "action"
+event) resume the interrupted betting round exactly as PokerGame would have
+continued it; snapshots taken between rounds (a "street" event) start the
+round from the beginning.
+"""
+from engine.game import PokerGame
+from engine.player import Player
+
+
+class TableSnapshot:
+    __slots__ = ("seats", "pot", "current_bet", "board", "deck", "button_position", "small_blind",
+                 "big_blind", "hand_number", "street", "cursor", "hand_ranks")
+
+    @classmethod
+    def capture(cls, game):
+        if game.current_street is None:
+            raise ValueError("Snapshots need a hand in progress")
+        snap = cls.__new__(cls)
+        snap.seats = tuple((p.name, p.stack, p.current_bet, p.is_active, p.has_acted, tuple(p.hand))
+                           for p in game.players)
+        snap.pot = game.pot
+        snap.current_bet = game.current_bet
+        snap.board = tuple(game.community_cards)
+        snap.deck = tuple(game.dealer.deck.cards)
+        snap.button_position = game.button_position
+        snap.small_blind = game.small_blind
+        snap.big_blind = game.big_blind
+        snap.hand_number = game.hand_number
+        snap.street = game.current_street
+        snap.cursor = game.betting_cursor
+        snap.hand_ranks = tuple((p.name, rank) for p, rank in game.hand_ranks.items())
+        return snap
+
+    def restore(self, game):
+        """Put game's table back to this snapshot (seats are matched by name)."""
+        by_name = {p.name: p for p in game.players}
+        players = []
+        for name, stack, current_bet, is_active, has_acted, hand in self.seats:
+            player = by_name[name]
+            player.stack = stack
+            player.current_bet = current_bet
+            player.is_active = is_active
+            player.has_acted = has_acted
+            player.hand = list(hand)
+            players.append(player)
+        game.players = players
+        game.pot = self.pot
+        game.current_bet = self.current_bet
+        game.community_cards = list(self.board)
+        game.dealer.deck.cards = list(self.deck)
+        game.button_position = self.button_position
+        game.small_blind = self.small_blind
+        game.big_blind = self.big_blind
+        game.hand_number = self.hand_number
+        game.current_street = self.street
+        game.betting_cursor = self.cursor
+        game.hand_ranks = {by_name[name]: rank for name, rank in self.hand_ranks}
+
+    def stacks(self):
+        return {name: stack for name, stack, *_ in self.seats}
+
+
+def play_out(snapshot, policy, rng=None, redeal=()):
+    """
+    Finish the snapshot's hand on a scratch table.
+
+    Args:
+        snapshot: TableSnapshot taken during a hand
+        policy: Brain playing every seat, or dict name -> Brain
+        rng: random.Random used to reshuffle the undealt cards; None deals
+            the snapshot's own deck order
+        redeal: Names whose hole cards go back into the deck and are dealt
+            again from it (requires rng), e.g. the unknown opponents of a
+            searching bot
+
+    Returns:
+        Dict name -> stack after the hand
+    """
+    players = [Player(name, policy[name] if isinstance(policy, dict) else policy, stack)
+               for name, stack, *_ in snapshot.seats]
+    game = PokerGame(players, starting_stack=0, verbose=False)
+    snapshot.restore(game)
+
+    if rng is not None:
+        deck = game.dealer.deck.cards
+        for player in game.players:
+            if player.name in redeal:
+                deck += player.hand
+        rng.shuffle(deck)
+        for player in game.players:
+            if player.name in redeal:
+                player.hand = [deck.pop(), deck.pop()]
+        if redeal and game.community_cards:
+            game.evaluate_hands()
+    elif redeal:
+        raise ValueError("redeal needs an rng")
+
+    game.finish_hand(resume=snapshot.cursor is not None)
+    return {p.name: p.stack for p in game.players}
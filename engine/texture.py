@@ -0,0 +1,137 @@
+"""
+Board texture for every flop, with incremental turn and river updates.
+
+FLOP_TEXTURES is a structured array with one record per flop (22,100 rows),
+indexed by flop_index(). The index is the combinatorial number of the three
+cards' positions in Deck.GetFullDeck(). Records keep the raw rank/suit
+counts as bit masks, so add_card() can extend a flop texture to the turn and
+river with a few integer operations.
+
+    tex = texture(game_state["community_cards"])
+    if tex["paired"] or tex["monotone"]:
+        ...
+"""
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from engine.cards import CARD_INDEX, STRAIGHTS
+
+TEXTURE_DTYPE = np.dtype([
+    ("rank_mask", "<u2"),        # ranks on the board
+    ("pair_mask", "<u2"),        # ranks on the board at least twice
+    ("trips_mask", "<u2"),       # ranks on the board at least three times
+    ("suit_counts", "u1", (4,)),  # cards of each suit (s, h, d, c)
+    ("num_cards", "u1"),
+    ("high", "u1"),              # highest rank (0 = deuce .. 12 = ace)
+    ("max_suit", "u1"),
+    ("paired", "?"),
+    ("trips", "?"),
+    ("monotone", "?"),           # three or more of one suit: flush possible
+    ("two_tone", "?"),           # at most two of a suit, exactly two of one: flush draw possible
+    ("rainbow", "?"),
+    ("straight_windows", "u1"),  # straights possible with two hole cards
+    ("draw_windows", "u1"),      # windows holding two or more board ranks (connectedness)
+])
+
+_SUIT_INDEX = {1: 0, 2: 1, 4: 2, 8: 3}
+_COMB = [[comb(n, k) for k in range(4)] for n in range(52)]
+
+STRAIGHT_WINDOWS = np.array([sum(bin(m & w).count("1") >= 3 for w in STRAIGHTS) for m in range(1 << 13)], dtype=np.uint8)
+DRAW_WINDOWS = np.array([sum(bin(m & w).count("1") >= 2 for w in STRAIGHTS) for m in range(1 << 13)], dtype=np.uint8)
+_STRAIGHT_WINDOWS = STRAIGHT_WINDOWS.tolist()
+_DRAW_WINDOWS = DRAW_WINDOWS.tolist()
+
+
+def flop_index(cards):
+    """Canonical index 0..22099 of three treys cards in any order."""
+    a, b, c = sorted(CARD_INDEX[card] for card in cards)
+    return _COMB[a][1] + _COMB[b][2] + _COMB[c][3]
+
+
+def _finish(tex):
+    """Fill the derived fields from the masks and suit counts."""
+    max_suit = tex["suit_counts"].max(axis=-1)
+    tex["max_suit"] = max_suit
+    tex["high"] = np.log2(np.maximum(tex["rank_mask"], 1)).astype(np.uint8)
+    tex["paired"] = tex["pair_mask"] != 0
+    tex["trips"] = tex["trips_mask"] != 0
+    tex["monotone"] = max_suit >= 3
+    tex["two_tone"] = max_suit == 2
+    tex["rainbow"] = max_suit == 1
+    tex["straight_windows"] = STRAIGHT_WINDOWS[tex["rank_mask"]]
+    tex["draw_windows"] = DRAW_WINDOWS[tex["rank_mask"]]
+    return tex
+
+
+def _build_flops():
+    flops = np.array(list(combinations(range(52), 3)), dtype=np.intp)
+    ranks = flops // 4
+    suits = flops % 4
+    bits = (1 << ranks).astype(np.uint16)
+    r0, r1, r2 = bits[:, 0], bits[:, 1], bits[:, 2]
+
+    tex = np.zeros(len(flops), dtype=TEXTURE_DTYPE)
+    tex["rank_mask"] = r0 | r1 | r2
+    tex["pair_mask"] = (r0 & r1) | (r0 & r2) | (r1 & r2)
+    tex["trips_mask"] = r0 & r1 & r2
+    for s in range(4):
+        tex["suit_counts"][:, s] = (suits == s).sum(axis=1)
+    tex["num_cards"] = 3
+
+    # Store in flop_index order
+    index = flops[:, 0] + flops[:, 1] * (flops[:, 1] - 1) // 2 + flops[:, 2] * (flops[:, 2] - 1) * (flops[:, 2] - 2) // 6
+    ordered = np.empty_like(tex)
+    ordered[index] = tex
+    return _finish(ordered)
+
+
+FLOP_TEXTURES = _build_flops()
+
+
+def add_card(tex, card):
+    """Texture after one more board card (turn or river)."""
+    bit = 1 << ((card >> 8) & 0xF)
+    rank_mask, pair_mask = int(tex["rank_mask"]), int(tex["pair_mask"])
+    trips_mask = int(tex["trips_mask"]) | (pair_mask & bit)
+    pair_mask |= rank_mask & bit
+    rank_mask |= bit
+    suit_counts = tex["suit_counts"].tolist()
+    suit_counts[_SUIT_INDEX[(card >> 12) & 0xF]] += 1
+    max_suit = max(suit_counts)
+    record = (rank_mask, pair_mask, trips_mask, suit_counts, int(tex["num_cards"]) + 1,
+              rank_mask.bit_length() - 1, max_suit, pair_mask != 0, trips_mask != 0,
+              max_suit >= 3, max_suit == 2, max_suit == 1,
+              _STRAIGHT_WINDOWS[rank_mask], _DRAW_WINDOWS[rank_mask])
+    return np.array(record, dtype=TEXTURE_DTYPE)[()]
+
+
+def texture(board):
+    """Texture record of a 3, 4 or 5 card board."""
+    if len(board) < 3:
+        raise ValueError("Board texture needs at least the flop")
+    tex = FLOP_TEXTURES[flop_index(board[:3])]
+    for card in board[3:]:
+        tex = add_card(tex, card)
+    return tex
+
+
+if __name__ == "__main__":
+    import time
+    from treys import Card
+
+    print(f"{len(FLOP_TEXTURES):,} flops, {FLOP_TEXTURES.nbytes / 1024:.0f} KB")
+    for name in ("paired", "trips", "monotone", "two_tone", "rainbow"):
+        print(f"  {name:<10} {FLOP_TEXTURES[name].mean():.1%}")
+
+    board = [Card.new("Ah"), Card.new("Th"), Card.new("9c"), Card.new("Ts"), Card.new("2h")]
+    start = time.perf_counter()
+    for _ in range(10000):
+        FLOP_TEXTURES[flop_index(board[:3])]
+    print(f"Flop lookup: {1e6 * (time.perf_counter() - start) / 10000:.1f} µs")
+    start = time.perf_counter()
+    for _ in range(10000):
+        texture(board)
+    print(f"River texture: {1e6 * (time.perf_counter() - start) / 10000:.1f} µs")
+    print(texture(board))
@@ -1,8 +1,17 @@
 from engine.game import PokerGame
 from engine.player import Player
-from engine.brain import Brain
+from engine.brain import Brain, BrainPool
+from engine.memo import DECISIONS
+from engine.checkpoint import Checkpointer
+from engine.fingerprint import brain_fingerprint, engine_fingerprint, type_name
+from engine.hand_history import HandHistoryWriter
+from engine.results_store import ResultsStore
+from engine.result_cache import DEFAULT_MAX_BYTES, ResultCache, content_key
 from bots.randomBot import RandomBot
 from collections import defaultdict
+import hashlib
+import pickle
+import random
 import time
 
 class TournamentSimulator:
@@ -11,11 +20,16 @@ class TournamentSimulator:
         Initialize the tournament simulator.
         
         Args:
-            player_configs: List of tuples (name, brain_instance)
+            player_configs: List of tuples (name, brain_class_or_instance)
             starting_stack: Starting chips for each player
         """
         self.player_configs = player_configs
         self.starting_stack = starting_stack
+        self.brain_pool = BrainPool()
+        self.history = None  # HandHistoryWriter while a recorded run is in progress
+        self.history_base = 0  # history game number before the run's first game
+        self.run_id = None  # results store run being recorded
+        self.result_cache = None  # ResultCache while a cached run is in progress
         self.stats = defaultdict(lambda: {
             'wins': 0,
             'games_played': 0,
@@ -23,14 +37,17 @@ class TournamentSimulator:
         })
     
     def create_players(self):
-        """Create fresh player instances for a new game."""
+        """Create fresh player instances for a new game, reusing pooled brains."""
         players = []
         for name, brain in self.player_configs:
-            player = Player(name, brain, self.starting_stack)
+            player = Player(name, self.brain_pool.acquire(name, brain), self.starting_stack)
             players.append(player)
         return players
     
-    def run_tournament(self, num_games, verbose=False, summary_frequency=10):
+    def run_tournament(self, num_games, verbose=False, summary_frequency=10, seed=None,
+                       checkpoint_path=None, checkpoint_interval=60.0, checkpoint_overhead=0.01,
+                       checkpoint_mid_game=False, history_path=None, results_path=None, run_name=None,
+                       cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES):
         """
         Run multiple poker games and track statistics.
         
@@ -38,29 +55,138 @@ class TournamentSimulator:
             num_games: Number of games to simulate
             verbose: Whether to print game details (False for faster simulation)
             summary_frequency: Print summary every N games
+            seed: Seed for deals and for bots that use the random module (None = unseeded)
+            checkpoint_path: Save progress to this file, and resume from it if it
+                already exists; a seeded resumed run ends with the same results as
+                an uninterrupted one when every brain is reproducible (Brain.reproducible)
+            checkpoint_interval: Minimum seconds between checkpoints
+            checkpoint_overhead: Largest fraction of run time spent writing checkpoints
+            checkpoint_mid_game: Also checkpoint between hands of the game in
+                progress (for very long games); needs picklable brains
+            history_path: Record every hand to this hand-history directory
+                (see engine/hand_history.py); resumed runs continue it
+            results_path: SQLite results store (see engine/results_store.py)
+                receiving the run's metadata and every game's results
+            run_name: Name of the run in the results store
+            cache_path: Result cache directory (see engine/result_cache.py); games
+                whose key (every engine module and data file, seated bots' sources,
+                seating, stack, game seed) is cached are not replayed. Needs a seed and
+                brains that are reproducible under it (Brain.reproducible), and is
+                write-only while recording a hand history, which needs every hand played
+            cache_max_bytes: Size above which least recently used results are evicted
         """
+        # Every game gets its own seed from this generator, so the run only
+        # depends on its state and the random module's
+        rng = random.Random(seed)
+        first_game = 1
+        elapsed_before = 0.0
+        game = None
+        checkpointer = None
+        if history_path:
+            self.history = HandHistoryWriter(history_path)
+            self.history_base = self.history.game_number
+        store = ResultsStore(results_path) if results_path else None
+        self.run_id = None
+        if checkpoint_path:
+            checkpointer = Checkpointer(checkpoint_path, checkpoint_interval, checkpoint_overhead)
+            state = checkpointer.load()
+            if state is not None:
+                game = self.restore_checkpoint(state, rng)
+                first_game = state["games_completed"] + 1
+                elapsed_before = state["elapsed"]
+                if self.history is not None:
+                    # Drop hands recorded after the checkpoint; they are about to be replayed
+                    if state.get("history") is not None:
+                        position, self.history_base = state["history"]
+                        self.history.truncate(position)
+                    self.history.game_number = self.history_base + first_game - 1
+                    if game is not None:
+                        self.history.attach(game)
+                if store is not None and state.get("run_id") is not None:
+                    # Games recorded after the checkpoint are about to be replayed
+                    self.run_id = state["run_id"]
+                    store.rewind_run(self.run_id, first_game - 1)
+        if store is not None and self.run_id is None:
+            self.run_id = store.start_run(run_name, [name for name, _ in self.player_configs],
+                                          self.starting_stack, seed, {"num_games": num_games})
+        bots = {name: (brain if isinstance(brain, type) else type(brain)).__name__
+                for name, brain in self.player_configs}
+        config_key = None
+        unreproducible = [name for name, brain in self.player_configs
+                          if not getattr(brain, "reproducible", True)]
+        if cache_path and unreproducible:
+            print(f"Result cache disabled: {', '.join(unreproducible)} cannot replay a game from its seed")
+        elif cache_path and seed is not None:
+            try:
+                config_key = content_key(*self.cache_config())
+                self.result_cache = ResultCache(cache_path, cache_max_bytes)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                print(f"Result cache disabled, a configured brain cannot be pickled: {e}")
+        elif cache_path:
+            print("Result cache disabled: unseeded games cannot be reproduced")
+        read_cache = self.result_cache is not None and self.history is None
+
         print(f"\n{'='*60}")
         print(f"STARTING TOURNAMENT: {num_games} GAMES")
         print(f"{'='*60}")
         print(f"Players: {', '.join([name for name, _ in self.player_configs])}")
         print(f"Starting Stack: {self.starting_stack}")
+        if first_game > 1 or game is not None:
+            print(f"Resuming from {checkpoint_path}: {first_game - 1} games completed"
+                  + (f", game {first_game} at hand {game.hand_number + 1}" if game is not None else ""))
         print(f"{'='*60}\n")
         
-        start_time = time.time()
+        start_time = time.time() - elapsed_before
+        game_num = first_game
+
+        def between_hands(current_game):
+            nonlocal checkpoint_mid_game
+            if checkpoint_mid_game and checkpointer.due():
+                try:
+                    checkpointer.write(self.checkpoint_state(game_num - 1, start_time, seed, rng, current_game))
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    print(f"Mid-game checkpoints disabled, the game cannot be pickled: {e}")
+                    checkpoint_mid_game = False
         
-        for game_num in range(1, num_games + 1):
-            # Create fresh players for each game
-            players = self.create_players()
+        for game_num in range(first_game, num_games + 1):
+            result = None
+            if game is None:
+                game_seed = rng.getrandbits(63)
+                random.seed(game_seed)
+                if read_cache:
+                    result = self.result_cache.get(self.game_key(config_key, game_seed))
+                if result is None:
+                    # Create fresh players for each game
+                    players = self.create_players()
+                    game = PokerGame(players, starting_stack=self.starting_stack, verbose=verbose,
+                                     seed=game_seed, history=self.history)
+                resume = False
+            else:
+                game_seed = game.seed
+                game.verbose = verbose
+                resume = True
             
-            # Run the game
-            game = PokerGame(players, starting_stack=self.starting_stack, verbose=verbose)
-            game.play_game()
+            if result is None:
+                # Run the game
+                game.play_game(between_hands if checkpointer else None, resume=resume)
+                result = {"order": [[p.name, p.stack] for p in game.finishing_order()],
+                          "hands": game.hand_number}
+                if self.result_cache is not None:
+                    self.result_cache.put(self.game_key(config_key, game_seed), result)
             
             # Update statistics
-            for player in players:
-                self.stats[player.name]['games_played'] += 1
-                if player.stack > 0:  # Winner is the player with chips remaining
-                    self.stats[player.name]['wins'] += 1
+            for name, stack in result["order"]:
+                self.stats[name]['games_played'] += 1
+                if stack > 0:  # Winner is the player with chips remaining
+                    self.stats[name]['wins'] += 1
+            if store is not None:
+                store.record_game(self.run_id, game_num,
+                                  [(name, bots[name], stack) for name, stack in result["order"]],
+                                  seed=game_seed, hands=result["hands"])
+            game = None
+
+            if checkpointer and (checkpointer.due() or game_num == num_games):
+                checkpointer.write(self.checkpoint_state(game_num, start_time, seed, rng))
             
             # Print periodic summary
             if game_num % summary_frequency == 0 or game_num == num_games:
@@ -71,9 +197,89 @@ class TournamentSimulator:
         print(f"TOURNAMENT COMPLETE!")
         print(f"Total Time: {elapsed_time:.2f} seconds")
         print(f"Games per Second: {num_games/elapsed_time:.2f}")
+        if checkpointer and checkpointer.writes:
+            print(f"Checkpoints: {checkpointer.writes} written in {checkpointer.write_time:.2f}s")
+        if store is not None:
+            store.finish_run(self.run_id, elapsed_time)
+            store.close()
+            print(f"Results: run {self.run_id} in {results_path}")
+        if self.result_cache is not None:
+            cache = self.result_cache
+            print(f"Result cache: {cache.hits} games reused, {cache.misses} played, "
+                  f"{len(cache):,} entries ({cache.total / 1e6:.1f} MB, {cache.evictions} evicted)")
+            self.result_cache = None
+        if self.history is not None:
+            self.history.close()
+            print(f"Hand history: {self.history.position()[2]:,} hands in {history_path}")
+            self.history = None
         print(f"{'='*60}\n")
         
         self.print_final_results()
+        if DECISIONS.stats:
+            print("Decision cache:")
+            DECISIONS.print_report()
+
+    def fingerprints(self):
+        """Source fingerprints of the engine and of every configured brain."""
+        return {"engine": engine_fingerprint(),
+                **{name: brain_fingerprint(brain) for name, brain in self.player_configs}}
+
+    def cache_config(self):
+        """
+        Everything besides the game seed that a game's result depends on.
+
+        The engine fingerprint covers all of engine/ (shared bot code such as
+        range_tracker.py and the push/fold charts included), each seat's covers
+        the file defining its brain class.
+        """
+        seats = []
+        for name, brain in self.player_configs:
+            # Configured instances may carry constructor parameters the source hash does not see
+            params = None if isinstance(brain, type) else hashlib.sha256(pickle.dumps(brain)).hexdigest()
+            seats.append((name, type_name(brain), brain_fingerprint(brain), params))
+        return [engine_fingerprint(), seats, self.starting_stack]
+
+    def game_key(self, config_key, game_seed):
+        return content_key(config_key, game_seed)
+
+    def checkpoint_state(self, games_completed, start_time, seed, rng, game=None):
+        """Everything run_tournament needs to continue after games_completed games."""
+        return {
+            "players": [name for name, _ in self.player_configs],
+            "starting_stack": self.starting_stack,
+            "seed": seed,
+            "fingerprints": self.fingerprints(),
+            "games_completed": games_completed,
+            "elapsed": time.time() - start_time,
+            "stats": {name: dict(stats) for name, stats in self.stats.items()},
+            "rng_state": rng.getstate(),
+            "random_state": random.getstate(),
+            "game": game,
+            "history": self.history_checkpoint(),
+            "run_id": self.run_id,
+        }
+
+    def history_checkpoint(self):
+        if self.history is None:
+            return None
+        # Flushed, so the recorded position is on disk
+        self.history.flush()
+        return self.history.position(), self.history_base
+
+    def restore_checkpoint(self, state, rng):
+        """Load a checkpoint's statistics and RNG states; returns the saved in-progress game, if any."""
+        if state["players"] != [name for name, _ in self.player_configs] or state["starting_stack"] != self.starting_stack:
+            raise ValueError("Checkpoint was written by a tournament with different players or stacks")
+        changed = [name for name, digest in self.fingerprints().items() if state["fingerprints"].get(name) != digest]
+        if changed:
+            print(f"Warning: code changed since the checkpoint ({', '.join(changed)}), "
+                  f"results will differ from an uninterrupted run")
+        self.stats.clear()
+        for name, stats in state["stats"].items():
+            self.stats[name].update(stats)
+        rng.setstate(state["rng_state"])
+        random.setstate(state["random_state"])
+        return state["game"]
     
     def print_summary(self, games_completed, start_time):
         """Print a summary of current standings."""
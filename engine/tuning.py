@@ -0,0 +1,333 @@
+"""
+Parallel hyperparameter search for bots with tunable attributes.
+
+A bot is tunable when its parameters are plain attributes set in __init__
+(e.g. BestBot.aggression_button). The harness instantiates the bot, overrides
+those attributes with candidate values and plays it against a fixed lineup of
+opponents.
+
+Every candidate is evaluated on the same list of game seeds (common random
+numbers): game i deals the same cards and seeds the random module the same
+way for every candidate, so score differences come from the parameters
+rather than from luck. Games are spread over a process pool.
+
+Search strategies:
+    random_search       - N random candidates, full budget each
+    successive_halving  - many candidates on few games, keep the best 1/eta,
+                          give survivors eta times more games, repeat
+    cma_es              - covariance matrix adaptation in the normalized space,
+                          with the bottom half of each generation pruned after
+                          half of its games
+"""
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import math
+import os
+import random
+import time
+
+import numpy as np
+
+from engine.game import PokerGame
+from engine.player import Player
+
+
+class ParamSpace:
+    """
+    Declared search space.
+
+    Usage:
+        ParamSpace({
+            "aggression_button": (0.5, 2.0),
+            "speculative_call_ratio": (0.005, 0.1, "log"),
+            "num_sims": (100, 800, "int"),
+        })
+    """
+
+    def __init__(self, params):
+        self.names = list(params)
+        self.bounds = []
+        for name in self.names:
+            spec = params[name]
+            low, high = spec[0], spec[1]
+            kind = spec[2] if len(spec) > 2 else "float"
+            if kind not in ("float", "int", "log"):
+                raise ValueError(f"Unknown parameter kind '{kind}' for {name}")
+            if kind == "log" and low <= 0:
+                raise ValueError(f"Log-scaled parameter {name} needs a positive lower bound")
+            self.bounds.append((low, high, kind))
+
+    @property
+    def dim(self):
+        return len(self.names)
+
+    def decode(self, unit):
+        """Map a point in [0, 1]^dim to parameter values."""
+        params = {}
+        for name, u, (low, high, kind) in zip(self.names, unit, self.bounds):
+            u = min(1.0, max(0.0, float(u)))
+            if kind == "log":
+                value = math.exp(math.log(low) + u * (math.log(high) - math.log(low)))
+            else:
+                value = low + u * (high - low)
+            params[name] = int(round(value)) if kind == "int" else value
+        return params
+
+    def sample(self, rng):
+        return self.decode([rng.random() for _ in self.names])
+
+
+def play_candidate_games(brain_class, params, opponents, seeds, starting_stack):
+    """
+    Play one game per seed with the candidate seated among the opponents.
+
+    Returns:
+        List of scores in [0, 1]: 1 for a win, 0 for first out
+    """
+    scores = []
+    num_players = len(opponents) + 1
+    for i, seed in enumerate(seeds):
+        brain = brain_class()
+        for name, value in params.items():
+            setattr(brain, name, value)
+        configs = [(name, cls) for name, cls in opponents]
+        # Rotate the candidate's seat with the seed so every position is covered
+        configs.insert(seed % num_players, ("Candidate", brain))
+        random.seed(seed)
+        players = [Player(name, b, starting_stack) for name, b in configs]
+        game = PokerGame(players, starting_stack=starting_stack, verbose=False, seed=seed)
+        game.play_game()
+        place = [p.name for p in game.finishing_order()].index("Candidate")
+        scores.append(1.0 - place / (num_players - 1))
+    return scores
+
+
+def _play_task(task):
+    return play_candidate_games(*task)
+
+
+class Candidate:
+    def __init__(self, params, unit=None):
+        self.params = params
+        self.unit = unit
+        self.scores = []
+
+    @property
+    def games(self):
+        return len(self.scores)
+
+    @property
+    def score(self):
+        return sum(self.scores) / len(self.scores) if self.scores else 0.0
+
+    @property
+    def stderr(self):
+        n = len(self.scores)
+        if n < 2:
+            return float("inf")
+        mean = self.score
+        return math.sqrt(sum((s - mean) ** 2 for s in self.scores) / (n - 1) / n)
+
+
+class TuningHarness:
+    def __init__(self, brain_class, space, opponents, starting_stack=1000, workers=None,
+                 seed=0, chunk_size=10, verbose=True):
+        """
+        Initialize the harness.
+
+        Args:
+            brain_class: Bot class to tune (module level, so workers can import it)
+            space: ParamSpace to search
+            opponents: List of (name, brain_class) seated against every candidate
+            starting_stack: Starting chips for each player
+            workers: Worker processes (None = one per CPU, 1 = run inline)
+            seed: Seed for the game seeds and for the search itself
+            chunk_size: Games per worker task
+            verbose: Print progress
+        """
+        self.brain_class = brain_class
+        self.space = space
+        self.opponents = opponents
+        self.starting_stack = starting_stack
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.rng = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.verbose = verbose
+        self.candidates = []
+        self.games_played = 0
+
+        # Common random numbers: game i uses game_seeds[i] for every candidate
+        seed_rng = random.Random(seed ^ 0x5EED)
+        self._seed_rng = seed_rng
+        self.game_seeds = []
+
+    def seeds(self, count):
+        while len(self.game_seeds) < count:
+            self.game_seeds.append(self._seed_rng.getrandbits(31))
+        return self.game_seeds[:count]
+
+    def evaluate(self, candidates, games):
+        """Top every candidate up to `games` games on the shared seeds."""
+        seeds = self.seeds(games)
+        tasks = []
+        owners = []
+        for candidate in candidates:
+            todo = seeds[candidate.games:]
+            for start in range(0, len(todo), self.chunk_size):
+                tasks.append((self.brain_class, candidate.params, self.opponents,
+                              todo[start:start + self.chunk_size], self.starting_stack))
+                owners.append(candidate)
+
+        if self.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(self.workers) as pool:
+                outputs = list(pool.map(_play_task, tasks))
+        else:
+            outputs = [_play_task(task) for task in tasks]
+
+        # Chunks come back in submission order, so scores stay aligned with seeds
+        for candidate, scores in zip(owners, outputs):
+            candidate.scores.extend(scores)
+            self.games_played += len(scores)
+
+    def _new_candidate(self, unit=None):
+        if unit is None:
+            unit = [self.rng.random() for _ in range(self.space.dim)]
+        candidate = Candidate(self.space.decode(unit), list(unit))
+        self.candidates.append(candidate)
+        return candidate
+
+    def random_search(self, num_candidates, games):
+        """Evaluate num_candidates random points with `games` games each."""
+        batch = [self._new_candidate() for _ in range(num_candidates)]
+        self.evaluate(batch, games)
+        self._log(f"Random search: {num_candidates} candidates x {games} games")
+        return self.ranked()
+
+    def successive_halving(self, num_candidates, min_games=10, eta=3, max_games=None):
+        """
+        Successive halving: evaluate on min_games, keep the top 1/eta, multiply
+        the budget by eta, until one candidate is left or max_games is reached.
+        """
+        alive = [self._new_candidate() for _ in range(num_candidates)]
+        games = min_games
+        while True:
+            self.evaluate(alive, games)
+            alive.sort(key=lambda c: c.score, reverse=True)
+            self._log(f"Successive halving: {len(alive)} candidates at {games} games, "
+                      f"best {alive[0].score:.3f}")
+            if len(alive) <= 1 or (max_games is not None and games >= max_games):
+                break
+            alive = alive[:max(1, len(alive) // eta)]
+            games = games * eta if max_games is None else min(games * eta, max_games)
+        return self.ranked()
+
+    def cma_es(self, generations, population=None, games=30, sigma=0.3):
+        """
+        CMA-ES over the unit cube.
+
+        Each generation is evaluated on the same games; candidates in the
+        bottom half after games // 2 are pruned and not evaluated further.
+        """
+        n = self.space.dim
+        lam = population or 4 + int(3 * math.log(n))
+        mu = lam // 2
+        weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        weights /= weights.sum()
+        mueff = 1.0 / np.sum(weights ** 2)
+
+        cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+        cs = (mueff + 2) / (n + mueff + 5)
+        c1 = 2 / ((n + 1.3) ** 2 + mueff)
+        cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+        damps = 1 + 2 * max(0, math.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+        chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+
+        mean = np.full(n, 0.5)
+        pc = np.zeros(n)
+        ps = np.zeros(n)
+        C = np.eye(n)
+        np_rng = np.random.default_rng(self.rng.getrandbits(32))
+
+        for generation in range(1, generations + 1):
+            eigvals, B = np.linalg.eigh(C)
+            D = np.sqrt(np.maximum(eigvals, 1e-20))
+            z = np_rng.standard_normal((lam, n))
+            y = z @ np.diag(D) @ B.T
+            x = mean + sigma * y
+            batch = [self._new_candidate(np.clip(row, 0, 1)) for row in x]
+
+            # Race: half the games for everyone, the rest only for the top half
+            self.evaluate(batch, max(1, games // 2))
+            order = sorted(range(lam), key=lambda i: batch[i].score, reverse=True)
+            self.evaluate([batch[i] for i in order[:mu]], games)
+            order = sorted(order[:mu], key=lambda i: batch[i].score, reverse=True) + order[mu:]
+
+            # Update the distribution from the clipped points that were evaluated
+            y_sel = (np.array([batch[i].unit for i in order[:mu]]) - mean) / sigma
+            y_w = weights @ y_sel
+            mean = np.clip(mean + sigma * y_w, 0, 1)
+
+            inv_sqrt_C = B @ np.diag(1 / D) @ B.T
+            ps = (1 - cs) * ps + math.sqrt(cs * (2 - cs) * mueff) * (inv_sqrt_C @ y_w)
+            hsig = np.linalg.norm(ps) / math.sqrt(1 - (1 - cs) ** (2 * generation)) < (1.4 + 2 / (n + 1)) * chi_n
+            pc = (1 - cc) * pc + hsig * math.sqrt(cc * (2 - cc) * mueff) * y_w
+            C = ((1 - c1 - cmu) * C
+                 + c1 * (np.outer(pc, pc) + (1 - hsig) * cc * (2 - cc) * C)
+                 + cmu * (y_sel.T * weights) @ y_sel)
+            sigma *= math.exp((cs / damps) * (np.linalg.norm(ps) / chi_n - 1))
+
+            best = batch[order[0]]
+            self._log(f"CMA-ES generation {generation}: best {best.score:.3f} "
+                      f"sigma {sigma:.3f} {self._format_params(best.params)}")
+        return self.ranked()
+
+    def ranked(self):
+        """Candidates sorted by games played (fully evaluated first), then score."""
+        return sorted(self.candidates, key=lambda c: (c.games, c.score), reverse=True)
+
+    def write_results(self, path):
+        """Write the ranked results table as CSV."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["rank", "score", "stderr", "games"] + self.space.names)
+            for rank, candidate in enumerate(self.ranked(), 1):
+                writer.writerow([rank, f"{candidate.score:.4f}", f"{candidate.stderr:.4f}",
+                                 candidate.games] + [candidate.params[n] for n in self.space.names])
+
+    def print_results(self, top=10):
+        print(f"\n{'='*60}")
+        print(f"TUNING RESULTS: {self.brain_class.__name__} ({self.games_played} games)")
+        print(f"{'='*60}")
+        print(f"{'Rank':<6} {'Score':<8} {'±':<8} {'Games':<7} Params")
+        print("-" * 60)
+        for rank, candidate in enumerate(self.ranked()[:top], 1):
+            print(f"{rank:<6} {candidate.score:<8.3f} {candidate.stderr:<8.3f} {candidate.games:<7} "
+                  f"{self._format_params(candidate.params)}")
+        print(f"{'='*60}\n")
+
+    def _format_params(self, params):
+        return ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in params.items())
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+
+if __name__ == "__main__":
+    from bots.chatGptBot import BestBot
+    from bots.randomBot import RandomBot
+    from bots.claudeBot import ClaudeBot
+
+    space = ParamSpace({
+        "aggression_button": (0.3, 3.0),
+        "aggression_early": (0.2, 2.0),
+        "speculative_call_ratio": (0.005, 0.2, "log"),
+    })
+    harness = TuningHarness(BestBot, space,
+                            opponents=[("Random", RandomBot), ("Claude", ClaudeBot)],
+                            starting_stack=1000)
+    start = time.time()
+    harness.successive_halving(num_candidates=27, min_games=10, eta=3)
+    harness.print_results()
+    harness.write_results("tuning_results.csv")
+    print(f"Finished in {time.time() - start:.1f}s")
@@ -0,0 +1,586 @@
+"""
+Lockstep simulator that plays thousands of independent games as NumPy arrays.
+
+Every table holds the same lineup of vectorized bots, one per seat. Stacks,
+bets, flags, cards and the betting cursor of all tables live in arrays; each
+step collects the next decision of every table, asks each seat's bot for all
+of its pending decisions in one get_actions(batch) call, and applies the
+answers to every table at once.
+
+The rules are PokerGame's, including its quirks (no side pots, blinds
+increasing every 10 hands, the button posting the small blind, odd chips to
+the first winner in seat order). With PythonDecks the deals are the ones
+PokerGame(seed=...) makes, so deterministic bots produce identical chip
+outcomes to the scalar engine; verify_against_scalar() checks this.
+
+Vectorized bots implement:
+
+    get_actions(batch) -> (actions, amounts)
+
+where batch is a dict of arrays with one row per pending decision (keys
+mirror build_game_state: "hand", "community_cards", "num_community_cards",
+"stack", "player_current_bet", "pot", "current_bet", "amount_to_call",
+"pot_odds", "street", "small_blind", "big_blind", "hand_number",
+"button_position", "position", "num_players", "num_active_players",
+"valid_actions" (bool mask in ACTIONS order), "min_raise", "max_raise"),
+actions is an int array of action codes and amounts a float array.
+"""
+import random
+import time
+
+import numpy as np
+from treys import Deck
+
+from engine.brain import Brain
+from engine.vector_eval import FULL_DECK, WORST_RANK, evaluate, rank_class
+
+ACTIONS = ["fold", "check", "call", "bet", "raise"]
+FOLD, CHECK, CALL, BET, RAISE = range(5)
+STREETS = ["pre-flop", "flop", "turn", "river"]
+BOARD_SIZES = np.array([0, 3, 4, 5])
+
+
+class NumpyDecks:
+    """Fast deals from a NumPy generator."""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def start_games(self, tables):
+        return [None] * len(tables)
+
+    def deal(self, tables):
+        order = np.argsort(self.rng.random((len(tables), 52)), axis=1)
+        return FULL_DECK[order]
+
+
+class PythonDecks:
+    """
+    The exact deals of PokerGame(seed=game_seed): one shuffle when the game is
+    created, then one fresh shuffled deck per hand.
+    """
+
+    def __init__(self, seed=0):
+        self.seed_rng = random.Random(seed)
+        self.rngs = {}
+
+    def start_games(self, tables):
+        seeds = []
+        for t in tables:
+            game_seed = self.seed_rng.getrandbits(63)
+            rng = random.Random(game_seed)
+            rng.shuffle(Deck.GetFullDeck())  # the Dealer built in PokerGame.__init__
+            self.rngs[int(t)] = rng
+            seeds.append(game_seed)
+        return seeds
+
+    def deal(self, tables):
+        decks = []
+        for t in tables:
+            cards = Deck.GetFullDeck()
+            self.rngs[int(t)].shuffle(cards)
+            decks.append(cards)
+        return np.array(decks, dtype=np.int64)
+
+
+class VectorSimulator:
+    def __init__(self, policies, num_tables=1000, starting_stack=1000, decks=None,
+                 small_blind=10, big_blind=20):
+        """
+        Initialize the simulator.
+
+        Args:
+            policies: One vectorized bot per seat (the same object may fill several seats)
+            num_tables: Tables advanced in lockstep
+            starting_stack: Starting chips for each player
+            decks: NumpyDecks (default) or PythonDecks
+            small_blind, big_blind: Blinds at the start of each game
+        """
+        self.policies = list(policies)
+        self.num_tables = T = num_tables
+        self.num_seats = P = len(self.policies)
+        self.starting_stack = starting_stack
+        self.decks = decks or NumpyDecks()
+        self.initial_blinds = (small_blind, big_blind)
+
+        self.stack = np.zeros((T, P))
+        self.current_bet = np.zeros((T, P))
+        self.alive = np.zeros((T, P), dtype=bool)      # still in PokerGame.players
+        self.active = np.zeros((T, P), dtype=bool)     # not folded this hand
+        self.has_acted = np.zeros((T, P), dtype=bool)
+        self.hole = np.zeros((T, P, 2), dtype=np.int64)
+        self.order = np.zeros((T, P), dtype=np.intp)   # seat at each list position
+        self.position = np.zeros((T, P), dtype=np.intp)
+
+        self.board = np.zeros((T, 5), dtype=np.int64)
+        self.street = np.zeros(T, dtype=np.intp)
+        self.pot = np.zeros(T)
+        self.table_bet = np.zeros(T)
+        self.small_blind = np.zeros(T, dtype=np.int64)
+        self.big_blind = np.zeros(T, dtype=np.int64)
+        self.button = np.zeros(T, dtype=np.intp)
+        self.hand_number = np.zeros(T, dtype=np.int64)
+        self.num_alive = np.zeros(T, dtype=np.intp)
+        self.start_pos = np.zeros(T, dtype=np.intp)
+        self.pass_index = np.zeros(T, dtype=np.intp)
+        self.acted_this_pass = np.zeros(T, dtype=bool)
+        self.running = np.zeros(T, dtype=bool)
+        self.game_seed = [None] * T
+
+        self.games_target = 0
+        self.games_started = 0
+        self.hands_played = 0
+        self.decisions = 0
+        self.results = []  # (seed, hands, final stacks) per finished game
+
+    def run(self, num_games):
+        """
+        Play num_games games spread over the tables.
+
+        Returns:
+            List of (seed, hands_played, final_stacks) per finished game
+        """
+        self.games_target = num_games
+        first = np.arange(min(self.num_tables, num_games))
+        self._start_games(first)
+
+        while self.running.any():
+            tables, seats = self._find_actors()
+            if len(tables) == 0:
+                break
+            actions = np.zeros(len(tables), dtype=np.intp)
+            amounts = np.zeros(len(tables))
+            batch = self._build_batch(tables, seats)
+            for policy, rows in self._group_by_policy(seats):
+                if len(rows) == len(tables):
+                    sub = batch
+                else:
+                    sub = {key: value[rows] for key, value in batch.items()}
+                a, amt = policy.get_actions(sub)
+                actions[rows] = a
+                amounts[rows] = amt
+            self.decisions += len(tables)
+            self._apply(tables, seats, actions, amounts)
+        return self.results
+
+    # --- game and hand flow ---
+
+    def _start_games(self, tables):
+        self.games_started += len(tables)
+        seeds = self.decks.start_games(tables)
+        for t, seed in zip(tables, seeds):
+            self.game_seed[t] = seed
+        self.stack[tables] = self.starting_stack
+        self.alive[tables] = True
+        self.small_blind[tables], self.big_blind[tables] = self.initial_blinds
+        self.button[tables] = 0
+        self.hand_number[tables] = 0
+        self.running[tables] = True
+        self._start_hands(tables)
+
+    def _start_hands(self, tables):
+        self.hand_number[tables] += 1
+        # eliminate_broke_players
+        self.alive[tables] &= self.stack[tables] > 0
+        n = self.alive[tables].sum(axis=1)
+        self.num_alive[tables] = n
+        self.button[tables] = np.where(self.button[tables] >= n, 0, self.button[tables])
+        self.order[tables] = np.argsort(~self.alive[tables], axis=1, kind="stable")
+        self.position[tables] = np.cumsum(self.alive[tables], axis=1) - 1
+
+        self.pot[tables] = 0
+        self.table_bet[tables] = 0
+        self.active[tables] = self.alive[tables]
+        self.current_bet[tables] = 0
+        self.has_acted[tables] = False
+
+        # post_blinds
+        sb_seat = self.order[tables, self.button[tables]]
+        bb_seat = self.order[tables, (self.button[tables] + 1) % n]
+        sb_amount = np.minimum(self.small_blind[tables], self.stack[tables, sb_seat])
+        self.stack[tables, sb_seat] -= sb_amount
+        self.current_bet[tables, sb_seat] = sb_amount
+        bb_amount = np.minimum(self.big_blind[tables], self.stack[tables, bb_seat])
+        self.stack[tables, bb_seat] -= bb_amount
+        self.current_bet[tables, bb_seat] = bb_amount
+        self.pot[tables] = sb_amount + bb_amount
+        self.table_bet[tables] = bb_amount
+
+        # Deal from the end of the deck like Deck.draw: hole cards in list order, then the board
+        decks = self.decks.deal(tables)
+        rows = np.arange(len(tables))
+        for k in range(self.num_seats):
+            dealt = k < n
+            seats = self.order[tables[dealt], k]
+            self.hole[tables[dealt], seats, 0] = decks[rows[dealt], 51 - 2 * k]
+            self.hole[tables[dealt], seats, 1] = decks[rows[dealt], 50 - 2 * k]
+        board_idx = (51 - 2 * n)[:, None] - np.arange(5)[None, :]
+        self.board[tables] = decks[rows[:, None], board_idx]
+
+        self.street[tables] = 0
+        self._start_rounds(tables)
+
+    def _start_rounds(self, tables):
+        self.has_acted[tables] = False
+        offset = np.where(self.street[tables] == 0, 2, 1)
+        self.start_pos[tables] = (self.button[tables] + offset) % self.num_alive[tables]
+        self.pass_index[tables] = 0
+        self.acted_this_pass[tables] = False
+
+    def _finish_rounds(self, tables):
+        """Betting round complete: reset bets and deal the next street or go to showdown."""
+        self.current_bet[tables] = 0
+        self.table_bet[tables] = 0
+        river = self.street[tables] == 3
+        if river.any():
+            self._end_hands(tables[river])
+        more = tables[~river]
+        if len(more):
+            self.street[more] += 1
+            self._start_rounds(more)
+
+    def _end_hands(self, tables):
+        """Showdown, move the button, raise blinds, and start the next hand or game."""
+        self._showdown(tables)
+        self.hands_played += len(tables)
+        self.button[tables] = (self.button[tables] + 1) % self.num_alive[tables]
+        level_up = self.hand_number[tables] % 10 == 0
+        up = tables[level_up]
+        self.small_blind[up] = (self.small_blind[up] * 1.5).astype(np.int64)
+        self.big_blind[up] = (self.big_blind[up] * 1.5).astype(np.int64)
+
+        finished = (self.stack[tables] > 0).sum(axis=1) <= 1
+        if finished.any():
+            self._finish_games(tables[finished])
+        if (~finished).any():
+            self._start_hands(tables[~finished])
+
+    def _showdown(self, tables):
+        active = self.active[tables]
+        count = active.sum(axis=1)
+
+        single = count == 1
+        if single.any():
+            t = tables[single]
+            seat = np.argmax(active[single], axis=1)
+            self.stack[t, seat] += self.pot[t]
+
+        multi = count > 1
+        if multi.any():
+            t = tables[multi]
+            act = active[multi]
+            rows, seats = np.nonzero(act)
+            cards = np.concatenate([self.hole[t[rows], seats], self.board[t[rows]]], axis=1)
+            ranks = np.full(act.shape, WORST_RANK + 1, dtype=np.int64)
+            ranks[rows, seats] = evaluate(cards)
+            winners = ranks == ranks.min(axis=1, keepdims=True)
+            k = winners.sum(axis=1)
+            pot = self.pot[t]
+            share = np.floor_divide(pot, k)
+            remainder = np.mod(pot, k)
+            ordinal = np.cumsum(winners, axis=1) - 1
+            bonus = (ordinal < remainder[:, None]).astype(float)
+            self.stack[t] += winners * (share[:, None] + bonus)
+
+    def _finish_games(self, tables):
+        for t in tables:
+            self.results.append((self.game_seed[t], int(self.hand_number[t]), self.stack[t].copy()))
+        self.running[tables] = False
+        remaining = self.games_target - self.games_started
+        if remaining > 0:
+            self._start_games(tables[:remaining])
+
+    # --- betting ---
+
+    def _find_actors(self):
+        """Advance every running table to its next decision."""
+        actor_tables = []
+        actor_seats = []
+        tables = np.nonzero(self.running)[0]
+        while len(tables):
+            found = np.zeros(len(tables), dtype=bool)
+            seat_found = np.zeros(len(tables), dtype=np.intp)
+            n = self.num_alive[tables]
+            for j in range(self.num_seats):
+                i = self.pass_index[tables] + j
+                look = ~found & (i < n)
+                if not look.any():
+                    break
+                seat = self.order[tables, (self.start_pos[tables] + i) % n]
+                stack = self.stack[tables, seat]
+                needs = (look & self.active[tables, seat] & (stack != 0)
+                         & (~self.has_acted[tables, seat]
+                            | ((self.current_bet[tables, seat] < self.table_bet[tables]) & (stack > 0))))
+                self.pass_index[tables[needs]] = i[needs]
+                seat_found[needs] = seat[needs]
+                found |= needs
+
+            actor_tables.append(tables[found])
+            actor_seats.append(seat_found[found])
+
+            # End of a pass: the round is over unless someone acted and bets are unmatched
+            ended = tables[~found]
+            if not len(ended):
+                break
+            can_act = self.active[ended] & (self.stack[ended] > 0)
+            unmatched = can_act & (self.current_bet[ended] < self.table_bet[ended][:, None])
+            complete = ~self.acted_this_pass[ended] | ~unmatched.any(axis=1)
+            self._finish_rounds(ended[complete])
+            again = ended[~complete]
+            self.pass_index[again] = 0
+            self.acted_this_pass[again] = False
+            tables = ended[self.running[ended]]
+
+        if not actor_tables:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        return np.concatenate(actor_tables), np.concatenate(actor_seats)
+
+    def _build_batch(self, tables, seats):
+        stack = self.stack[tables, seats]
+        own_bet = self.current_bet[tables, seats]
+        table_bet = self.table_bet[tables]
+        pot = self.pot[tables]
+        to_call = table_bet - own_bet
+        n = self.num_alive[tables]
+
+        valid = np.zeros((len(tables), 5), dtype=bool)
+        valid[:, FOLD] = True
+        valid[:, CHECK] = to_call == 0
+        valid[:, CALL] = (to_call > 0) & (stack > 0)
+        valid[:, BET] = (to_call == 0) | ((stack > to_call) & (table_bet == 0))
+        valid[:, RAISE] = (stack > to_call) & (table_bet > 0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pot_odds = np.where(to_call > 0, to_call / (pot + to_call), 0.0)
+
+        street = self.street[tables]
+        return {
+            "table": tables,
+            "seat": seats,
+            "hand": self.hole[tables, seats],
+            "community_cards": self.board[tables],
+            "num_community_cards": BOARD_SIZES[street],
+            "stack": stack,
+            "player_current_bet": own_bet,
+            "pot": pot,
+            "current_bet": table_bet,
+            "amount_to_call": to_call,
+            "pot_odds": pot_odds,
+            "street": street,
+            "small_blind": self.small_blind[tables],
+            "big_blind": self.big_blind[tables],
+            "hand_number": self.hand_number[tables],
+            "button_position": self.button[tables],
+            "position": self.position[tables, seats],
+            "num_players": n,
+            "num_active_players": self.active[tables].sum(axis=1),
+            "valid_actions": valid,
+            "min_raise": np.where(table_bet == 0, self.big_blind[tables], table_bet * 2),
+            "max_raise": stack,
+        }
+
+    def _group_by_policy(self, seats):
+        groups = {}
+        for seat, policy in enumerate(self.policies):
+            groups.setdefault(id(policy), (policy, []))[1].append(seat)
+        for policy, policy_seats in groups.values():
+            rows = np.nonzero(np.isin(seats, policy_seats))[0]
+            if len(rows):
+                yield policy, rows
+
+    def _apply(self, tables, seats, actions, amounts):
+        """Vectorized PokerGame.process_action plus the bookkeeping in betting_round."""
+        stack = self.stack[tables, seats]
+        own_bet = self.current_bet[tables, seats]
+        table_bet = self.table_bet[tables]
+        to_call = table_bet - own_bet
+
+        pay = np.zeros(len(tables))
+        new_table_bet = table_bet.copy()
+        fold = (actions == FOLD) | (actions < 0) | (actions > RAISE)
+
+        # check: folds if there is a bet to call
+        fold |= (actions == CHECK) & (own_bet != table_bet)
+
+        # call: nothing to call, normal call, or all-in call
+        call = (actions == CALL) & (to_call != 0)
+        pay = np.where(call, np.where(stack >= to_call, to_call, stack), pay)
+
+        # raise (and bet facing a bet)
+        opening = (actions == BET) & (table_bet == 0)
+        is_raise = (actions == RAISE) | ((actions == BET) & (table_bet != 0))
+        total = to_call + amounts
+        full = is_raise & (stack >= total)
+        short = is_raise & ~(stack >= total) & (stack > to_call)
+        broke = is_raise & ~(stack >= total) & ~(stack > to_call)
+        pay = np.where(full, total, pay)
+        pay = np.where(short | broke, stack, pay)
+        new_table_bet = np.where(full, own_bet + total, new_table_bet)
+        new_table_bet = np.where(short, np.maximum(table_bet, own_bet + stack), new_table_bet)
+
+        # opening bet assigns the player's bet instead of adding to it
+        bet_full = opening & (stack >= amounts)
+        pay = np.where(opening, np.where(bet_full, amounts, stack), pay)
+        new_own_bet = np.where(opening, pay, own_bet + pay)
+        new_table_bet = np.where(opening, pay, new_table_bet)
+
+        all_in = (call & ~(stack >= to_call)) | short | broke | (opening & ~bet_full)
+        self.stack[tables, seats] = np.where(all_in, 0, stack - pay)
+        self.current_bet[tables, seats] = new_own_bet
+        self.pot[tables] += pay
+        self.table_bet[tables] = new_table_bet
+        self.active[tables, seats] &= ~fold
+        self.has_acted[tables, seats] = True
+
+        # A raise re-opens the action for everyone else who can still act
+        raised = tables[actions == RAISE]
+        if len(raised):
+            reopen = self.active[raised] & (self.stack[raised] > 0)
+            reopen[np.arange(len(raised)), seats[actions == RAISE]] = False
+            self.has_acted[raised] &= ~reopen
+
+        self.pass_index[tables] += 1
+        self.acted_this_pass[tables] = True
+
+        over = self.active[tables].sum(axis=1) <= 1
+        if over.any():
+            self._end_hands(tables[over])
+
+
+class VectorRandomBot:
+    """Vectorized RandomBot: uniform over valid actions, bet 50, raise 100."""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def get_actions(self, batch):
+        valid = batch["valid_actions"]
+        # RandomBot picks from the valid_actions list, where "bet" can appear twice
+        weights = valid.astype(float)
+        weights[:, BET] += (batch["amount_to_call"] == 0) & (batch["stack"] > batch["amount_to_call"]) & (batch["current_bet"] == 0)
+        cumulative = np.cumsum(weights, axis=1)
+        pick = self.rng.random(len(valid)) * cumulative[:, -1]
+        actions = (cumulative <= pick[:, None]).sum(axis=1)
+        amounts = np.select([actions == BET, actions == RAISE], [50.0, 100.0], 0.0)
+        return actions, amounts
+
+
+class VectorFirstBot:
+    """Vectorized FirstBot: call pre-flop, fold high card, shove trips or better."""
+
+    def get_actions(self, batch):
+        valid = batch["valid_actions"]
+        street = batch["street"]
+        stack = batch["stack"]
+        actions = np.full(len(street), FOLD)
+        amounts = np.zeros(len(street))
+
+        pre = street == 0
+        actions[pre] = np.where(valid[pre, CALL], CALL, FOLD)
+
+        post = np.nonzero(~pre)[0]
+        if len(post):
+            hand_class = np.zeros(len(post), dtype=np.intp)
+            num_board = batch["num_community_cards"][post]
+            for size in (3, 4, 5):
+                rows = num_board == size
+                if rows.any():
+                    idx = post[rows]
+                    cards = np.concatenate([batch["hand"][idx], batch["community_cards"][idx, :size]], axis=1)
+                    hand_class[rows] = rank_class(evaluate(cards))
+
+            v = valid[post]
+            choice = np.where(v[:, CHECK], CHECK, np.where(v[:, CALL], CALL, FOLD))
+            strong = hand_class <= 6
+            choice = np.where(strong & v[:, BET], BET, choice)
+            choice = np.where(strong & v[:, RAISE], RAISE, choice)
+            choice = np.where((hand_class == 9) & v[:, FOLD], FOLD, choice)
+            actions[post] = choice
+            amounts[post] = np.where((choice == BET) | (choice == RAISE), stack[post], 0.0)
+        return actions, amounts
+
+
+class ScalarAdapter(Brain):
+    """Run a vectorized bot inside the scalar engine (one-row batches)."""
+
+    def __init__(self, policy):
+        super().__init__()
+        self.policy = policy
+
+    def get_action(self, game_state):
+        player = game_state["player"]
+        board = list(game_state["community_cards"]) + [0] * (5 - len(game_state["community_cards"]))
+        valid = np.array([[a in game_state["valid_actions"] for a in ACTIONS]])
+        batch = {
+            "hand": np.array([player["hand"]], dtype=np.int64),
+            "community_cards": np.array([board], dtype=np.int64),
+            "num_community_cards": np.array([game_state["num_community_cards"]]),
+            "stack": np.array([player["stack"]], dtype=float),
+            "player_current_bet": np.array([player["current_bet"]], dtype=float),
+            "pot": np.array([game_state["pot"]], dtype=float),
+            "current_bet": np.array([game_state["current_bet"]], dtype=float),
+            "amount_to_call": np.array([game_state["amount_to_call"]], dtype=float),
+            "pot_odds": np.array([game_state["pot_odds"]]),
+            "street": np.array([STREETS.index(game_state["street"])]),
+            "small_blind": np.array([game_state["small_blind"]]),
+            "big_blind": np.array([game_state["big_blind"]]),
+            "hand_number": np.array([game_state["hand_number"]]),
+            "button_position": np.array([game_state["button_position"]]),
+            "position": np.array([player["position"]]),
+            "num_players": np.array([game_state["num_players"]]),
+            "num_active_players": np.array([game_state["num_active_players"]]),
+            "valid_actions": valid,
+            "min_raise": np.array([game_state["min_raise"]], dtype=float),
+            "max_raise": np.array([game_state["max_raise"]], dtype=float),
+        }
+        actions, amounts = self.policy.get_actions(batch)
+        action = {"action": ACTIONS[int(actions[0])]}
+        if actions[0] in (BET, RAISE):
+            amount = float(amounts[0])
+            action["amount"] = int(amount) if amount == int(amount) else amount
+        return action
+
+
+def verify_against_scalar(policies, scalar_brains, num_games=20, starting_stack=1000, seed=0):
+    """
+    Play the same seeded games in both engines and compare every final stack.
+
+    Args:
+        policies: Vectorized bots, one per seat
+        scalar_brains: Brain classes or instances for the scalar engine, one per seat
+        num_games: Games to compare
+
+    Returns:
+        Number of games whose hand count or final stacks differ
+    """
+    from engine.game import PokerGame
+    from engine.player import Player
+
+    sim = VectorSimulator(policies, num_tables=num_games, starting_stack=starting_stack,
+                          decks=PythonDecks(seed))
+    mismatches = 0
+    for game_seed, hands, stacks in sim.run(num_games):
+        players = [Player(f"Seat{i}", brain, starting_stack) for i, brain in enumerate(scalar_brains)]
+        game = PokerGame(players, starting_stack=starting_stack, verbose=False, seed=game_seed)
+        game.play_game()
+        by_name = {p.name: p.stack for p in players}
+        scalar_stacks = [by_name[f"Seat{i}"] for i in range(len(players))]
+        if game.hand_number != hands or not np.allclose(scalar_stacks, stacks):
+            mismatches += 1
+    return mismatches
+
+
+if __name__ == "__main__":
+    from bots.firstBot import FirstBot
+
+    mismatches = verify_against_scalar([VectorFirstBot()] * 3, [FirstBot] * 3, num_games=10)
+    print(f"Scalar check: {mismatches} of 10 games differ")
+
+    for name, lineup in (("RandomBot x6", [VectorRandomBot(0)] * 6),
+                         ("FirstBot x6", [VectorFirstBot()] * 6)):
+        sim = VectorSimulator(lineup, num_tables=20000, starting_stack=1000)
+        start = time.time()
+        sim.run(20000)
+        elapsed = time.time() - start
+        print(f"{name}: {sim.hands_played:,} hands, {sim.decisions:,} decisions in {elapsed:.1f}s "
+              f"({sim.hands_played / elapsed:,.0f} hands/sec)")
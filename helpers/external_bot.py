@@ -0,0 +1,22 @@
+"""
+Run one of the bots in bots/ as an external bot over stdio.
+
+Usage:
+    python helpers/external_bot.py randomBot.RandomBot
+
+This is the reference implementation of the bot side of the protocol in
+engine/external.py; bots written in other languages follow the same format.
+"""
+import importlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from engine.external import serve_stdio
+
+
+if __name__ == "__main__":
+    module_name, class_name = sys.argv[1].rsplit(".", 1)
+    brain_class = getattr(importlib.import_module(f"bots.{module_name}"), class_name)
+    serve_stdio(brain_class())
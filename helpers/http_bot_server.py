@@ -0,0 +1,24 @@
+"""
+Serve one of the bots in bots/ as a local HTTP bot service.
+
+Usage:
+    python helpers/http_bot_server.py randomBot.RandomBot 8765
+
+Seat it in a tournament with engine.http_bot.HttpBot(port=8765).
+"""
+import importlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from engine.http_bot import BotHTTPServer
+
+
+if __name__ == "__main__":
+    module_name, class_name = sys.argv[1].rsplit(".", 1)
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    brain_class = getattr(importlib.import_module(f"bots.{module_name}"), class_name)
+    server = BotHTTPServer(brain_class(), port=port)
+    print(f"Serving {class_name} on http://127.0.0.1:{server.port}/decide")
+    server.serve_forever()
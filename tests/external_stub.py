@@ -0,0 +1,28 @@
+"""
+Stub external bot for tests/test_external.py:
+
+    python -m tests.external_stub
+
+Raises by the pot plus the length of every name it was sent, so a wrong
+name table or decoded state shows up in the actions. Exits on hand 0.
+"""
+import sys
+
+from engine.brain import Brain
+from engine.external import serve_stdio
+
+
+class EchoBot(Brain):
+    def get_action(self, game_state):
+        if game_state["hand_number"] == 0:
+            sys.exit(1)
+        return {"action": "raise", "amount": echo_amount(game_state)}
+
+
+def echo_amount(game_state):
+    names = [game_state["player"]["name"]] + [opp["name"] for opp in game_state["opponents"]]
+    return game_state["pot"] + 1000 * sum(len(name) for name in names)
+
+
+if __name__ == "__main__":
+    serve_stdio(EchoBot())
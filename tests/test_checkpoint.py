@@ -0,0 +1,44 @@
+"""
+Checkpointed tournament runs resume to the results of an uninterrupted run.
+"""
+import os
+
+import pytest
+
+from bots.claudeBot import ClaudeBot
+from bots.deepSeekBot import DeepSeekBot
+from bots.firstBot import FirstBot
+from bots.geminiBot import GeminiBot
+from bots.randomBot import RandomBot
+from engine.game import PokerGame
+from engine.tournament import TournamentSimulator
+
+
+def test_checkpoint_resume_mid_game(tmp_path, monkeypatch):
+    configs = [("R", RandomBot), ("F", FirstBot), ("D", DeepSeekBot), ("C", ClaudeBot), ("G", GeminiBot)]
+
+    def run(**kwargs):
+        tournament = TournamentSimulator(configs, starting_stack=500)
+        tournament.run_tournament(6, summary_frequency=100, seed=7, **kwargs)
+        return {name: dict(stats) for name, stats in tournament.stats.items()}
+
+    expected = run()
+
+    path = str(tmp_path / "run.ckpt")
+    play_hand = PokerGame.play_hand
+    calls = 0
+
+    def interrupted(self):
+        nonlocal calls
+        calls += 1
+        if calls == 60:
+            raise KeyboardInterrupt
+        return play_hand(self)
+
+    monkeypatch.setattr(PokerGame, "play_hand", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        run(checkpoint_path=path, checkpoint_interval=0, checkpoint_overhead=0.99, checkpoint_mid_game=True)
+    monkeypatch.setattr(PokerGame, "play_hand", play_hand)
+
+    assert os.path.exists(path)
+    assert run(checkpoint_path=path, checkpoint_mid_game=True) == expected
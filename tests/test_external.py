@@ -0,0 +1,139 @@
+"""
+Stdio protocol for external bots, against the stub in tests/external_stub.py.
+"""
+import os
+import random
+import sys
+import threading
+
+import pytest
+
+from bots.firstBot import FirstBot
+from engine.external import (ExternalBotProcess, NameTable, decode_state, encode_state)
+from engine.game import PokerGame
+from engine.player import Player
+from tests.external_stub import echo_amount
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB = [sys.executable, "-m", "tests.external_stub"]
+
+
+class StateLog(FirstBot):
+    pure = False
+
+    def __init__(self, states):
+        super().__init__()
+        self.states = states
+
+    def get_action(self, game_state):
+        self.states.append(game_state)
+        return super().get_action(game_state)
+
+
+@pytest.fixture(scope="module")
+def states():
+    """game_states of every decision of a seeded game, post-flop ones included."""
+    random.seed(0)
+    states = []
+    players = [Player(name, StateLog(states), 500) for name in ("alice", "bob", "carol")]
+    PokerGame(players, starting_stack=500, verbose=False, seed=0).play_game()
+    return states
+
+
+def expected(state):
+    return {"action": "raise", "amount": echo_amount(state)}
+
+
+def subset(value, like):
+    """value restricted to the keys present in like (recursively)."""
+    if isinstance(like, dict):
+        return {k: subset(value[k], v) for k, v in like.items()}
+    if isinstance(like, list) and like and isinstance(like[0], dict):
+        return [subset(v, l) for v, l in zip(value, like)]
+    return value
+
+
+def test_binary_state_round_trip(states):
+    table = NameTable()
+    names = []
+    for i, state in enumerate(states):
+        new_names = []
+        record = encode_state(i, state, table, new_names)
+        for name_id, name in new_names:
+            names.extend([None] * (name_id + 1 - len(names)))
+            names[name_id] = name
+        request_id, decoded, offset = decode_state(record, 0, names)
+        assert request_id == i and offset == len(record)
+        # Actions travel as a set; get_valid_actions can list "bet" twice
+        assert decoded.pop("valid_actions") == list(dict.fromkeys(state["valid_actions"]))
+        assert decoded == subset(state, decoded)
+
+
+@pytest.mark.parametrize("mode", ["binary", "json"])
+def test_batches_match_their_requests(states, mode):
+    process = ExternalBotProcess(STUB, mode=mode, cwd=ROOT)
+    try:
+        assert process.decide_batch(states[:20]) == [expected(s) for s in states[:20]]
+        assert process.decide(states[-1]) == expected(states[-1])
+        assert process.messages_sent == 2 and process.decisions_sent == 21
+    finally:
+        process.close()
+
+
+def test_concurrent_decisions_share_one_message(states):
+    process = ExternalBotProcess(STUB, cwd=ROOT)
+    try:
+        process.start()
+        results = {}
+        threads = [threading.Thread(target=lambda i=i: results.update({i: process.decide(states[i])}))
+                   for i in range(8)]
+        # Hold the pipe so every decision queues before one thread sends them all
+        with process.io_lock:
+            for thread in threads:
+                thread.start()
+            while len(process.pending) < len(threads):
+                pass
+        for thread in threads:
+            thread.join(5)
+        assert results == {i: expected(states[i]) for i in range(8)}
+        assert process.messages_sent == 1
+    finally:
+        process.close()
+
+
+def test_restart_sends_names_again(states):
+    process = ExternalBotProcess(STUB, cwd=ROOT)
+    try:
+        assert process.decide(states[0]) == expected(states[0])
+        process.close()
+        # The new process has never seen the names
+        assert process.decide(states[1]) == expected(states[1])
+    finally:
+        process.close()
+
+
+def test_exit_fails_every_waiting_decision(states):
+    process = ExternalBotProcess(STUB, cwd=ROOT)
+    try:
+        process.start()
+        errors = []
+
+        def decide(state):
+            try:
+                process.decide(state)
+            except RuntimeError as e:
+                errors.append(e)
+
+        crash = dict(states[0], hand_number=0)
+        threads = [threading.Thread(target=decide, args=(state,)) for state in (crash, states[1], states[2])]
+        with process.io_lock:
+            for thread in threads:
+                thread.start()
+            while len(process.pending) < len(threads):
+                pass
+        for thread in threads:
+            thread.join(5)
+        assert not any(thread.is_alive() for thread in threads)
+        assert len(errors) == 3
+    finally:
+        process.close()
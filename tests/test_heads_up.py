@@ -0,0 +1,54 @@
+"""
+The heads-up betting loop against the n-player one on the same seeded games.
+"""
+import copy
+import random
+
+import pytest
+
+from bots.claudeBot import ClaudeBot
+from bots.deepSeekBot import DeepSeekBot
+from bots.firstBot import FirstBot
+from engine.game import PokerGame
+from engine.player import Player
+
+
+class TableOnly(PokerGame):
+    """PokerGame that never takes the heads-up path."""
+    betting_round = PokerGame.table_betting_round
+
+
+class Logged:
+    """Brain wrapper keeping a copy of every game_state it decides on."""
+
+    def __init__(self, brain, log):
+        self.brain = brain
+        self.log = log
+
+    def get_action(self, game_state):
+        self.log.append(("state", copy.deepcopy(game_state)))
+        return self.brain.get_action(game_state)
+
+    def __getattr__(self, name):
+        return getattr(self.brain, name)
+
+
+def play(game_class, seed, bots):
+    """Final stacks and the combined decision and event log of a seeded game."""
+    random.seed(seed)
+    log = []
+    players = [Player(f"p{i}", Logged(bot(), log), 400) for i, bot in enumerate(bots)]
+    game = game_class(players, starting_stack=400, verbose=False, seed=seed)
+    game.subscribe(type("EventLog", (), {"observe": lambda self, event: log.append(("event", event))})())
+    game.play_game()
+    stacks = {p.name: p.stack for p in game.players + game.eliminated}
+    return stacks, log
+
+
+@pytest.mark.parametrize("bots", [(FirstBot, ClaudeBot), (DeepSeekBot, FirstBot),
+                                  (ClaudeBot, DeepSeekBot, FirstBot)])
+@pytest.mark.parametrize("seed", range(3))
+def test_heads_up_matches_table_loop(bots, seed):
+    stacks, log = play(PokerGame, seed, bots)
+    assert (stacks, log) == play(TableOnly, seed, bots)
+    assert any(kind == "state" for kind, _ in log)
@@ -0,0 +1,157 @@
+"""
+HttpBot against the stand-in BotHTTPServer: pooling, batching, retries and failures.
+"""
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from engine.brain import Brain
+from engine.http_bot import BotHTTPServer, HttpBot, HttpBotError
+
+with open(os.path.join(os.path.dirname(__file__), "..", "helpers", "exmaple_game_state")) as f:
+    STATE = json.load(f)
+
+
+def state(pot):
+    return dict(STATE, pot=pot)
+
+
+class PotBot(Brain):
+    """Raises to the pot, so every answer identifies its request."""
+
+    def __init__(self, failures=0):
+        super().__init__()
+        self.failures = failures
+
+    def get_action(self, game_state):
+        if self.failures:
+            # Not a client error, so the handler drops the connection unanswered
+            self.failures -= 1
+            raise RuntimeError("bot crashed")
+        return {"action": "raise", "amount": game_state["pot"]}
+
+
+@pytest.fixture
+def server():
+    server = BotHTTPServer(PotBot(), port=0).start()
+    yield server
+    server.stop()
+
+
+def decide_concurrently(bot, states):
+    """
+    get_action for every state on its own thread, all queued before any is sent.
+
+    Returns:
+        List of actions or raised exceptions in state order
+    """
+    results = [None] * len(states)
+
+    def decide(i):
+        try:
+            results[i] = bot.get_action(states[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=decide, args=(i,)) for i in range(len(states))]
+    # Occupy every sender so the decisions pile up in pending
+    with bot.cond:
+        bot.senders = bot.max_senders
+    for thread in threads:
+        thread.start()
+    while True:
+        with bot.cond:
+            if len(bot.pending) == len(states):
+                bot.senders = 0
+                bot.cond.notify_all()
+                break
+    for thread in threads:
+        thread.join(5)
+    assert not any(thread.is_alive() for thread in threads)
+    return results
+
+
+def test_connection_is_reused(server):
+    bot = HttpBot(port=server.port)
+    try:
+        for pot in range(10):
+            assert bot.get_action(state(pot)) == {"action": "raise", "amount": pot}
+        assert bot.pool.connections_opened == 1
+        assert bot.requests_sent == 10
+    finally:
+        bot.close()
+
+
+@pytest.mark.parametrize("max_batch, requests", [(32, 1), (4, 3)])
+def test_concurrent_decisions_are_batched(server, max_batch, requests):
+    bot = HttpBot(port=server.port, max_batch=max_batch)
+    try:
+        results = decide_concurrently(bot, [state(pot) for pot in range(12)])
+        assert results == [{"action": "raise", "amount": pot} for pot in range(12)]
+        # Full batches are pipelined on one connection
+        assert bot.requests_sent == requests and bot.decisions_sent == 12
+        assert bot.pool.connections_opened == 1
+    finally:
+        bot.close()
+
+
+def test_retries_on_a_fresh_connection():
+    server = BotHTTPServer(PotBot(failures=1), port=0).start()
+    server.handle_error = lambda request, address: None
+    bot = HttpBot(port=server.port, retry_backoff=0)
+    try:
+        assert bot.get_action(state(7)) == {"action": "raise", "amount": 7}
+        assert bot.pool.connections_opened == 2 and bot.failures == 0
+    finally:
+        bot.close()
+        server.stop()
+
+
+@pytest.fixture
+def silent_port():
+    """A port that accepts connections and never answers."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    yield listener.getsockname()[1]
+    listener.close()
+
+
+def test_timeout_uses_fallback_action(silent_port):
+    bot = HttpBot(port=silent_port, timeout=0.1, retries=1, retry_backoff=0,
+                  fallback_action={"action": "fold"})
+    try:
+        assert bot.get_action(state(5)) == {"action": "fold"}
+        assert bot.failures == 1 and bot.pool.connections_opened == 2
+    finally:
+        bot.close()
+
+
+def test_timeout_raises_without_fallback(silent_port):
+    bot = HttpBot(port=silent_port, timeout=0.1, retries=0)
+    try:
+        with pytest.raises(HttpBotError):
+            bot.get_action(state(5))
+    finally:
+        bot.close()
+
+
+def test_send_error_reaches_every_waiting_decision(server):
+    bot = HttpBot(port=server.port)
+
+    def broken_send(ids, batch):
+        raise MemoryError("interrupted")
+
+    bot._send = broken_send
+    try:
+        results = decide_concurrently(bot, [state(pot) for pot in range(6)])
+        assert all(isinstance(result, MemoryError) for result in results)
+        # The sender slot is given back, so the bot still answers
+        del bot._send
+        assert bot.senders == 0 and not bot.pending
+        assert bot.get_action(state(3)) == {"action": "raise", "amount": 3}
+    finally:
+        bot.close()
@@ -0,0 +1,74 @@
+"""
+Decision memoization for declared-pure brains.
+"""
+import random
+
+from treys import Card, Evaluator
+
+from bots.firstBot import FirstBot
+from engine.brain import Brain
+from engine.game import PokerGame
+from engine.memo import DecisionCache
+from engine.player import Player
+
+
+class CallsRandom(Brain):
+    pure = True
+    decision_keys = ("street",)
+
+    def get_action(self, game_state):
+        return {"action": "call" if random.random() < 0.5 else "fold"}
+
+
+class UndeclaredPot(Brain):
+    """Declares only the street but also reads the pot."""
+    pure = True
+    decision_keys = ("street",)
+
+    def get_action(self, game_state):
+        return {"action": "call" if game_state["pot"] < 100 else "fold"}
+
+
+def test_brain_that_calls_random_is_excluded():
+    cache = DecisionCache()
+    cache.decide(CallsRandom(), {"street": "flop"})
+    assert cache.stats["CallsRandom"].excluded == "calls random"
+    assert not cache.entries
+
+
+def test_verify_catches_undeclared_keys():
+    cache = DecisionCache(verify=True)
+    brain = UndeclaredPot()
+    assert cache.decide(brain, {"street": "flop", "pot": 10}) == {"action": "call"}
+    # Served from the cache this would be a call; verify recomputes it
+    assert cache.decide(brain, {"street": "flop", "pot": 500}) == {"action": "fold"}
+    stats = cache.stats["UndeclaredPot"]
+    assert stats.mismatches == 1 and stats.excluded
+    assert not cache.entries
+
+
+def test_first_bot_all_in_follows_the_stack():
+    board = [Card.new(c) for c in ("Ts", "Js", "Qs")]
+    hand = [Card.new("Ks"), Card.new("As")]
+    rank = Evaluator().evaluate(board, hand)
+
+    def state(stack):
+        return {"street": "flop", "valid_actions": ["fold", "check", "bet"], "community_cards": board,
+                "player": {"hand": hand, "hand_rank": rank, "hand_class": 1, "stack": stack}}
+
+    cache = DecisionCache()
+    brain = FirstBot()
+    assert cache.decide(brain, state(300)) == {"action": "bet", "amount": 300}
+    assert cache.decide(brain, state(120)) == {"action": "bet", "amount": 120}
+    assert cache.stats["FirstBot"].hits == 1
+
+
+def test_first_bot_declaration_survives_verify():
+    cache = DecisionCache(verify=True)
+    for seed in range(3):
+        random.seed(seed)
+        players = [Player(name, FirstBot(), 500) for name in ("a", "b", "c")]
+        PokerGame(players, starting_stack=500, verbose=False, seed=seed, decisions=cache).play_game()
+    stats = cache.stats["FirstBot"]
+    assert stats.hits > 0
+    assert stats.mismatches == 0 and not stats.excluded
@@ -0,0 +1,42 @@
+"""
+Opponent range tracking from game_state.
+"""
+import random
+
+from bots.firstBot import FirstBot
+from engine.game import PokerGame
+from engine.player import Player
+from engine.range_tracker import RangeTracker
+
+
+class StateLog(FirstBot):
+    pure = False
+
+    def __init__(self):
+        super().__init__()
+        self.states = []
+
+    def get_action(self, game_state):
+        self.states.append(game_state)
+        return super().get_action(game_state)
+
+
+def first_state(seed):
+    """game_state of the first decision of a seeded game's "log" seat."""
+    random.seed(seed)
+    log = StateLog()
+    players = [Player("log", log, 500), Player("a", FirstBot(), 500), Player("b", FirstBot(), 500)]
+    PokerGame(players, starting_stack=500, verbose=False, seed=seed).play_game()
+    return log.states[0]
+
+
+def test_new_hole_cards_start_a_new_hand():
+    # A player moved to another table (MTT) can see the same hand number again
+    first, second = first_state(0), first_state(1)
+    assert first["hand_number"] == second["hand_number"]
+    assert first["player"]["hand"] != second["player"]["hand"]
+
+    tracker = RangeTracker()
+    tracker.observe_game_state(first)
+    tracker.observe_game_state(second)
+    assert tracker.dead_cards == list(second["player"]["hand"]) + list(second["community_cards"])
@@ -0,0 +1,94 @@
+"""
+Round trips of recorded hand histories.
+"""
+import os
+import random
+
+from bots.claudeBot import ClaudeBot
+from bots.deepSeekBot import DeepSeekBot
+from bots.firstBot import FirstBot
+from engine.game import PokerGame
+from engine.hand_history import HAND_DTYPE, SEAT_DTYPE, HandHistory, HandHistoryWriter
+from engine.player import Player
+
+
+class HandLog:
+    """Observer keeping what the engine itself knew at the end of every hand."""
+
+    def __init__(self, game):
+        self.game = game
+        self.hands = []
+        game.subscribe(self)
+
+    def observe(self, event):
+        if event["type"] == "hand_end":
+            game = self.game
+            self.hands.append({
+                "hand_number": game.hand_number,
+                "board": list(game.community_cards),
+                "seats": [(p.name, list(p.hand), p.stack) for p in game.players],
+                "winners": event["winners"],
+            })
+
+
+def record(path, games=3, seed=0):
+    """Play seeded games into a history; returns the engine's view of every hand."""
+    hands = []
+    with HandHistoryWriter(path) as writer:
+        for game_seed in range(seed, seed + games):
+            random.seed(game_seed)
+            players = [Player("target", FirstBot(), 500), Player("claude", ClaudeBot(), 500),
+                       Player("deepseek", DeepSeekBot(), 500)]
+            game = PokerGame(players, starting_stack=500, verbose=False, seed=game_seed, history=writer)
+            log = HandLog(game)
+            game.play_game()
+            hands += log.hands
+    return hands
+
+
+def assert_matches(history, hands):
+    assert len(history) == len(hands)
+    for i, hand in enumerate(hands):
+        described = history.describe(i)
+        assert described["hand_number"] == hand["hand_number"]
+        assert described["board"] == hand["board"]
+        seats = described["seats"]
+        assert [(s["name"], s["hole"], s["stack"] + s["net"]) for s in seats] == hand["seats"]
+        assert [s["name"] for s in seats if s["winner"]] == hand["winners"]
+
+
+def test_history_round_trip(tmp_path):
+    path = str(tmp_path / "history")
+    hands = record(path)
+    assert hands
+    assert_matches(HandHistory(path), hands)
+
+
+def test_history_drops_partial_tail(tmp_path):
+    path = str(tmp_path / "history")
+    hands = record(path)
+    # A crash mid-append leaves part of a record behind
+    with open(os.path.join(path, "seats.bin"), "ab") as f:
+        f.write(b"\0" * (SEAT_DTYPE.itemsize + 3))
+    with open(os.path.join(path, "hands.bin"), "ab") as f:
+        f.write(b"\0" * (HAND_DTYPE.itemsize // 2))
+
+    HandHistoryWriter(path).close()
+    history = HandHistory(path)
+    assert os.path.getsize(os.path.join(path, "hands.bin")) == len(hands) * HAND_DTYPE.itemsize
+    assert len(history.seats) == sum(len(hand["seats"]) for hand in hands)
+    assert_matches(history, hands)
+
+
+def test_history_truncate(tmp_path):
+    path = str(tmp_path / "history")
+    hands = record(path, games=1)
+    writer = HandHistoryWriter(path)
+    position = writer.position()
+    writer.close()
+    record(path, games=2, seed=1)
+
+    writer = HandHistoryWriter(path)
+    writer.truncate(position)
+    writer.close()
+    assert_matches(HandHistory(path), hands)
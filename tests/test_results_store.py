@@ -0,0 +1,88 @@
+"""
+SQLite results store: batched writes, rewinds and writer errors.
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from engine.results_store import ResultsStore
+
+
+def game(winner, loser):
+    return [(winner, f"{winner}Bot", 1000), (loser, f"{loser}Bot", 0)]
+
+
+def test_batched_games_and_totals(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db"), batch_size=7) as store:
+        run_id = store.start_run("run", ["a", "b"], starting_stack=500, seed=1)
+        for game_num in range(1, 51):
+            store.record_game(run_id, game_num, game("a", "b") if game_num % 5 else game("b", "a"), seed=game_num)
+        standings = {row["player"]: row for row in store.standings(run_id)}
+        assert standings["a"]["games"] == standings["b"]["games"] == 50
+        assert standings["a"]["wins"] == 40 and standings["b"]["wins"] == 10
+        assert store.runs()[0]["games"] == 50
+        assert store.matchup(["bBot", "aBot"])[0]["bot"] == "aBot"
+
+
+def test_rewind_run(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        run_id = store.start_run("run", ["a", "b"])
+        for game_num in range(1, 6):
+            store.record_game(run_id, game_num, game("a", "b") if game_num <= 3 else game("b", "a"))
+        store.rewind_run(run_id, 3)
+        # Replayed games after a rewind are recorded again
+        store.record_game(run_id, 4, game("a", "b"))
+        standings = {row["player"]: row for row in store.standings(run_id)}
+        assert standings["a"]["games"] == 4 and standings["a"]["wins"] == 4
+        assert store.runs()[0]["games"] == 4
+
+
+class Blocking(list):
+    """Game results whose iteration holds the writer until released."""
+
+    def __init__(self, results):
+        super().__init__(results)
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __iter__(self):
+        self.entered.set()
+        self.release.wait(5)
+        return super().__iter__()
+
+
+def test_writer_error_fails_runs_of_the_rolled_back_batch(tmp_path):
+    path = str(tmp_path / "results.db")
+    store = ResultsStore(path)
+    run_id = store.start_run("first", ["a", "b"])
+    blocking = Blocking(game("a", "b"))
+    store.record_game(run_id, 1, blocking)
+    blocking.entered.wait(5)
+
+    # Both land in the next batch: a new run, then a duplicate game that fails it
+    started = {}
+    thread = threading.Thread(target=lambda: started.update(result=_start(store)))
+    thread.start()
+    while store._queue.unfinished_tasks < 2:
+        pass
+    store.record_game(run_id, 1, game("a", "b"))
+    blocking.release.set()
+    thread.join(5)
+
+    assert isinstance(started["result"], sqlite3.IntegrityError)
+    with pytest.raises(RuntimeError):
+        store.record_game(run_id, 2, game("a", "b"))
+    with pytest.raises(RuntimeError):
+        store.close()
+    assert not store._thread.is_alive()
+    # The rolled-back run was never handed out
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT name FROM runs").fetchall() == [("first",)]
+
+
+def _start(store):
+    try:
+        return store.start_run("second", ["a", "b"])
+    except Exception as e:
+        return e
@@ -0,0 +1,38 @@
+"""
+Table snapshots and play-out rollouts.
+"""
+import random
+
+import pytest
+
+from bots.firstBot import FirstBot
+from engine.game import PokerGame
+from engine.player import Player
+from engine.snapshot import TableSnapshot, play_out
+
+
+def test_snapshot_restore():
+    random.seed(3)
+    players = [Player(name, FirstBot(), 500) for name in ("a", "b", "c")]
+    game = PokerGame(players, starting_stack=500, verbose=False, seed=3)
+    snapshots = []
+
+    class Snapper:
+        def observe(self, event):
+            if event["type"] == "action" and not snapshots:
+                snapshots.append(TableSnapshot.capture(game))
+
+    game.subscribe(Snapper())
+    game.play_game()
+    snap = snapshots[0]
+
+    # Restoring onto a fresh table puts every captured field back
+    table = PokerGame([Player(name, FirstBot(), 0) for name in ("a", "b", "c")], verbose=False, seed=4)
+    snap.restore(table)
+    again = TableSnapshot.capture(table)
+    for field in TableSnapshot.__slots__:
+        assert getattr(again, field) == getattr(snap, field), field
+
+    first = play_out(snap, FirstBot())
+    assert play_out(snap, FirstBot()) == first
+    assert sum(first.values()) == pytest.approx(sum(snap.stacks().values()) + snap.pot)
@@ -0,0 +1,24 @@
+"""
+The vectorized simulator and evaluator against the scalar engine.
+"""
+import pytest
+from treys import Card, Evaluator
+
+from bots.firstBot import FirstBot
+from engine.vector_eval import evaluate
+from engine.vector_sim import VectorFirstBot, verify_against_scalar
+
+
+@pytest.mark.parametrize("seats", [2, 3, 6])
+def test_matches_scalar_engine(seats):
+    assert verify_against_scalar([VectorFirstBot()] * seats, [FirstBot] * seats, num_games=8,
+                                 starting_stack=300) == 0
+
+
+def test_evaluate_survives_rows_with_repeated_cards():
+    cards = [Card.new(c) for c in ("As", "Ah", "Ad", "Ac", "Ks", "Kh", "3d")]
+    # Repeating a board card can put five aces in a row that callers mask out;
+    # their prime product is past the largest seven-card key
+    repeated = cards[:4] + [cards[0]] + cards[4:6]
+    ranks = evaluate([repeated, cards])
+    assert ranks[1] == Evaluator().evaluate(cards[:2], cards[2:])